@@ -0,0 +1,123 @@
+"""
+Requests/sec of the read endpoints at increasing numbers of in-flight requests for three
+deployments: WSGI with a fixed thread count, ASGI with the sync views (run on the sync
+thread pool) and ASGI with ASYNC_READ_ENDPOINTS enabled. Requests are driven straight into
+the WSGI and ASGI handlers, so only the Django side of the deployment is measured.
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import asgi_request, base_parser, benchmark_database, report, setup_django, wsgi_request
+
+VARIANTS = ('wsgi', 'asgi-sync', 'asgi-async')
+URL_NAMES = ('check-active-license', 'get-company-license-info', 'check-license-capacity')
+
+
+def seed():
+    from datetime import timedelta
+    from django.contrib.auth.models import User
+    from django.utils import timezone
+    from rest_framework_simplejwt.tokens import AccessToken
+    from licensingapp.models import Company, CompanyLicense, Employee, LicenseType
+    from project.commons.common_constants import Role
+
+    user = User.objects.create_user(username='benchmark-admin', password='benchmarkpassword')
+    company = Company.objects.create(name='Benchmark Company', address='Benchmark St')
+    Employee.objects.create(user=user, company=company, role=Role.ADMIN.value)
+    license_type = LicenseType.objects.create(name='Benchmark License', duration=1, duration_type='years', price_per_user='10.00')
+    CompanyLicense.objects.create(
+        company=company,
+        license_type=license_type,
+        total_users=100,
+        total_amount='1000.00',
+        start_date=timezone.now().date(),
+        end_date=timezone.now().date() + timedelta(days=365),
+        status='active',
+    )
+    return str(AccessToken.for_user(user))
+
+
+def run_wsgi(paths, token, count, concurrency, threads):
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection
+    application = get_wsgi_application()
+
+    def call(i):
+        path = paths[i % len(paths)]
+        status_code, _ = wsgi_request(application, 'GET', path, headers={'Authorization': f'Bearer {token}'})
+        if status_code != 200:
+            raise RuntimeError(f"Unexpected {status_code} for {path}")
+
+    # In-flight requests beyond the thread count queue, as they would in front of a WSGI server.
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(concurrency, threads)) as executor:
+        list(executor.map(call, range(count)))
+    elapsed = time.perf_counter() - started
+    connection.close()
+    return elapsed
+
+
+def run_asgi(paths, token, count, concurrency):
+    from django.core.asgi import get_asgi_application
+    application = get_asgi_application()
+
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(i):
+            path = paths[i % len(paths)]
+            async with semaphore:
+                status_code, _ = await asgi_request(application, 'GET', path, headers={'Authorization': f'Bearer {token}'})
+            if status_code != 200:
+                raise RuntimeError(f"Unexpected {status_code} for {path}")
+
+        started = time.perf_counter()
+        await asyncio.gather(*(call(i) for i in range(count)))
+        return time.perf_counter() - started
+
+    return asyncio.run(drive())
+
+
+def run_variant(variant, args):
+    setup_django()
+    from django.conf import settings
+    from django.urls import reverse
+
+    # Must happen before the URLconf is first imported.
+    settings.ASYNC_READ_ENDPOINTS = variant == 'asgi-async'
+
+    with benchmark_database():
+        token = seed()
+        paths = [reverse(url_name) for url_name in URL_NAMES]
+        for concurrency in args.levels:
+            if variant == 'wsgi':
+                elapsed = run_wsgi(paths, token, args.requests, concurrency, args.wsgi_threads)
+            else:
+                elapsed = run_asgi(paths, token, args.requests, concurrency)
+            report(f'in-flight={concurrency}', variant, args.requests, elapsed)
+
+
+def main():
+    parser = base_parser(__doc__, concurrency=False)
+    parser.set_defaults(requests=600)
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 8, 32, 128], help='In-flight request counts to measure.')
+    parser.add_argument('--wsgi-threads', type=int, default=8, help='Threads of the simulated WSGI server.')
+    parser.add_argument('--variant', choices=VARIANTS, help='Run a single deployment in this process.')
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args.variant, args)
+        return
+
+    print(f"wsgi_threads={args.wsgi_threads} cpus={os.cpu_count()}")
+    # Each deployment runs in its own process because the URLconf is fixed at import time.
+    for variant in VARIANTS:
+        subprocess.run([sys.executable, '-m', 'benchmarks.asgi_read_endpoints', '--variant', variant] + sys.argv[1:], check=True)
+
+
+if __name__ == '__main__':
+    main()
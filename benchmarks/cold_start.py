@@ -0,0 +1,85 @@
+"""
+Worker cold start and time to first request, measured in fresh processes: Django setup,
+URLconf import (which evaluates every @swagger_auto_schema in licensingapp/views.py), the
+first API request and the first OpenAPI schema request. The schema is fetched either from
+the drf_yasg view, which generates it on every request, or from the precompiled /swagger.json.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import base_parser, setup_django
+
+SCHEMA_SOURCES = {
+    'generated': '/swagger/?format=openapi',
+    'precompiled': '/swagger.json',
+}
+PHASES = ('setup', 'urlconf', 'first_request', 'first_schema', 'second_schema')
+
+
+def measure(source, artifact):
+    timings = {}
+    started = time.perf_counter()
+    setup_django()
+    timings['setup'] = time.perf_counter() - started
+
+    from django.conf import settings
+    from django.test import Client
+    from django.urls import get_resolver
+    settings.OPENAPI_SCHEMA_PATH = artifact
+
+    started = time.perf_counter()
+    get_resolver().url_patterns
+    timings['urlconf'] = time.perf_counter() - started
+
+    client = Client()
+    started = time.perf_counter()
+    # Token verification needs no database, so this isolates the request path itself.
+    client.post('/api/token/verify/', {'token': 'invalid'}, content_type='application/json')
+    timings['first_request'] = time.perf_counter() - started
+
+    for phase in ('first_schema', 'second_schema'):
+        started = time.perf_counter()
+        response = client.get(SCHEMA_SOURCES[source])
+        timings[phase] = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f"Unexpected {response.status_code} for {SCHEMA_SOURCES[source]}")
+    return timings
+
+
+def main():
+    parser = base_parser(__doc__, concurrency=False)
+    parser.set_defaults(requests=5)
+    parser.add_argument('--child', choices=SCHEMA_SOURCES, help=argparse.SUPPRESS)
+    parser.add_argument('--artifact', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.artifact)))
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        artifact = os.path.join(directory, 'schema.json')
+        subprocess.run([sys.executable, 'manage.py', 'generate_openapi_schema', '--output', artifact], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+        print(f"median of {args.requests} fresh processes, milliseconds")
+        print(f"{'schema source':<14}" + ''.join(f"{phase:>15}" for phase in PHASES))
+        for source in SCHEMA_SOURCES:
+            runs = []
+            for _ in range(args.requests):
+                output = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.cold_start', '--child', source, '--artifact', artifact],
+                    check=True, capture_output=True, text=True,
+                ).stdout
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            medians = {phase: statistics.median(run[phase] for run in runs) * 1000 for phase in PHASES}
+            print(f"{source:<14}" + ''.join(f"{medians[phase]:>15.1f}" for phase in PHASES))
+
+
+if __name__ == '__main__':
+    main()
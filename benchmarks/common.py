@@ -0,0 +1,161 @@
+"""
+Shared setup for the benchmark scripts. Run them from the repository root, e.g.
+
+    python -m benchmarks.password_hashing --help
+"""
+import argparse
+import asyncio
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+
+def setup_django(settings_module='project.settings'):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def base_parser(description, concurrency=True):
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('--requests', type=int, default=40, help='Requests per scenario.')
+    if concurrency:
+        parser.add_argument('--concurrency', type=int, default=4, help='Request threads, i.e. the server worker count being simulated.')
+    return parser
+
+
+@contextmanager
+def benchmark_database(transaction_mode='IMMEDIATE', journal_mode=None, options=None, conn_max_age=None):
+    """
+    Create a migrated throwaway SQLite file and point the default connection at it.
+    A file is used instead of the in-memory test database so request threads do not
+    contend on SQLite's shared-cache table locks. Transactions start IMMEDIATE by default,
+    otherwise concurrent read-then-write transactions fail with "database is locked"
+    instead of waiting. journal_mode (e.g. 'WAL') is set on every connection when given.
+    ``options`` replaces the connection OPTIONS as a whole (ignoring the other arguments)
+    and ``conn_max_age`` overrides CONN_MAX_AGE, to compare connection profiles.
+    """
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    directory = tempfile.mkdtemp(prefix='licensing-benchmark-')
+    database = settings.DATABASES['default']
+    database.setdefault('TEST', {})['NAME'] = os.path.join(directory, 'benchmark.sqlite3')
+    saved = {key: database[key] for key in ('OPTIONS', 'CONN_MAX_AGE') if key in database}
+    if 'OPTIONS' in saved:
+        database['OPTIONS'] = dict(saved['OPTIONS'])
+    if options is not None:
+        database['OPTIONS'] = dict(options)
+    else:
+        database_options = database.setdefault('OPTIONS', {})
+        database_options.update({'transaction_mode': transaction_mode, 'timeout': 60})
+        if journal_mode:
+            database_options['init_command'] = f'PRAGMA journal_mode={journal_mode}'
+    if conn_max_age is not None:
+        database['CONN_MAX_AGE'] = conn_max_age
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+        shutil.rmtree(directory, ignore_errors=True)
+        database.update(saved)
+
+
+def wsgi_request(application, method, path, body=b'', headers=None):
+    """
+    Send one request straight into a WSGI application and return (status code, body).
+    """
+    path, _, query_string = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'SERVER_NAME': 'testserver',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.url_scheme': 'http',
+    }
+    for name, value in (headers or {}).items():
+        key = name.upper().replace('-', '_')
+        environ[key if key == 'CONTENT_TYPE' else f'HTTP_{key}'] = value
+    statuses = []
+    response = application(environ, lambda status, response_headers, exc_info=None: statuses.append(status))
+    try:
+        content = b''.join(response)
+    finally:
+        # Sends request_finished, which returns the connection like a WSGI server would.
+        response.close()
+    return int(statuses[0].split()[0]), content
+
+
+async def asgi_request(application, method, path, body=b'', headers=None):
+    """
+    Send one request straight into an ASGI application and return (status code, body).
+    """
+    path, _, query_string = path.partition('?')
+    never = asyncio.Event()
+    sent_body = False
+    messages = []
+
+    async def receive():
+        nonlocal sent_body
+        if not sent_body:
+            sent_body = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await never.wait()
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [(b'host', b'testserver'), (b'content-length', str(len(body)).encode())] + [
+            (name.lower().encode(), value.encode()) for name, value in (headers or {}).items()
+        ],
+        'client': ('127.0.0.1', 50000),
+        'server': ('testserver', 80),
+    }
+    await application(scope, receive, send)
+    return messages[0]['status'], b''.join(message.get('body', b'') for message in messages[1:])
+
+
+def run_concurrently(func, count, concurrency):
+    """
+    Call func(i) for i in range(count) on `concurrency` threads and return the elapsed seconds.
+    """
+    def call(i):
+        from django.db import connection
+        try:
+            return func(i)
+        finally:
+            connection.close()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, range(count)))
+    elapsed = time.perf_counter() - started
+    return elapsed, results
+
+
+def report(scenario, variant, count, elapsed):
+    print(f"{scenario:<24} {variant:<16} {count:>6} requests {elapsed:8.2f}s {count / elapsed:10.1f} req/s")
@@ -0,0 +1,76 @@
+"""
+Query count and latency of one employee listing page at several page sizes, serialized with
+EmployeeGetSerializer over model instances (the previous path) and with the values()
+projection used by get_company_employees.
+"""
+import statistics
+import time
+
+from benchmarks.common import base_parser, benchmark_database, setup_django
+
+
+def seed(employees):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from licensingapp.models import Company, Employee
+    from project.commons.common_constants import Role
+
+    company = Company.objects.create(name='Benchmark Company', address='Benchmark St')
+    password = make_password('benchmarkpassword')
+    users = User.objects.bulk_create([
+        User(username=f'employee{i}', password=password, email=f'employee{i}@example.com', first_name=f'First{i}', last_name=f'Last{i}')
+        for i in range(employees)
+    ])
+    Employee.objects.bulk_create([Employee(user=user, company=company, role=Role.USER.value) for user in users])
+    return company
+
+
+def measure(build, repeat):
+    from django.db import connection
+    from rest_framework.renderers import JSONRenderer
+
+    executed = []
+
+    def count_queries(execute, sql, params, many, context):
+        executed.append(sql)
+        return execute(sql, params, many, context)
+
+    timings = []
+    with connection.execute_wrapper(count_queries):
+        for _ in range(repeat):
+            started = time.perf_counter()
+            content = JSONRenderer().render(build())
+            timings.append(time.perf_counter() - started)
+    return len(executed) // repeat, statistics.median(timings), content
+
+
+def main():
+    parser = base_parser(__doc__, concurrency=False)
+    parser.set_defaults(requests=20)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[10, 100, 1000])
+    args = parser.parse_args()
+    setup_django()
+
+    from licensingapp.models import Employee
+    from licensingapp.serializers import EMPLOYEE_LISTING_VALUES, EmployeeGetSerializer, employee_listing_data
+
+    with benchmark_database():
+        company = seed(max(args.page_sizes))
+        employees = Employee.objects.filter(company_id=company.id)
+        print(f"{'page size':>10} {'path':<12} {'queries':>8} {'median ms':>10}")
+        for page_size in args.page_sizes:
+            variants = {
+                'serializer': lambda: EmployeeGetSerializer(employees[:page_size], many=True).data,
+                'projection': lambda: employee_listing_data(employees.values(*EMPLOYEE_LISTING_VALUES)[:page_size]),
+            }
+            contents = set()
+            for name, build in variants.items():
+                query_count, median, content = measure(build, args.requests)
+                contents.add(content)
+                print(f"{page_size:>10} {name:<12} {query_count:>8} {median * 1000:>10.2f}")
+            if len(contents) != 1:
+                raise RuntimeError(f"Outputs differ at page size {page_size}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,450 @@
+"""
+End-to-end latency baseline of every route in licensingapp/urls.py and the /api/token/
+endpoints. Each dataset is seeded into its own throwaway database, then every scenario is
+driven in process through the WSGI and the ASGI handler. Reports p50/p95/p99 latency,
+throughput and SQL queries per request (from the /metrics registry) as JSON, and compares
+the run against a stored baseline:
+
+    python -m benchmarks.endpoint_suite --output baseline.json
+    python -m benchmarks.endpoint_suite --baseline baseline.json --output current.json
+
+The exit status is 1 when a scenario regressed beyond the thresholds or returned an
+unexpected status. Write scenarios prepare their rows and tokens before the timed requests.
+Password hashing dominates the token, registration and import scenarios.
+"""
+import asyncio
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import asgi_request, base_parser, benchmark_database, setup_django, wsgi_request
+
+# generate_dataset arguments: employees are spread over the companies with a Zipf skew.
+# The measured tenant is the largest company with an active license.
+DATASETS = {
+    'small': {'companies': 10, 'employees': 500},
+    'medium': {'companies': 200, 'employees': 50_000},
+    'large': {'companies': 1_000, 'employees': 1_000_000},
+}
+HANDLERS = ('wsgi', 'asgi')
+
+PASSWORD = 'benchmarkpassword'
+# Seats added to the measured license, so the write scenarios never run out of capacity.
+SEAT_HEADROOM = 100_000
+IMPORT_ROWS = 20
+BATCH_DELETE_SIZE = 10
+
+Request = namedtuple('Request', 'method path body headers')
+Scenario = namedtuple('Scenario', 'name method expected_status prepare')
+
+_sequence = itertools.count()
+
+
+def _unique(prefix):
+    return f'{prefix}-{os.getpid()}-{next(_sequence)}'
+
+
+def _request(method, path, token=None, data=None, content_type='application/json'):
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    body = b''
+    if data is not None:
+        body = data if isinstance(data, bytes) else json.dumps(data).encode()
+        headers['Content-Type'] = content_type
+    return Request(method, path, body, headers)
+
+
+class Dataset:
+    """
+    The seeded rows the scenarios address: the measured company, its admin, a license type
+    and a superuser for the cross-tenant report.
+    """
+
+    def __init__(self, company_id, admin, license_type_id, superuser):
+        from rest_framework_simplejwt.tokens import AccessToken
+        self.company_id = company_id
+        self.admin = admin
+        self.license_type_id = license_type_id
+        self.token = str(AccessToken.for_user(admin))
+        self.superuser_token = str(AccessToken.for_user(superuser))
+
+
+def seed_dataset(companies, employees):
+    from django.contrib.auth.models import User
+    from django.db.models import F
+    from licensingapp.dataset_generator import generate_dataset
+    from licensingapp.models import CompanyLicense
+    from project.commons.common_constants import LicenseStatus, Role
+
+    generate_dataset(companies, employees, password=PASSWORD)
+    active = (
+        CompanyLicense.objects.filter(status=LicenseStatus.ACTIVE.value)
+        .order_by('-company__employee_count', 'company_id')
+        .values('id', 'company_id', 'license_type_id')
+        .first()
+    )
+    CompanyLicense.objects.filter(pk=active['id']).update(total_users=F('total_users') + SEAT_HEADROOM)
+    admin = User.objects.get(employee__company_id=active['company_id'], employee__role=Role.ADMIN.value)
+    superuser = User.objects.create_superuser(username='benchmark-superuser', password=PASSWORD)
+    return Dataset(active['company_id'], admin, active['license_type_id'], superuser)
+
+
+def _add_employees(company_id, count):
+    from django.contrib.auth.hashers import make_password
+    from django.contrib.auth.models import User
+    from django.db.models import F
+    from licensingapp.models import Company, Employee
+
+    password = make_password(PASSWORD)
+    users = User.objects.bulk_create([User(username=_unique('extra'), password=password) for _ in range(count)])
+    employees = Employee.objects.bulk_create([Employee(user=user, company_id=company_id) for user in users])
+    Company.objects.filter(pk=company_id).update(employee_count=F('employee_count') + count)
+    return [employee.id for employee in employees]
+
+
+def _get(url_name, *args):
+    def prepare(dataset, count):
+        from django.urls import reverse
+        return [_request('GET', reverse(url_name, args=args and [getattr(dataset, args[0])]), dataset.token)] * count
+    return prepare
+
+
+def _prepare_create_license_type(dataset, count):
+    from django.urls import reverse
+    return [
+        _request('POST', reverse('create-license-type'), dataset.token,
+                 {'name': _unique('License'), 'duration': 1, 'duration_type': 'years', 'price_per_user': '10.00'})
+        for _ in range(count)
+    ]
+
+
+def _prepare_update_license_type(dataset, count):
+    from django.urls import reverse
+    return [_request('PATCH', reverse('update-license-type', args=[dataset.license_type_id]), dataset.token, {'price_per_user': '10.00'})] * count
+
+
+def _prepare_register_company(dataset, count):
+    from django.urls import reverse
+    return [
+        _request('POST', reverse('register-company'), data={
+            'user': {'username': _unique('owner'), 'password': PASSWORD},
+            'company': {'name': _unique('Company'), 'address': 'Benchmark St'},
+        })
+        for _ in range(count)
+    ]
+
+
+def _prepare_activate_license(dataset, count):
+    from django.urls import reverse
+    return [_request('POST', reverse('activate-license'), dataset.token, {'license_type': dataset.license_type_id})] * count
+
+
+def _prepare_increase_users(dataset, count):
+    from django.urls import reverse
+    return [_request('POST', reverse('increase-license-users'), dataset.token, {'total_users_to_add': 1})] * count
+
+
+def _prepare_register_employee(dataset, count):
+    from django.urls import reverse
+    return [_request('POST', reverse('register-employee-by-admin'), dataset.token, {'username': _unique('hire'), 'password': PASSWORD}) for _ in range(count)]
+
+
+def _prepare_list_employees(dataset, count):
+    from django.urls import reverse
+    return [_request('GET', reverse('get-company-employees') + '?limit=50', dataset.token)] * count
+
+
+def _prepare_utilization_report(dataset, count):
+    from django.urls import reverse
+    return [_request('GET', reverse('license-utilization-report') + '?limit=50', dataset.superuser_token)] * count
+
+
+def _prepare_import_employees(dataset, count):
+    from django.urls import reverse
+    requests = []
+    for _ in range(count):
+        body = b''.join(json.dumps({'username': _unique('imported'), 'password': PASSWORD}).encode() + b'\n' for _ in range(IMPORT_ROWS))
+        requests.append(_request('POST', reverse('import-employees'), dataset.token, body, content_type='application/x-ndjson'))
+    return requests
+
+
+def _prepare_delete_employee(dataset, count):
+    from django.urls import reverse
+    return [_request('DELETE', reverse('delete-employee', args=[pk]), dataset.token) for pk in _add_employees(dataset.company_id, count)]
+
+
+def _prepare_delete_employees(dataset, count):
+    from django.urls import reverse
+    ids = _add_employees(dataset.company_id, count * BATCH_DELETE_SIZE)
+    return [
+        _request('POST', reverse('delete-employees'), dataset.token, {'employee_ids': ids[i:i + BATCH_DELETE_SIZE]})
+        for i in range(0, len(ids), BATCH_DELETE_SIZE)
+    ]
+
+
+def _prepare_delete_company(dataset, count):
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+    from licensingapp.models import Company, Employee
+    from project.commons.common_constants import Role
+
+    companies = Company.objects.bulk_create([Company(name=_unique('Doomed'), address='Benchmark St', employee_count=1) for _ in range(count)])
+    users = User.objects.bulk_create([User(username=_unique('doomed'), password='!') for _ in range(count)])
+    Employee.objects.bulk_create([Employee(user=user, company=company, role=Role.ADMIN.value) for user, company in zip(users, companies)])
+    return [_request('DELETE', reverse('delete-company', args=[company.id]), str(AccessToken.for_user(user))) for user, company in zip(users, companies)]
+
+
+def _prepare_register_company_for_user(dataset, count):
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    users = User.objects.bulk_create([User(username=_unique('founder'), password='!') for _ in range(count)])
+    return [
+        _request('POST', reverse('register-company-for-existing-user'), str(AccessToken.for_user(user)), {'name': _unique('Company'), 'address': 'Benchmark St'})
+        for user in users
+    ]
+
+
+def _prepare_obtain_token(dataset, count):
+    from django.urls import reverse
+    return [_request('POST', reverse('token_obtain_pair'), data={'username': dataset.admin.username, 'password': PASSWORD})] * count
+
+
+def _prepare_refresh_token(dataset, count):
+    from django.urls import reverse
+    from rest_framework_simplejwt.tokens import RefreshToken
+    return [_request('POST', reverse('token_refresh'), data={'refresh': str(RefreshToken.for_user(dataset.admin))}) for _ in range(count)]
+
+
+def _prepare_verify_token(dataset, count):
+    from django.urls import reverse
+    return [_request('POST', reverse('token_verify'), data={'token': dataset.token})] * count
+
+
+# Reads first, so they see the seeded dataset rather than the rows the writes add.
+SCENARIOS = (
+    Scenario('get-license-type', 'GET', 200, _get('get-license-type', 'license_type_id')),
+    Scenario('get-all-license-types', 'GET', 200, _get('get-all-license-types')),
+    Scenario('check-license-capacity', 'GET', 200, _get('check-license-capacity')),
+    Scenario('get-company-employees', 'GET', 200, _prepare_list_employees),
+    Scenario('get-company-license-info', 'GET', 200, _get('get-company-license-info')),
+    Scenario('get-user-company-employee-info', 'GET', 200, _get('get-user-company-employee-info')),
+    Scenario('check-active-license', 'GET', 200, _get('check-active-license')),
+    Scenario('license-utilization-report', 'GET', 200, _prepare_utilization_report),
+    Scenario('token_verify', 'POST', 200, _prepare_verify_token),
+    Scenario('token_refresh', 'POST', 200, _prepare_refresh_token),
+    Scenario('token_obtain_pair', 'POST', 200, _prepare_obtain_token),
+    Scenario('create-license-type', 'POST', 201, _prepare_create_license_type),
+    Scenario('update-license-type', 'PATCH', 200, _prepare_update_license_type),
+    Scenario('register-company', 'POST', 201, _prepare_register_company),
+    Scenario('register-company-for-existing-user', 'POST', 201, _prepare_register_company_for_user),
+    Scenario('activate-license', 'POST', 201, _prepare_activate_license),
+    Scenario('increase-license-users', 'POST', 200, _prepare_increase_users),
+    Scenario('register-employee-by-admin', 'POST', 201, _prepare_register_employee),
+    Scenario('import-employees', 'POST', 200, _prepare_import_employees),
+    Scenario('delete-employee', 'DELETE', 204, _prepare_delete_employee),
+    Scenario('delete-employees', 'POST', 200, _prepare_delete_employees),
+    Scenario('delete-company', 'DELETE', 202, _prepare_delete_company),
+)
+TOKEN_URL_NAMES = ('token_obtain_pair', 'token_refresh', 'token_verify')
+
+
+def check_coverage():
+    """
+    Fail when a licensing route or token endpoint has no scenario, so new routes get one.
+    """
+    from licensingapp.urls import urlpatterns
+    missing = ({pattern.name for pattern in urlpatterns} | set(TOKEN_URL_NAMES)) - {scenario.name for scenario in SCENARIOS}
+    if missing:
+        raise SystemExit(f"No benchmark scenario for: {', '.join(sorted(missing))}")
+
+
+def drive_wsgi(application, requests, concurrency):
+    def call(request):
+        started = time.perf_counter()
+        status_code, _ = wsgi_request(application, *request)
+        return status_code, time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(call, requests))
+    return time.perf_counter() - started, results
+
+
+def drive_asgi(application, requests, concurrency):
+    async def drive():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call(request):
+            async with semaphore:
+                started = time.perf_counter()
+                status_code, _ = await asgi_request(application, *request)
+                return status_code, time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(call(request) for request in requests))
+        return time.perf_counter() - started, results
+
+    return asyncio.run(drive())
+
+
+def run_scenario(scenario, dataset, handler, application, args):
+    from project.commons.metrics import registry
+
+    drive = drive_wsgi if handler == 'wsgi' else drive_asgi
+    requests = scenario.prepare(dataset, args.warmup + args.requests)
+    if args.warmup:
+        drive(application, requests[:args.warmup], args.concurrency)
+    registry.reset()
+    elapsed, results = drive(application, requests[args.warmup:], args.concurrency)
+
+    route = registry.snapshot().get((scenario.name, scenario.method))
+    queries = route[3] if route else 0
+    latencies = [latency for _, latency in results]
+    p50, p95, p99 = (statistics.quantiles(latencies, n=100, method='inclusive')[p - 1] for p in (50, 95, 99))
+    return {
+        'scenario': scenario.name,
+        'method': scenario.method,
+        'requests': len(results),
+        'errors': sum(status_code != scenario.expected_status for status_code, _ in results),
+        'p50_ms': round(p50 * 1000, 3),
+        'p95_ms': round(p95 * 1000, 3),
+        'p99_ms': round(p99 * 1000, 3),
+        'throughput_rps': round(len(results) / elapsed, 1),
+        'queries_per_request': round(queries / len(results), 2),
+    }
+
+
+def run_dataset(name, args):
+    from django.core.asgi import get_asgi_application
+    from django.core.cache import cache
+    from django.core.wsgi import get_wsgi_application
+    from licensingapp.license_catalog import reset_catalog_snapshot
+
+    applications = {'wsgi': get_wsgi_application, 'asgi': get_asgi_application}
+    scenarios = [scenario for scenario in SCENARIOS if not args.scenarios or scenario.name in args.scenarios]
+    results = []
+    with benchmark_database():
+        started = time.perf_counter()
+        dataset = seed_dataset(**DATASETS[name])
+        print(f"{name}: seeded {DATASETS[name]} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        for handler in args.handlers:
+            # Both handlers start from cold caches.
+            cache.clear()
+            reset_catalog_snapshot()
+            application = applications[handler]()
+            for scenario in scenarios:
+                result = dict(dataset=name, handler=handler, **run_scenario(scenario, dataset, handler, application, args))
+                print_result(result)
+                results.append(result)
+    return results
+
+
+def print_result(result):
+    print(
+        f"{result['dataset']:<7} {result['handler']:<5} {result['scenario']:<35} "
+        f"p50 {result['p50_ms']:8.2f}ms p95 {result['p95_ms']:8.2f}ms p99 {result['p99_ms']:8.2f}ms "
+        f"{result['throughput_rps']:9.1f} req/s {result['queries_per_request']:6.2f} q/req"
+        + (f" {result['errors']} ERRORS" if result['errors'] else ''),
+        file=sys.stderr,
+    )
+
+
+def compare(results, baseline, args):
+    """
+    Regressions of results against the baseline results, as messages.
+    """
+    previous = {(r['dataset'], r['handler'], r['scenario']): r for r in baseline}
+    regressions = []
+    for result in results:
+        key = (result['dataset'], result['handler'], result['scenario'])
+        label = '/'.join(key)
+        if result['errors']:
+            regressions.append(f"{label}: {result['errors']} of {result['requests']} requests failed")
+        before = previous.get(key)
+        if before is None:
+            continue
+        for metric in ('p50_ms', 'p95_ms', 'p99_ms'):
+            limit = before[metric] * (1 + args.max_latency_increase)
+            # Sub-millisecond jitter on fast endpoints is not a regression.
+            if result[metric] > limit and result[metric] - before[metric] >= args.min_latency_delta_ms:
+                regressions.append(f"{label}: {metric} {before[metric]} -> {result[metric]}")
+        if result['throughput_rps'] < before['throughput_rps'] * (1 - args.max_throughput_decrease):
+            regressions.append(f"{label}: throughput_rps {before['throughput_rps']} -> {result['throughput_rps']}")
+        if result['queries_per_request'] > before['queries_per_request'] + args.max_query_increase:
+            regressions.append(f"{label}: queries_per_request {before['queries_per_request']} -> {result['queries_per_request']}")
+    return regressions
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(requests=50, concurrency=1)
+    parser.add_argument('--datasets', nargs='+', choices=DATASETS, default=['small', 'medium'])
+    parser.add_argument('--handlers', nargs='+', choices=HANDLERS, default=list(HANDLERS))
+    parser.add_argument('--scenarios', nargs='+', help='Only run these scenarios (URL names).')
+    parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per scenario before the measured ones.')
+    parser.add_argument('--output', help='Write the JSON results here instead of stdout.')
+    parser.add_argument('--baseline', help='JSON results of an earlier run to compare against.')
+    parser.add_argument('--results', help='Compare these stored JSON results instead of running the suite.')
+    parser.add_argument('--max-latency-increase', type=float, default=0.25, help='Allowed relative p50/p95/p99 increase.')
+    parser.add_argument('--min-latency-delta-ms', type=float, default=1.0, help='Latency increases smaller than this never count.')
+    parser.add_argument('--max-throughput-decrease', type=float, default=0.20, help='Allowed relative throughput decrease.')
+    parser.add_argument('--max-query-increase', type=float, default=0, help='Allowed increase in queries per request.')
+    args = parser.parse_args()
+    if args.requests < 2:
+        parser.error('--requests must be at least 2 to compute percentiles')
+
+    if args.results:
+        with open(args.results) as f:
+            report = json.load(f)
+    else:
+        setup_django()
+        import django
+        from rest_framework_simplejwt.settings import api_settings
+        # Rotation blacklists the old refresh token, which needs the token_blacklist app this
+        # project does not install; measure refreshes without it, like the tenant token tests.
+        api_settings.ROTATE_REFRESH_TOKENS = False
+        check_coverage()
+        report = {
+            'meta': {
+                'created_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'cpus': os.cpu_count(),
+                'requests': args.requests,
+                'warmup': args.warmup,
+                'concurrency': args.concurrency,
+                'datasets': {name: DATASETS[name] for name in args.datasets},
+            },
+            'results': [result for name in args.datasets for result in run_dataset(name, args)],
+        }
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(report, f, indent=2)
+        else:
+            json.dump(report, sys.stdout, indent=2)
+            print()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for key in ('requests', 'concurrency'):
+            if baseline['meta'].get(key) != report['meta'].get(key):
+                print(f"warning: baseline ran with {key}={baseline['meta'].get(key)}, this run with {report['meta'].get(key)}", file=sys.stderr)
+        regressions = compare(report['results'], baseline['results'], args)
+    else:
+        regressions = compare(report['results'], [], args)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Render and parse times of DRF's JSONRenderer/JSONParser versus the FastJSONRenderer/
+FastJSONParser pair, on the get_all_license_types payload and on employee listing pages,
+plus the peak memory of rendering a large page in one piece versus streaming it.
+"""
+import io
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.common import base_parser, setup_django
+
+
+def timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def peak_memory(func):
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def license_types_payload(count):
+    from decimal import Decimal
+    from licensingapp.models import LicenseType
+    from licensingapp.serializers import LicenseTypeSerializer
+
+    license_types = [
+        LicenseType(id=i, name=f'License {i}', duration=12, duration_type='months', price_per_user=Decimal('19.99'))
+        for i in range(count)
+    ]
+    return {"license_types": LicenseTypeSerializer(license_types, many=True).data, "status": "success"}
+
+
+def employee_rows(count):
+    from licensingapp.serializers import employee_listing_row
+    return [
+        employee_listing_row({
+            'id': i, 'role': 'user',
+            'user_id': i, 'user__username': f'employee{i}', 'user__email': f'employee{i}@example.com',
+            'user__first_name': f'Fïrst{i}', 'user__last_name': f'Last{i}',
+            'company_id': 1, 'company__name': 'Benchmark Company', 'company__address': 'Benchmark St',
+        })
+        for i in range(count)
+    ]
+
+
+def employee_page(rows, total_count):
+    return {
+        'status': "success", 'employees': rows, 'total_count': total_count, 'has_next_page': False,
+        'next_offset': None, 'has_previous_page': False, 'previous_offset': None,
+    }
+
+
+def main():
+    parser = base_parser(__doc__, concurrency=False)
+    parser.set_defaults(requests=50)
+    parser.add_argument('--license-types', type=int, default=50)
+    parser.add_argument('--page-sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    args = parser.parse_args()
+    setup_django()
+
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from project.commons.fast_json import FastJSONParser, FastJSONRenderer
+
+    payloads = {f'license_types({args.license_types})': license_types_payload(args.license_types)}
+    for page_size in args.page_sizes:
+        payloads[f'employees({page_size})'] = employee_page(employee_rows(page_size), page_size)
+
+    print(f"{'payload':<22} {'bytes':>9} {'render ms':>10} {'fast ms':>9} {'parse ms':>9} {'fast ms':>9}")
+    for name, payload in payloads.items():
+        content = JSONRenderer().render(payload)
+        if FastJSONRenderer().render(payload) != content:
+            raise RuntimeError(f"Renderers disagree on {name}")
+        print(
+            f"{name:<22} {len(content):>9}"
+            f" {timed(lambda: JSONRenderer().render(payload), args.requests):>10.3f}"
+            f" {timed(lambda: FastJSONRenderer().render(payload), args.requests):>9.3f}"
+            f" {timed(lambda: JSONParser().parse(io.BytesIO(content)), args.requests):>9.3f}"
+            f" {timed(lambda: FastJSONParser().parse(io.BytesIO(content)), args.requests):>9.3f}"
+        )
+
+    print()
+    print(f"{'payload':<22} {'buffered KiB':>13} {'streamed KiB':>13}")
+    for page_size in args.page_sizes:
+        renderer = FastJSONRenderer()
+        envelope = employee_page(None, page_size)
+
+        def buffered():
+            renderer.render(employee_page(employee_rows(page_size), page_size))
+
+        def streamed():
+            rows = (row for chunk in range(0, page_size, 500) for row in employee_rows(min(500, page_size - chunk)))
+            for _ in renderer.iter_list_response(envelope, 'employees', rows):
+                pass
+
+        print(f"{f'employees({page_size})':<22} {peak_memory(buffered):>13.0f} {peak_memory(streamed):>13.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Concurrency stress test of license activation. Checks that parallel retries sharing an
+Idempotency-Key activate exactly once, that parallel renewals of one company chain their
+dates without overlaps, and measures activation throughput across many companies.
+"""
+import datetime
+
+from benchmarks.common import base_parser, benchmark_database, report, run_concurrently, setup_django
+
+
+def _check(condition, message):
+    if not condition:
+        raise RuntimeError(message)
+
+
+def seed_company(index):
+    from django.contrib.auth.models import User
+    from rest_framework_simplejwt.tokens import AccessToken
+    from licensingapp.models import Company, Employee
+    from project.commons.common_constants import Role
+
+    user = User.objects.create_user(username=f'benchmark-admin-{index}', password='benchmarkpassword')
+    company = Company.objects.create(name=f'Benchmark Company {index}', address='Benchmark St')
+    Employee.objects.create(user=user, company=company, role=Role.ADMIN.value)
+    return company, str(AccessToken.for_user(user))
+
+
+def activate(token, license_type_id, key):
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+    response = client.post(reverse('activate-license'), {'license_type': license_type_id}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+    _check(response.status_code == 201, f"Unexpected {response.status_code}: {response.content[:200]!r}")
+    return response.content
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(requests=200, concurrency=16)
+    parser.add_argument('--companies', type=int, default=20, help='Companies sharing the throughput scenario.')
+    args = parser.parse_args()
+    setup_django()
+
+    from licensingapp.models import CompanyLicense, LicenseType
+
+    print(f"concurrency={args.concurrency}")
+    with benchmark_database():
+        license_type = LicenseType.objects.create(name='Benchmark License', duration=1, duration_type='months', price_per_user='10.00')
+
+        company, token = seed_company('retries')
+        elapsed, bodies = run_concurrently(lambda i: activate(token, license_type.id, 'same-key'), args.requests, args.concurrency)
+        licenses = CompanyLicense.objects.filter(company=company).count()
+        _check(licenses == 1, f"{licenses} licenses activated for one Idempotency-Key")
+        _check(len(set(bodies)) == 1, "Replayed responses differ from the original")
+        report('retries (one key)', 'exactly-once', args.requests, elapsed)
+
+        company, token = seed_company('renewals')
+        elapsed, _ = run_concurrently(lambda i: activate(token, license_type.id, f'renewal-{i}'), args.requests, args.concurrency)
+        periods = list(CompanyLicense.objects.filter(company=company).order_by('start_date').values_list('start_date', 'end_date'))
+        _check(len(periods) == args.requests, f"{len(periods)} licenses for {args.requests} renewals")
+        for (_, previous_end), (start, _) in zip(periods, periods[1:]):
+            _check(start == previous_end + datetime.timedelta(days=1), f"License starting {start} does not follow {previous_end}")
+        report('renewals (one company)', 'serialized', args.requests, elapsed)
+
+        tokens = [seed_company(f'throughput-{i}')[1] for i in range(args.companies)]
+        elapsed, _ = run_concurrently(
+            lambda i: activate(tokens[i % args.companies], license_type.id, f'throughput-{i}'), args.requests, args.concurrency,
+        )
+        report(f'{args.companies} companies', 'throughput', args.requests, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Requests/sec of the registration and token endpoints with passwords hashed in the request
+thread versus in the PASSWORD_HASHING_WORKERS process pool, at a fixed request concurrency.
+"""
+import os
+
+from benchmarks.common import base_parser, benchmark_database, report, run_concurrently, setup_django
+
+
+def _check(response, expected_status):
+    if response.status_code != expected_status:
+        raise RuntimeError(f"Unexpected {response.status_code}: {response.content[:200]!r}")
+
+
+def run_scenarios(variant, args, run_id):
+    from django.contrib.auth.models import User
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    def register_company(i):
+        payload = {
+            'user': {'username': f'{run_id}-owner{i}', 'password': 'benchmarkpassword'},
+            'company': {'name': f'Company {run_id}-{i}', 'address': 'Benchmark St'},
+        }
+        _check(APIClient().post(reverse('register-company'), payload, format='json'), 201)
+
+    elapsed, _ = run_concurrently(register_company, args.requests, args.concurrency)
+    report('register_company', variant, args.requests, elapsed)
+
+    User.objects.create_user(username=f'{run_id}-login', password='benchmarkpassword')
+
+    def obtain_token(i):
+        payload = {'username': f'{run_id}-login', 'password': 'benchmarkpassword'}
+        _check(APIClient().post(reverse('token_obtain_pair'), payload, format='json'), 200)
+
+    elapsed, _ = run_concurrently(obtain_token, args.requests, args.concurrency)
+    report('token_obtain_pair', variant, args.requests, elapsed)
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.add_argument('--pool-workers', type=int, default=os.cpu_count(), help='PASSWORD_HASHING_WORKERS for the pooled run.')
+    args = parser.parse_args()
+    setup_django()
+
+    from django.test import override_settings
+    from project.commons.password_hashing import get_password_pool, shutdown_password_pool
+
+    print(f"concurrency={args.concurrency} pool_workers={args.pool_workers} cpus={os.cpu_count()}")
+    with benchmark_database():
+        with override_settings(PASSWORD_HASHING_WORKERS=0):
+            run_scenarios('inline', args, 'inline')
+        with override_settings(PASSWORD_HASHING_WORKERS=args.pool_workers):
+            # Start the worker processes before timing.
+            list(get_password_pool().map(abs, range(args.pool_workers)))
+            run_scenarios(f'pool({args.pool_workers})', args, 'pool')
+            shutdown_password_pool()
+
+
+if __name__ == '__main__':
+    main()
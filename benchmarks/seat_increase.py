@@ -0,0 +1,93 @@
+"""
+Concurrent seat increases on one company's license: the former read-modify-save() inside a
+transaction versus the conditional F() UPDATE of add_license_seats. Every call
+adds one seat; lost updates are the seats missing from the final total_users. Runs under
+IMMEDIATE and SQLite's default DEFERRED transactions, in rollback journal and WAL mode.
+"""
+from benchmarks.common import base_parser, benchmark_database, report, run_concurrently, setup_django
+
+TRANSACTION_MODES = ('IMMEDIATE', 'DEFERRED')
+JOURNAL_MODES = ('DELETE', 'WAL')
+
+
+def seed(variant):
+    from datetime import timedelta
+    from django.utils import timezone
+    from licensingapp.models import Company, CompanyLicense, LicenseType
+
+    company = Company.objects.create(name=f'Benchmark Company {variant}', address='Benchmark St')
+    license_type = LicenseType.objects.create(name=f'Benchmark License {variant}', duration=1, duration_type='years', price_per_user='19.99')
+    CompanyLicense.objects.create(
+        company=company,
+        license_type=license_type,
+        total_users=1,
+        total_amount='19.99',
+        start_date=timezone.now().date(),
+        end_date=timezone.now().date() + timedelta(days=365),
+        status='active',
+    )
+    return company.id
+
+
+def save_increase(company_id):
+    """
+    increase_total_users as it was: load the license, add in Python, save() every column.
+    """
+    from django.db import transaction
+    from licensingapp.models import CompanyLicense
+
+    with transaction.atomic():
+        latest_license = CompanyLicense.objects.select_related('company', 'license_type').filter(company_id=company_id, status='active').order_by('-end_date').first()
+        latest_license.total_users += 1
+        latest_license.total_amount = latest_license.license_type.price_per_user * latest_license.total_users
+        latest_license.save()
+
+
+def conditional_increase(company_id):
+    from licensingapp.seat_usage import add_license_seats
+    add_license_seats(company_id, 1)
+
+
+VARIANTS = {
+    'save()': save_increase,
+    'conditional': conditional_increase,
+}
+
+
+def run(variant, increase, args):
+    from licensingapp.models import CompanyLicense
+
+    company_id = seed(variant)
+
+    def call(i):
+        try:
+            increase(company_id)
+            return True
+        except Exception:
+            return False
+
+    elapsed, results = run_concurrently(call, args.requests, args.concurrency)
+    succeeded = sum(results)
+    total_users = CompanyLicense.objects.get(company_id=company_id).total_users
+    lost = 1 + succeeded - total_users
+    report('seat increases', variant, args.requests, elapsed)
+    print(f"{'':<24} {'':<16} failed={args.requests - succeeded} lost_updates={lost}")
+
+
+def main():
+    parser = base_parser(__doc__)
+    parser.set_defaults(requests=400, concurrency=16)
+    args = parser.parse_args()
+    setup_django()
+
+    print(f"concurrency={args.concurrency}")
+    for journal_mode in JOURNAL_MODES:
+        for transaction_mode in TRANSACTION_MODES:
+            print(f"journal_mode={journal_mode} transaction_mode={transaction_mode}")
+            with benchmark_database(transaction_mode, journal_mode):
+                for variant, increase in VARIANTS.items():
+                    run(variant, increase, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Multi-process write/read load against one SQLite file, with Django's default connection
+setup (rollback journal, DEFERRED transactions, the sqlite3 module's 5 s lock wait, a new
+connection per request) versus the production profile of project/commons/db_profile.py
+(WAL and tuned pragmas, IMMEDIATE transactions, persistent connections). Writers register employees the way
+register_employee_by_admin does, checking the seat count before inserting; readers list a
+page of employees and the active license. Reports throughput and "database is locked" rates.
+"""
+import multiprocessing
+import time
+
+from benchmarks.common import base_parser, benchmark_database, setup_django
+
+DEFAULT_PROFILE = {'options': {}, 'conn_max_age': 0}
+
+
+def production_profile():
+    from project.commons.db_profile import sqlite_database
+    database = sqlite_database('unused', profile='production')
+    return {'options': dict(database['OPTIONS']), 'conn_max_age': database['CONN_MAX_AGE']}
+
+
+def seed():
+    from datetime import timedelta
+    from django.utils import timezone
+    from licensingapp.models import Company, CompanyLicense, LicenseType
+
+    company = Company.objects.create(name='Benchmark Company', address='Benchmark St')
+    license_type = LicenseType.objects.create(name='Benchmark License', duration=1, duration_type='years', price_per_user='10.00')
+    CompanyLicense.objects.create(
+        company=company, license_type=license_type, total_users=1_000_000, total_amount='10000000.00',
+        start_date=timezone.now().date(), end_date=timezone.now().date() + timedelta(days=365), status='active',
+    )
+    return company.id
+
+
+def write(company_id, username):
+    from django.contrib.auth.models import User
+    from django.db import transaction
+    from licensingapp.models import Company, Employee
+
+    with transaction.atomic():
+        # Read first, then write: the pattern that fails to upgrade under DEFERRED transactions.
+        Company.objects.filter(pk=company_id).values_list('employee_count', flat=True).get()
+        user = User.objects.create(username=username, password='!')
+        Employee.objects.create(user=user, company_id=company_id)
+
+
+def read(company_id):
+    from licensingapp.models import CompanyLicense, Employee
+
+    list(Employee.objects.filter(company_id=company_id).select_related('user').order_by('-pk')[:50])
+    CompanyLicense.objects.filter(company_id=company_id, status='active').order_by('-end_date').first()
+
+
+def worker(role, index, company_id, requests, queue):
+    from django.db import OperationalError, close_old_connections
+
+    completed = locked = 0
+    for i in range(requests):
+        try:
+            if role == 'writer':
+                write(company_id, f'benchmark-{index}-{i}')
+            else:
+                read(company_id)
+            completed += 1
+        except OperationalError as e:
+            if 'locked' not in str(e):
+                raise
+            locked += 1
+        # Request boundary: closes the connection unless CONN_MAX_AGE keeps it.
+        close_old_connections()
+    queue.put((role, completed, locked))
+
+
+def run(variant, profile, args):
+    from django.db import connections
+
+    with benchmark_database(options=profile['options'], conn_max_age=profile['conn_max_age']):
+        company_id = seed()
+        # Children must open their own connections, never share one across fork.
+        connections.close_all()
+
+        context = multiprocessing.get_context('fork')
+        queue = context.Queue()
+        roles = ['writer'] * args.writers + ['reader'] * args.readers
+        processes = [context.Process(target=worker, args=(role, index, company_id, args.requests, queue)) for index, role in enumerate(roles)]
+        started = time.perf_counter()
+        for process in processes:
+            process.start()
+        results = [queue.get() for _ in processes]
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - started
+
+    for role in ('writer', 'reader'):
+        completed = sum(done for r, done, _ in results if r == role)
+        locked = sum(failed for r, _, failed in results if r == role)
+        attempts = completed + locked
+        print(
+            f"{variant:<12} {role + 's':<8} {completed:>7} ok {completed / elapsed:10.1f} req/s "
+            f"{locked:>6} locked ({100 * locked / attempts if attempts else 0:5.1f}%)"
+        )
+    print(f"{variant:<12} {'elapsed':<8} {elapsed:8.2f}s")
+
+
+def main():
+    parser = base_parser(__doc__, concurrency=False)
+    parser.set_defaults(requests=200)
+    parser.add_argument('--writers', type=int, default=4, help='Writer processes.')
+    parser.add_argument('--readers', type=int, default=4, help='Reader processes.')
+    args = parser.parse_args()
+    setup_django()
+
+    print(f"writers={args.writers} readers={args.readers} requests per process={args.requests}")
+    for variant, profile in (('default', DEFAULT_PROFILE), ('production', production_profile())):
+        run(variant, profile, args)
+
+
+if __name__ == '__main__':
+    main()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LicensingappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'licensingapp'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,62 @@
+from project.commons.tenant_context import aget_tenant_context
+from .license_cache import aget_license_state
+from .license_catalog import aget_catalog_version, aget_catalog_snapshot, catalog_not_modified
+from .read_responses import employee_not_found_response, license_type_not_found_response, license_type_response, license_types_response, license_capacity_response, company_license_info_response, user_company_and_employee_response, active_license_response
+
+
+class AsyncLicensingService:
+    """
+    Async versions of the LicensingService read methods, built on the async ORM and cache APIs.
+    Only the loading differs; the responses are built by the same read_responses functions.
+    """
+
+    async def get_license_type(self, request, pk):
+        version = await aget_catalog_version()
+        license_type = (await aget_catalog_snapshot(version)).get(pk)
+        if license_type is None:
+            return license_type_not_found_response()
+
+        etag = version.etag(request, pk)
+        not_modified = catalog_not_modified(request, etag, version, public=False)
+        if not_modified is not None:
+            return not_modified
+
+        return license_type_response(license_type, etag, version)
+
+    async def get_all_license_types(self, request):
+        version = await aget_catalog_version()
+        etag = version.etag(request, 'all')
+        not_modified = catalog_not_modified(request, etag, version, public=True)
+        if not_modified is not None:
+            return not_modified
+
+        return license_types_response((await aget_catalog_snapshot(version)).records, etag, version)
+
+    async def check_license_capacity(self, request):
+        tenant = await aget_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
+
+        company = await tenant.aget_company()
+        return license_capacity_response(company, await aget_license_state(tenant.company_id))
+
+    async def get_company_license_info(self, request):
+        tenant = await aget_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
+
+        company = await tenant.aget_company()
+        return company_license_info_response(company, await aget_license_state(tenant.company_id))
+
+    async def get_user_company_and_employee_info(self, request):
+        tenant = await aget_tenant_context(request)
+        if not tenant.exists:
+            return user_company_and_employee_response(None, None)
+        return user_company_and_employee_response(await tenant.aget_company(), await tenant.aget_employee())
+
+    async def check_active_license(self, request):
+        tenant = await aget_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
+
+        return active_license_response(await aget_license_state(tenant.company_id))
@@ -0,0 +1,53 @@
+from rest_framework.permissions import IsAuthenticated, AllowAny
+from rest_framework.request import Request
+from rest_framework.response import Response
+from project.commons.async_api import async_api_view
+from project.commons.middleware import AdminRoleCheckPermission
+from project.commons.db_routing import read_from_replica
+
+from .async_services import AsyncLicensingService
+
+__all__ = [
+    'get_license_type',
+    'get_all_license_types',
+    'check_license_capacity',
+    'get_company_license_info',
+    'get_user_company_and_employee_info_view',
+    'check_active_license',
+]
+
+async_licensing_service = AsyncLicensingService()
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated])
+async def get_license_type(request: Request, pk: int) -> Response:
+    return await async_licensing_service.get_license_type(request, pk)
+
+
+@async_api_view(['GET'], permission_classes=[AllowAny])
+async def get_all_license_types(request: Request) -> Response:
+    return await async_licensing_service.get_all_license_types(request)
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated, AdminRoleCheckPermission])
+@read_from_replica
+async def check_license_capacity(request: Request) -> Response:
+    return await async_licensing_service.check_license_capacity(request)
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated, AdminRoleCheckPermission])
+@read_from_replica
+async def get_company_license_info(request: Request) -> Response:
+    return await async_licensing_service.get_company_license_info(request)
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated])
+@read_from_replica
+async def get_user_company_and_employee_info_view(request: Request) -> Response:
+    return await async_licensing_service.get_user_company_and_employee_info(request)
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated])
+@read_from_replica
+async def check_active_license(request: Request) -> Response:
+    return await async_licensing_service.check_active_license(request)
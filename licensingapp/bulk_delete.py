@@ -0,0 +1,157 @@
+"""
+Set-based deletes that bypass Django's deletion collector: no model instances are loaded and
+no delete signals are sent, so callers update counters and caches themselves. The on_delete of
+every relation is still honoured: CASCADE rows are deleted recursively, SET_NULL and
+SET_DEFAULT columns are updated, and any other rule refuses the delete.
+"""
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import CASCADE, PROTECT, SET_DEFAULT, SET_NULL, ProtectedError, RestrictedError
+
+from .models import Employee
+
+
+def _select_in(model, select_column, column, values):
+    if not values:
+        return []
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {qn(select_column)} FROM {qn(model._meta.db_table)} WHERE {qn(column)} IN ({placeholders})",
+            list(values),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def _update_in(model, set_column, set_value, column, values):
+    if not values:
+        return 0
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {qn(model._meta.db_table)} SET {qn(set_column)} = %s WHERE {qn(column)} IN ({placeholders})",
+            [set_value, *values],
+        )
+        return cursor.rowcount
+
+
+def _links(model):
+    # Rows of many-to-many link tables always go with either end of the link.
+    result = []
+    for relation in model._meta.related_objects:
+        if relation.many_to_many:
+            through = relation.field.remote_field.through
+            if through._meta.auto_created:
+                result.append((through, through._meta.get_field(relation.field.m2m_reverse_field_name()).column))
+    for field in model._meta.local_many_to_many:
+        through = field.remote_field.through
+        if through._meta.auto_created:
+            result.append((through, through._meta.get_field(field.m2m_field_name()).column))
+    return result
+
+
+def _foreign_keys(model, exclude):
+    # Custom many-to-many through models are plain foreign keys with their own on_delete.
+    return [
+        relation for relation in model._meta.related_objects
+        if not relation.many_to_many and relation.related_model not in exclude
+    ]
+
+
+def dependents(model, exclude=()):
+    """
+    (model, column) of every model whose rows are deleted with a ``model`` row: CASCADE
+    foreign keys and many-to-many link tables. delete_chunk and delete_rows recurse into their
+    own dependents.
+    """
+    result = [
+        (relation.related_model, relation.field.column)
+        for relation in _foreign_keys(model, exclude)
+        if relation.field.remote_field.on_delete is CASCADE
+    ]
+    return result + _links(model)
+
+
+def release_dependents(model, pks, exclude=()):
+    """
+    Apply the on_delete of every relation pointing at the ``pks`` rows of ``model``, so they
+    can be deleted with raw SQL: cascade into CASCADE relations (recursively), set SET_NULL and
+    SET_DEFAULT columns, and raise ProtectedError or RestrictedError when rows of any other
+    relation still reference them. Run it inside a transaction: rows cascaded before the error
+    are only restored by the rollback.
+    """
+    if not pks:
+        return
+    for through, column in _links(model):
+        delete_in(through, column, pks)
+    for relation in _foreign_keys(model, exclude):
+        field = relation.field
+        on_delete = field.remote_field.on_delete
+        target = field.target_field
+        values = pks if target.primary_key else _select_in(model, target.column, model._meta.pk.column, pks)
+        related_model = relation.related_model
+        if on_delete is CASCADE:
+            delete_rows(related_model, _select_in(related_model, related_model._meta.pk.column, field.column, values))
+        elif on_delete is SET_NULL:
+            _update_in(related_model, field.column, None, field.column, values)
+        elif on_delete is SET_DEFAULT:
+            _update_in(related_model, field.column, field.get_default(), field.column, values)
+        else:
+            referencing = related_model._base_manager.filter(**{f'{field.name}__in': values})
+            if referencing.exists():
+                message = (
+                    f"Cannot delete {model._meta.label} rows with raw SQL: they are referenced by "
+                    f"{related_model._meta.label}.{field.name}, whose on_delete is {getattr(on_delete, '__name__', on_delete)}."
+                )
+                error = ProtectedError if on_delete is PROTECT else RestrictedError
+                raise error(message, set(referencing))
+
+
+def delete_rows(model, pks, exclude=()):
+    """
+    Delete the ``pks`` rows of ``model`` after releasing their dependents. Returns the number of
+    rows deleted.
+    """
+    release_dependents(model, pks, exclude)
+    return delete_in(model, model._meta.pk.column, pks)
+
+
+def delete_chunk(model, column, value, batch_size):
+    """
+    Delete at most ``batch_size`` rows of ``model`` whose ``column`` equals ``value``, together
+    with their dependents, without loading them. Returns the number of rows deleted.
+    """
+    qn = connection.ops.quote_name
+    pk = model._meta.pk.column
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {qn(pk)} FROM {qn(model._meta.db_table)} WHERE {qn(column)} = %s LIMIT %s",
+            [value, batch_size],
+        )
+        pks = [row[0] for row in cursor.fetchall()]
+    return delete_rows(model, pks)
+
+
+def delete_in(model, column, values):
+    """
+    Delete the rows of ``model`` whose ``column`` is one of ``values``, leaving their dependents
+    alone. Returns the number of rows deleted.
+    """
+    if not values:
+        return 0
+    qn = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {qn(model._meta.db_table)} WHERE {qn(column)} IN ({placeholders})", list(values))
+        return cursor.rowcount
+
+
+def delete_employees_with_users(employee_ids, user_ids):
+    """
+    Delete the given employees and their users, including the users' group and permission
+    links and admin log entries. Returns (employees deleted, users deleted).
+    """
+    employees_deleted = delete_rows(Employee, employee_ids)
+    return employees_deleted, delete_rows(User, user_ids, exclude=(Employee,))
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.utils import timezone
+
+from project.commons.common_constants import PurgePhase
+from .models import Company, CompanyLicense, CompanyPurge, Employee
+from .bulk_delete import delete_chunk, delete_employees_with_users, delete_rows, dependents
+
+
+def _purge_licenses(purge, batch_size):
+    deleted = delete_chunk(CompanyLicense, 'company_id', purge.company_id, batch_size)
+    purge.licenses_deleted += deleted
+    if deleted < batch_size:
+        purge.phase = PurgePhase.EMPLOYEES.value
+
+
+def _purge_employees(purge, batch_size):
+    rows = list(
+        Employee.objects.filter(company_id=purge.company_id)
+        .order_by('pk')
+        .values_list('pk', 'user_id')[:batch_size]
+    )
+    if rows:
+        employees_deleted, users_deleted = delete_employees_with_users([pk for pk, _ in rows], [user_id for _, user_id in rows])
+        purge.employees_deleted += employees_deleted
+        purge.users_deleted += users_deleted
+    if len(rows) < batch_size:
+        purge.phase = PurgePhase.COMPANY.value
+
+
+def _purge_company(purge, batch_size):
+    # Remaining company data (idempotency records, ...) is removed chunk by chunk before the row itself,
+    # which then only has SET_NULL / SET_DEFAULT or protecting relations left to apply.
+    exclude = (Employee, CompanyLicense)
+    for model, column in dependents(Company, exclude=exclude):
+        if delete_chunk(model, column, purge.company_id, batch_size) == batch_size:
+            return
+    delete_rows(Company, [purge.company_id], exclude=exclude)
+    purge.phase = PurgePhase.DONE.value
+    purge.finished_at = timezone.now()
+
+
+_PHASES = {
+    PurgePhase.LICENSES.value: _purge_licenses,
+    PurgePhase.EMPLOYEES.value: _purge_employees,
+    PurgePhase.COMPANY.value: _purge_company,
+}
+
+
+def purge_company(purge_id, batch_size=500):
+    """
+    Remove the data of a deleted company: licenses, then employees together with their users,
+    then the company row. Every chunk of at most ``batch_size`` rows is deleted with raw SQL in
+    its own short transaction that also records the progress on the CompanyPurge row, so an
+    interrupted purge resumes where it stopped. Returns the finished CompanyPurge.
+    """
+    while True:
+        with transaction.atomic():
+            purge = CompanyPurge.objects.select_for_update().get(pk=purge_id)
+            if purge.finished_at is not None:
+                return purge
+            _PHASES[purge.phase](purge, batch_size)
+            purge.save()
+
+
+def purge_deleted_companies(batch_size=500):
+    """
+    Purge every deleted company whose purge has not finished yet. Returns the number of
+    companies purged.
+    """
+    purged = 0
+    for purge_id in CompanyPurge.objects.filter(finished_at__isnull=True).order_by('pk').values_list('pk', flat=True):
+        purge_company(purge_id, batch_size=batch_size)
+        purged += 1
+    return purged
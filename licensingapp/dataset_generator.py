@@ -0,0 +1,169 @@
+import datetime
+import random
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from project.commons.common_constants import DurationType, LicenseStatus, Role
+from .license_cache import invalidate_all_license_states
+from .models import Company, CompanyLicense, Employee, LicenseType
+
+# (name, duration, duration_type, price_per_user) of the license types companies are licensed on.
+DATASET_LICENSE_TYPES = (
+    ('Dataset Monthly', 1, DurationType.MONTHS.value, Decimal('2.00')),
+    ('Dataset Quarterly', 3, DurationType.MONTHS.value, Decimal('5.00')),
+    ('Dataset Yearly', 1, DurationType.YEARS.value, Decimal('12.00')),
+)
+
+# Share of companies whose latest license already ran out, and of licenses in the history
+# that were rejected instead of running their term.
+NO_ACTIVE_LICENSE_RATE = 0.1
+REJECTED_RATE = 0.1
+PENDING_RENEWAL_RATE = 0.2
+
+
+def employee_distribution(companies, employees, skew):
+    """
+    Employees per company, Zipf-like: the company at rank r gets a share proportional to
+    1 / r ** skew (0 spreads them evenly). Every company gets at least its admin.
+    """
+    if employees < companies:
+        raise ValueError("Every company needs at least one employee.")
+    weights = [1 / rank ** skew for rank in range(1, companies + 1)]
+    spare = employees - companies
+    scale = spare / sum(weights)
+    counts = [1 + int(weight * scale) for weight in weights]
+    # Rounding leftovers go to the largest companies.
+    for index in range(employees - sum(counts)):
+        counts[index % companies] += 1
+    return counts
+
+
+def _period(license_type):
+    # Same arithmetic as activate_license.
+    if license_type.duration_type == DurationType.DAYS.value:
+        return datetime.timedelta(days=license_type.duration)
+    if license_type.duration_type == DurationType.MONTHS.value:
+        return datetime.timedelta(days=30 * license_type.duration)
+    return datetime.timedelta(days=365 * license_type.duration)
+
+
+def _license_history(company_id, employee_count, license_type, history, today, rng):
+    """
+    Consecutive licenses ending with the current one: expired or rejected licenses, then an
+    active license (or, for some companies, one that expired), sometimes a pending renewal.
+    """
+    period = _period(license_type)
+    has_active = rng.random() >= NO_ACTIVE_LICENSE_RATE
+    if has_active:
+        # Somewhere into the current term.
+        start = today - datetime.timedelta(days=rng.randrange(period.days))
+    else:
+        start = today - period - datetime.timedelta(days=1 + rng.randrange(90))
+    terms = [(start, LicenseStatus.ACTIVE if has_active else LicenseStatus.EXPIRED)]
+    for _ in range(history - 1):
+        start -= period + datetime.timedelta(days=1)
+        terms.append((start, LicenseStatus.REJECTED if rng.random() < REJECTED_RATE else LicenseStatus.EXPIRED))
+    terms.reverse()
+    current = len(terms) - 1
+    if has_active and rng.random() < PENDING_RENEWAL_RATE:
+        terms.append((terms[-1][0] + period + datetime.timedelta(days=1), LicenseStatus.PENDING))
+
+    licenses = []
+    for index, (start, license_status) in enumerate(terms):
+        # Seats grow over the history up to the current term, which (like a pending renewal)
+        # covers every current employee plus some headroom, as the capacity checks enforce.
+        seats = employee_count * (min(index, current) + 1) // (current + 1)
+        total_users = max(1, seats) + rng.randrange(1 + employee_count // 5)
+        licenses.append(CompanyLicense(
+            company_id=company_id,
+            license_type_id=license_type.id,
+            total_users=total_users,
+            total_amount=license_type.price_per_user * total_users,
+            start_date=start,
+            end_date=start + period,
+            status=license_status.value,
+        ))
+    return licenses
+
+
+def _batches(iterable, batch_size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+def _create_users(users):
+    if connection.features.can_return_rows_from_bulk_insert:
+        return User.objects.bulk_create(users)
+    User.objects.bulk_create(users)
+    ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'id'))
+    for user in users:
+        user.id = ids[user.username]
+    return users
+
+
+def generate_dataset(companies, employees, skew=1.0, history=6, seed=0, batch_size=5000, password='password', prefix='dataset', progress=None):
+    """
+    Insert ``companies`` companies with ``employees`` employees between them (see
+    employee_distribution) and ``history`` licenses each, deterministically for a seed.
+    Rows are bulk inserted ``batch_size`` at a time, one transaction per batch, and only one
+    batch is held in memory. Every user gets the same precomputed ``password`` hash.
+    ``progress(employees_created)`` is called after every employee batch.
+    Returns the number of companies, employees and licenses created.
+    """
+    rng = random.Random(seed)
+    counts = employee_distribution(companies, employees, skew)
+    today = timezone.now().date()
+    password_hash = make_password(password)
+    license_types = [
+        LicenseType.objects.get_or_create(name=name, defaults={'duration': duration, 'duration_type': duration_type, 'price_per_user': price})[0]
+        for name, duration, duration_type, price in DATASET_LICENSE_TYPES
+    ]
+
+    company_ids = []
+    licenses_created = 0
+    for ranks in _batches(range(companies), batch_size):
+        with transaction.atomic():
+            created = Company.objects.bulk_create([
+                Company(name=f'{prefix} company {rank}', address=f'{rank} {prefix} street', employee_count=counts[rank])
+                for rank in ranks
+            ])
+            licenses = []
+            for rank, company in zip(ranks, created):
+                licenses += _license_history(company.id, counts[rank], rng.choice(license_types), history, today, rng)
+            CompanyLicense.objects.bulk_create(licenses, batch_size=batch_size)
+        company_ids += [company.id for company in created]
+        licenses_created += len(licenses)
+
+    def employee_rows():
+        for company_id, count in zip(company_ids, counts):
+            for number in range(count):
+                yield company_id, number
+
+    employees_created = 0
+    for rows in _batches(employee_rows(), batch_size):
+        with transaction.atomic():
+            users = _create_users([
+                User(
+                    username=f'{prefix}-{company_id}-{number}', password=password_hash, email=f'{prefix}-{company_id}-{number}@example.com',
+                    first_name=f'First{number}', last_name=f'Last{company_id}',
+                )
+                for company_id, number in rows
+            ])
+            # The first employee of every company is its admin.
+            Employee.objects.bulk_create([
+                Employee(user_id=user.id, company_id=company_id, role=(Role.ADMIN if number == 0 else Role.USER).value)
+                for user, (company_id, number) in zip(users, rows)
+            ])
+        employees_created += len(rows)
+        if progress is not None:
+            progress(employees_created)
+
+    # bulk_create sends no signals; drop license state cached before the licenses existed.
+    invalidate_all_license_states()
+    return companies, employees_created, licenses_created
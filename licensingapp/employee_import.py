@@ -0,0 +1,167 @@
+import codecs
+import csv
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from project.commons.common_constants import Role
+from project.commons.password_hashing import hash_passwords
+from .models import Company, Employee
+from .seat_usage import reserve_seats
+from .serializers import EmployeeImportRowSerializer
+
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+NDJSON_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl')
+
+DUPLICATE_USERNAME_ERROR = "A user with that username already exists."
+NO_CAPACITY_ERROR = "No more capacity available for new employees on the current license."
+CHUNK_ROLLED_BACK_ERROR = "Row was not imported because a concurrent change rolled back its chunk. Retry it."
+
+
+class ImportFormatError(ValueError):
+    pass
+
+
+def _csv_rows(lines):
+    for row in csv.DictReader(lines):
+        yield {key.strip(): value for key, value in row.items() if key}
+
+
+def _ndjson_rows(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            raise ImportFormatError(f"Line {line_number} is not valid JSON")
+        if not isinstance(row, dict):
+            raise ImportFormatError(f"Line {line_number} is not a JSON object")
+        yield row
+
+
+def iter_upload_rows(stream, content_type):
+    """
+    Lazily decode an uploaded CSV or NDJSON body into row dicts, one line at a time.
+    A leading UTF-8 byte order mark, as Excel writes it, is dropped.
+    """
+    lines = codecs.iterdecode(iter(stream) if stream is not None else iter(()), 'utf-8-sig')
+    if content_type in CSV_CONTENT_TYPES:
+        return _csv_rows(lines)
+    if content_type in NDJSON_CONTENT_TYPES:
+        return _ndjson_rows(lines)
+    raise ImportFormatError(f"Unsupported content type '{content_type}'. Upload text/csv or application/x-ndjson.")
+
+
+class EmployeeImporter:
+    """
+    Imports employees for a company chunk by chunk. Each chunk validates its usernames with
+    one query, hashes the passwords in parallel outside the transaction (in the password
+    hashing pool when one is configured), then reserves seats and inserts users and
+    employees with bulk_create inside a short transaction. Only counts and the first
+    ``max_failures`` failed rows are kept, so memory does not grow with the upload.
+    """
+
+    def __init__(self, company_id, allowed_users, chunk_size=None, hash_workers=None, max_failures=None):
+        self.company_id = company_id
+        self.allowed_users = allowed_users
+        self.chunk_size = chunk_size or getattr(settings, 'EMPLOYEE_IMPORT_CHUNK_SIZE', 500)
+        self.hash_workers = hash_workers or getattr(settings, 'EMPLOYEE_IMPORT_HASH_WORKERS', None) or os.cpu_count() or 1
+        self.max_failures = max_failures if max_failures is not None else getattr(settings, 'EMPLOYEE_IMPORT_MAX_REPORTED_FAILURES', 1000)
+        self.seen_usernames = set()
+        self.failures = []
+        self.created = 0
+        self.failed = 0
+
+    def run(self, rows):
+        """
+        Import all rows. Chunks commit independently, so when a later chunk fails to parse
+        the report still counts the rows that were already imported.
+        """
+        numbered_rows = enumerate(rows, start=1)
+        with ThreadPoolExecutor(max_workers=self.hash_workers) as executor:
+            while True:
+                chunk = list(islice(numbered_rows, self.chunk_size))
+                if not chunk:
+                    break
+                self._import_chunk(chunk, executor)
+        return self.report()
+
+    def report(self):
+        return {
+            'total': self.created + self.failed,
+            'created': self.created,
+            'failed': self.failed,
+            'failures': self.failures,
+            'failures_truncated': self.failed > len(self.failures),
+        }
+
+    def _error(self, row_number, username, errors):
+        self.failed += 1
+        return {'row': row_number, 'username': username, 'status': 'error', 'errors': errors}
+
+    def _import_chunk(self, chunk, executor):
+        outcomes = {}
+        candidates = []
+        for row_number, row in chunk:
+            serializer = EmployeeImportRowSerializer(data=row)
+            username = row.get('username')
+            if not serializer.is_valid():
+                outcomes[row_number] = self._error(row_number, username, serializer.errors)
+            elif serializer.validated_data['username'] in self.seen_usernames:
+                outcomes[row_number] = self._error(row_number, username, {'username': [DUPLICATE_USERNAME_ERROR]})
+            else:
+                self.seen_usernames.add(serializer.validated_data['username'])
+                candidates.append((row_number, serializer.validated_data))
+
+        existing = set(
+            User.objects.filter(username__in=[data['username'] for _, data in candidates]).values_list('username', flat=True)
+        )
+        accepted = []
+        for row_number, data in candidates:
+            if data['username'] in existing:
+                outcomes[row_number] = self._error(row_number, data['username'], {'username': [DUPLICATE_USERNAME_ERROR]})
+            else:
+                accepted.append((row_number, data))
+
+        # Skip hashing for rows that cannot get a seat anyway.
+        current = Company.objects.filter(pk=self.company_id).values_list('employee_count', flat=True).first() or 0
+        seats = max(0, self.allowed_users - current)
+        for row_number, data in accepted[seats:]:
+            outcomes[row_number] = self._error(row_number, data['username'], {'non_field_errors': [NO_CAPACITY_ERROR]})
+        accepted = accepted[:seats]
+
+        hashes = hash_passwords([data['password'] for _, data in accepted], executor)
+        users = [
+            User(**{**data, 'password': password_hash})
+            for (_, data), password_hash in zip(accepted, hashes)
+        ]
+
+        try:
+            with transaction.atomic():
+                granted = reserve_seats(self.company_id, self.allowed_users, len(users))
+                users = User.objects.bulk_create(users[:granted])
+                employees = Employee.objects.bulk_create([
+                    Employee(user_id=user.id, company_id=self.company_id, role=Role.USER.value) for user in users
+                ])
+        except IntegrityError:
+            # A concurrent request took one of the usernames, which rolled back the whole chunk.
+            taken = set(User.objects.filter(username__in=[data['username'] for _, data in accepted]).values_list('username', flat=True))
+            for row_number, data in accepted:
+                errors = {'username': [DUPLICATE_USERNAME_ERROR]} if data['username'] in taken else {'non_field_errors': [CHUNK_ROLLED_BACK_ERROR]}
+                outcomes[row_number] = self._error(row_number, data['username'], errors)
+            granted, employees, accepted = 0, [], []
+
+        self.created += len(employees)
+        for row_number, data in accepted[granted:]:
+            outcomes[row_number] = self._error(row_number, data['username'], {'non_field_errors': [NO_CAPACITY_ERROR]})
+
+        for row_number in sorted(outcomes):
+            if len(self.failures) >= self.max_failures:
+                break
+            self.failures.append(outcomes[row_number])
@@ -0,0 +1,97 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+from django.utils import timezone
+from rest_framework.response import Response
+
+from .models import Company, IdempotencyRecord
+
+IDEMPOTENCY_KEY_HEADER = 'Idempotency-Key'
+IDEMPOTENCY_REPLAYED_HEADER = 'Idempotent-Replayed'
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+
+class IdempotencyKeyReused(Exception):
+    """
+    The Idempotency-Key was already used for a request with a different body.
+    """
+
+
+def get_idempotency_key(request):
+    """
+    Return the Idempotency-Key header of the request, or None when it was not sent.
+    Raises ValueError for an empty or oversized key.
+    """
+    key = request.headers.get(IDEMPOTENCY_KEY_HEADER)
+    if key is None:
+        return None
+    key = key.strip()
+    if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise ValueError(f"{IDEMPOTENCY_KEY_HEADER} must be between 1 and {IDEMPOTENCY_KEY_MAX_LENGTH} characters")
+    return key
+
+
+def request_fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(body.encode()).hexdigest()
+
+
+def lock_company(company_id):
+    """
+    Serialize writers of the company until the surrounding transaction ends. The no-op UPDATE
+    takes the row lock on every backend, including SQLite, which ignores SELECT ... FOR UPDATE.
+    """
+    return Company.objects.filter(pk=company_id).update(tenant_version=F('tenant_version')) > 0
+
+
+def replay_response(company_id, scope, key, fingerprint):
+    """
+    Return the stored response for an unexpired key, or None if the request was not seen.
+    Call with the company locked, so a concurrent request with the same key waits for this one.
+    """
+    record = (
+        IdempotencyRecord.objects.filter(company_id=company_id, scope=scope, key=key, expires_at__gt=timezone.now())
+        .only('request_hash', 'status_code', 'response_body')
+        .first()
+    )
+    if record is None:
+        return None
+    if record.request_hash != fingerprint:
+        raise IdempotencyKeyReused(key)
+    return Response(record.response_body, status=record.status_code, headers={IDEMPOTENCY_REPLAYED_HEADER: 'true'})
+
+
+def remember_response(company_id, scope, key, fingerprint, response):
+    """
+    Store a successful response under the key until IDEMPOTENCY_KEY_TTL seconds from now.
+    Failed requests are not stored: they made no writes, so retrying them is safe.
+    """
+    if not response.status_code < 300:
+        return
+    expires_at = timezone.now() + timedelta(seconds=getattr(settings, 'IDEMPOTENCY_KEY_TTL', 86400))
+    # An expired record with the same key may still be in the table.
+    IdempotencyRecord.objects.update_or_create(
+        company_id=company_id, scope=scope, key=key,
+        defaults={
+            'request_hash': fingerprint,
+            'status_code': response.status_code,
+            'response_body': response.data,
+            'expires_at': expires_at,
+        },
+    )
+
+
+def purge_expired_idempotency_records(batch_size=1000):
+    """
+    Delete expired records in batches and return how many were removed.
+    """
+    purged = 0
+    while True:
+        batch = list(IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            return purged
+        purged += IdempotencyRecord.objects.filter(pk__in=batch).delete()[0]
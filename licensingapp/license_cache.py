@@ -0,0 +1,175 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router, transaction
+
+from project.commons.common_constants import LicenseStatus
+from .models import CompanyLicense
+from .serializers import CompanyLicenseDetailSerializer
+
+_NO_ACTIVE_LICENSE = 'none'
+_GENERATION_KEY = 'license_state:generation'
+
+_stats_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0}
+
+
+class LicenseState:
+    """
+    Snapshot of the latest active CompanyLicense of a company, as served by the read endpoints.
+    """
+    __slots__ = ('license_id', 'total_users', 'end_date', 'data')
+
+    def __init__(self, license_id, total_users, end_date, data):
+        self.license_id = license_id
+        self.total_users = total_users
+        self.end_date = end_date
+        self.data = data
+
+    def is_current(self, today):
+        return self.end_date >= today
+
+
+def _cache_settings():
+    return getattr(settings, 'LICENSE_STATE_CACHE', {})
+
+
+def _cache():
+    # None unless LICENSE_STATE_CACHE names an alias; it must be shared by every worker, since
+    # an invalidation only clears the entry in the cache of the worker that made the write.
+    alias = _cache_settings().get('ALIAS')
+    return caches[alias] if alias else None
+
+
+def _generation(cache):
+    # License type edits change the nested payload of every cached state, so they
+    # start a new generation instead of tracking which companies use the type.
+    generation = cache.get(_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not cache.add(_GENERATION_KEY, generation, None):
+            generation = cache.get(_GENERATION_KEY, generation)
+    return generation
+
+
+def _state_key(generation, company_id):
+    return f'license_state:{generation}:{company_id}'
+
+
+def _cache_key(cache, company_id):
+    return _state_key(_generation(cache), company_id)
+
+
+def _record(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def _load_license_state(company_id):
+    # Cached for every reader, so never filled from a possibly lagging replica.
+    latest_license = (
+        CompanyLicense.objects.using(router.db_for_write(CompanyLicense)).select_related('company', 'license_type')
+        .filter(company_id=company_id, status=LicenseStatus.ACTIVE.value)
+        .order_by('-end_date')
+        .first()
+    )
+    if latest_license is None:
+        return None
+    data = CompanyLicenseDetailSerializer(latest_license).data
+    return LicenseState(latest_license.id, latest_license.total_users, latest_license.end_date, data)
+
+
+def get_license_state(company_id):
+    """
+    Return the LicenseState of the company's latest active license, or None if it has none.
+    Served from the LICENSE_STATE_CACHE alias when one is configured.
+    """
+    cache = _cache()
+    if cache is None:
+        return _load_license_state(company_id)
+
+    key = _cache_key(cache, company_id)
+    state = cache.get(key)
+    if state is not None:
+        _record('hits')
+        return None if state == _NO_ACTIVE_LICENSE else state
+
+    _record('misses')
+    state = _load_license_state(company_id)
+    # Only committed state may be cached, otherwise a rolled back write could leak to other requests.
+    if not transaction.get_connection().in_atomic_block:
+        cache.set(key, _NO_ACTIVE_LICENSE if state is None else state, _cache_settings().get('TIMEOUT', 30))
+    return state
+
+
+async def _aload_license_state(company_id):
+    latest_license = await (
+        CompanyLicense.objects.using(router.db_for_write(CompanyLicense)).select_related('company', 'license_type')
+        .filter(company_id=company_id, status=LicenseStatus.ACTIVE.value)
+        .order_by('-end_date')
+        .afirst()
+    )
+    if latest_license is None:
+        return None
+    data = CompanyLicenseDetailSerializer(latest_license).data
+    return LicenseState(latest_license.id, latest_license.total_users, latest_license.end_date, data)
+
+
+async def _ageneration(cache):
+    generation = await cache.aget(_GENERATION_KEY)
+    if generation is None:
+        generation = uuid.uuid4().hex
+        if not await cache.aadd(_GENERATION_KEY, generation, None):
+            generation = await cache.aget(_GENERATION_KEY, generation)
+    return generation
+
+
+async def aget_license_state(company_id):
+    """
+    Async version of get_license_state, sharing the same cache entries.
+    """
+    cache = _cache()
+    if cache is None:
+        return await _aload_license_state(company_id)
+
+    key = _state_key(await _ageneration(cache), company_id)
+    state = await cache.aget(key)
+    if state is not None:
+        _record('hits')
+        return None if state == _NO_ACTIVE_LICENSE else state
+
+    _record('misses')
+    state = await _aload_license_state(company_id)
+    if not transaction.get_connection().in_atomic_block:
+        await cache.aset(key, _NO_ACTIVE_LICENSE if state is None else state, _cache_settings().get('TIMEOUT', 30))
+    return state
+
+
+def invalidate_license_state(company_id):
+    cache = _cache()
+    if cache is None:
+        return
+    key = _cache_key(cache, company_id)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def invalidate_all_license_states():
+    cache = _cache()
+    if cache is None:
+        return
+    cache.delete(_GENERATION_KEY)
+    transaction.on_commit(lambda: cache.delete(_GENERATION_KEY))
+
+
+def license_state_cache_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_license_state_cache_stats():
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
@@ -0,0 +1,260 @@
+import os
+import threading
+import uuid
+from types import MappingProxyType
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DatabaseError, connection, router, transaction
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+from .models import LicenseCatalogVersion, LicenseType
+
+_CATALOG_VERSION_KEY = 'license_catalog:version'
+_CATALOG_VERSION_PK = 1
+_LICENSE_TYPE_FIELDS = ('id', 'duration', 'duration_type', 'price_per_user', 'name')
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+class CatalogVersion:
+    """
+    Validators of the license catalog: an opaque stamp replaced on every LicenseType write,
+    and the time of that write.
+    """
+    __slots__ = ('stamp', 'updated_at')
+
+    def __init__(self, stamp, updated_at):
+        self.stamp = stamp
+        self.updated_at = updated_at
+
+    def etag(self, request, resource):
+        # Browsable API and JSON bodies differ, so each representation gets its own strong ETag.
+        renderer = getattr(request, 'accepted_renderer', None)
+        return '"%s-%s-%s"' % (self.stamp, resource, renderer.format if renderer else 'json')
+
+    @property
+    def last_modified(self):
+        return int(self.updated_at.timestamp())
+
+
+def _version_cache_settings():
+    return getattr(settings, 'LICENSE_CATALOG_VERSION_CACHE', {})
+
+
+def _version_cache():
+    # None unless LICENSE_CATALOG_VERSION_CACHE names an alias; it must be shared by every worker,
+    # since a catalog write only clears the entry in the cache of the worker that made it.
+    alias = _version_cache_settings().get('ALIAS')
+    return caches[alias] if alias else None
+
+
+def _new_version_fields():
+    return {'stamp': uuid.uuid4().hex, 'updated_at': timezone.now()}
+
+
+def get_catalog_version():
+    """
+    Return the current CatalogVersion: a single-row primary key lookup, served from the
+    LICENSE_CATALOG_VERSION_CACHE alias when one is configured.
+    """
+    cache = _version_cache()
+    if cache is not None:
+        version = cache.get(_CATALOG_VERSION_KEY)
+        if version is not None:
+            return version
+
+    row, _ = LicenseCatalogVersion.objects.get_or_create(pk=_CATALOG_VERSION_PK, defaults=_new_version_fields())
+    version = CatalogVersion(row.stamp, row.updated_at)
+    # Only committed state may be cached, otherwise a rolled back write could leak to other requests.
+    if cache is not None and not transaction.get_connection().in_atomic_block:
+        cache.set(_CATALOG_VERSION_KEY, version, _version_cache_settings().get('TIMEOUT', 300))
+    return version
+
+
+async def aget_catalog_version():
+    cache = _version_cache()
+    if cache is not None:
+        version = await cache.aget(_CATALOG_VERSION_KEY)
+        if version is not None:
+            return version
+
+    row, _ = await LicenseCatalogVersion.objects.aget_or_create(pk=_CATALOG_VERSION_PK, defaults=_new_version_fields())
+    version = CatalogVersion(row.stamp, row.updated_at)
+    if cache is not None and not transaction.get_connection().in_atomic_block:
+        await cache.aset(_CATALOG_VERSION_KEY, version, _version_cache_settings().get('TIMEOUT', 300))
+    return version
+
+
+def bump_catalog_version():
+    """
+    Stamp the catalog with a new version, invalidating every ETag handed out so far.
+    """
+    LicenseCatalogVersion.objects.update_or_create(pk=_CATALOG_VERSION_PK, defaults=_new_version_fields())
+    cache = _version_cache()
+    if cache is not None:
+        cache.delete(_CATALOG_VERSION_KEY)
+        transaction.on_commit(lambda: cache.delete(_CATALOG_VERSION_KEY))
+
+
+def _apply_validators(response, etag, version, public):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(version.last_modified)
+    max_age = getattr(settings, 'LICENSE_CATALOG_MAX_AGE', 0)
+    if public:
+        patch_cache_control(response, public=True, max_age=max_age, must_revalidate=True)
+    else:
+        patch_cache_control(response, private=True, max_age=max_age, must_revalidate=True)
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+def catalog_not_modified(request, etag, version, public):
+    """
+    Return a 304 response when the client's cached copy matches ``etag``, otherwise None.
+    """
+    response = get_conditional_response(request, etag=etag, last_modified=version.last_modified)
+    if response is None:
+        return None
+    return _apply_validators(response, etag, version, public)
+
+
+def with_catalog_validators(response, etag, version, public):
+    """
+    Add the ETag, Last-Modified and Cache-Control headers of the catalog to a 200 response.
+    """
+    if response.status_code != 200:
+        return response
+    return _apply_validators(response, etag, version, public)
+
+
+class LicenseTypeRecord:
+    """
+    Read-only copy of a LicenseType row held by the catalog snapshot.
+    """
+    __slots__ = _LICENSE_TYPE_FIELDS
+
+    def __init__(self, id, duration, duration_type, price_per_user, name):
+        for field, value in zip(_LICENSE_TYPE_FIELDS, (id, duration, duration_type, price_per_user, name)):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @property
+    def pk(self):
+        return self.id
+
+    def to_model(self):
+        """
+        Return a LicenseType instance for the record, e.g. to assign to a foreign key without
+        loading the row again.
+        """
+        return LicenseType.from_db(None, _LICENSE_TYPE_FIELDS, [getattr(self, field) for field in _LICENSE_TYPE_FIELDS])
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of every LicenseType at one catalog version, ordered by id and indexed by
+    id and by name.
+    """
+    __slots__ = ('stamp', 'records', 'by_id', 'by_name')
+
+    def __init__(self, stamp, records):
+        self.stamp = stamp
+        self.records = tuple(records)
+        self.by_id = MappingProxyType({record.id: record for record in self.records})
+        self.by_name = MappingProxyType({record.name: record for record in self.records})
+
+    def get(self, pk):
+        try:
+            return self.by_id.get(int(pk))
+        except (TypeError, ValueError):
+            return None
+
+    def get_by_name(self, name):
+        return self.by_name.get(name)
+
+
+def _license_type_rows():
+    # The snapshot is shared by every request, so it is always loaded from the primary.
+    return LicenseType.objects.using(router.db_for_write(LicenseType)).order_by('pk').values_list(*_LICENSE_TYPE_FIELDS)
+
+
+def _publish(snapshot):
+    global _snapshot
+    # Snapshots read inside a transaction may contain uncommitted rows; keep them private.
+    if not transaction.get_connection().in_atomic_block:
+        with _snapshot_lock:
+            _snapshot = snapshot
+
+
+def get_catalog_snapshot(version=None):
+    """
+    Return the CatalogSnapshot of the current catalog version, reloading it when a LicenseType
+    write stamped a new version. Only the version check runs on the common path; pass the
+    CatalogVersion the caller already read to skip it.
+    For reads only: with a LICENSE_CATALOG_VERSION_CACHE alias, other workers may see a write up
+    to its TIMEOUT late, so writes that price a license read the LicenseType row instead.
+    """
+    # Read the version before the rows, so a concurrent write can only make the snapshot newer than its stamp.
+    if version is None:
+        version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.stamp == version.stamp:
+        return snapshot
+
+    snapshot = CatalogSnapshot(version.stamp, [LicenseTypeRecord(*row) for row in _license_type_rows()])
+    _publish(snapshot)
+    return snapshot
+
+
+async def aget_catalog_snapshot(version=None):
+    if version is None:
+        version = await aget_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.stamp == version.stamp:
+        return snapshot
+
+    snapshot = CatalogSnapshot(version.stamp, [LicenseTypeRecord(*row) async for row in _license_type_rows()])
+    _publish(snapshot)
+    return snapshot
+
+
+def reset_catalog_snapshot():
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
+
+
+def warm_catalog_snapshot():
+    """
+    Load the catalog snapshot when a server worker starts (called from project/wsgi.py and
+    project/asgi.py once the apps are loaded), so the first requests of a worker do not pay
+    for it. Management commands never call it. Does nothing when the database is not set up
+    yet (fresh checkout, before migrate).
+    """
+    if not getattr(settings, 'LICENSE_CATALOG_PRELOAD', True):
+        return None
+    database_name = connection.settings_dict['NAME']
+    if connection.vendor == 'sqlite' and not connection.is_in_memory_db() and not os.path.exists(database_name):
+        return None
+
+    try:
+        stamp = LicenseCatalogVersion.objects.filter(pk=_CATALOG_VERSION_PK).values_list('stamp', flat=True).first()
+        if stamp is None:
+            return None
+        snapshot = CatalogSnapshot(stamp, [LicenseTypeRecord(*row) for row in _license_type_rows()])
+    except DatabaseError:
+        return None
+    finally:
+        # Do not hand a connection opened during startup to forked workers.
+        connection.close()
+    _publish(snapshot)
+    return snapshot
@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.utils import timezone
+
+from project.commons.common_constants import LicenseStatus
+from .models import CompanyLicense
+from .license_cache import invalidate_license_state
+
+
+def expire_licenses(today=None, batch_size=500):
+    """
+    Move active licenses whose end_date is before ``today`` to EXPIRED, ``batch_size`` rows
+    per transaction, and drop the cached license state of the affected companies. Safe to
+    run repeatedly or concurrently: only rows still active and past due are updated.
+    Returns the number of licenses expired.
+    """
+    if today is None:
+        today = timezone.now().date()
+
+    expired = 0
+    while True:
+        due = (
+            CompanyLicense.objects.filter(status=LicenseStatus.ACTIVE.value, end_date__lt=today)
+            .order_by('end_date')
+            .values_list('pk', 'company_id')[:batch_size]
+        )
+        batch = list(due)
+        if not batch:
+            return expired
+
+        with transaction.atomic():
+            expired += CompanyLicense.objects.filter(
+                pk__in=[pk for pk, _ in batch], status=LicenseStatus.ACTIVE.value, end_date__lt=today,
+            ).update(status=LicenseStatus.EXPIRED.value)
+            for company_id in {company_id for _, company_id in batch}:
+                invalidate_license_state(company_id)
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from licensingapp.license_expiry import expire_licenses
+
+
+class Command(BaseCommand):
+    help = "Mark active licenses whose end date has passed as expired. Use --loop to keep sweeping on an interval."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Licenses updated per transaction.")
+        parser.add_argument('--loop', action='store_true', help="Keep running and sweep every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=300, help="Seconds between sweeps with --loop.")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.sweep(options['batch_size'])
+            return
+
+        try:
+            while True:
+                self.sweep(options['batch_size'])
+                # Do not keep a connection open (or reuse a broken one) while sleeping.
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def sweep(self, batch_size):
+        expired = expire_licenses(batch_size=batch_size)
+        self.stdout.write(f"Expired {expired} licenses.")
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from licensingapp.dataset_generator import generate_dataset
+
+
+class Command(BaseCommand):
+    help = "Bulk insert a deterministic synthetic dataset: companies with a skewed employee distribution and license histories."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=1000, help="Companies to create.")
+        parser.add_argument('--employees', type=int, default=100_000, help="Employees (and users) to create across all companies.")
+        parser.add_argument('--skew', type=float, default=1.0, help="Zipf exponent of the employee distribution; 0 spreads employees evenly.")
+        parser.add_argument('--history', type=int, default=6, help="Licenses per company, ending with the current one.")
+        parser.add_argument('--seed', type=int, default=0, help="Random seed; the same seed generates the same dataset.")
+        parser.add_argument('--batch-size', type=int, default=5000, help="Rows inserted per transaction.")
+        parser.add_argument('--password', default='password', help="Password of every generated user.")
+        parser.add_argument('--prefix', default='dataset', help="Prefix of the generated usernames and company names.")
+
+    def handle(self, *args, **options):
+        if options['companies'] < 1 or options['history'] < 1 or options['batch_size'] < 1:
+            raise CommandError("--companies, --history and --batch-size must be positive.")
+        if options['employees'] < options['companies']:
+            raise CommandError("--employees must be at least --companies; every company gets an admin.")
+
+        started = time.perf_counter()
+
+        def progress(employees_created):
+            self.stdout.write(f"{employees_created}/{options['employees']} employees ({time.perf_counter() - started:.0f}s)")
+
+        companies, employees, licenses = generate_dataset(
+            options['companies'], options['employees'], skew=options['skew'], history=options['history'], seed=options['seed'],
+            batch_size=options['batch_size'], password=options['password'], prefix=options['prefix'],
+            progress=progress if options['verbosity'] > 1 else None,
+        )
+        self.stdout.write(f"Created {companies} companies, {employees} employees and {licenses} licenses in {time.perf_counter() - started:.1f}s.")
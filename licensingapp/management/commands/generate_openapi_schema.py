@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from project.commons.openapi_schema import schema_artifact_path, write_schema_artifact
+
+
+class Command(BaseCommand):
+    help = "Compile the OpenAPI document served at /swagger.json into OPENAPI_SCHEMA_PATH."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help="Write the schema to this path instead of OPENAPI_SCHEMA_PATH.")
+
+    def handle(self, *args, **options):
+        path = options['output'] or schema_artifact_path()
+        if path is None:
+            raise CommandError("Set OPENAPI_SCHEMA_PATH or pass --output.")
+        path = write_schema_artifact(path)
+        self.stdout.write(f"Wrote OpenAPI schema to {path}")
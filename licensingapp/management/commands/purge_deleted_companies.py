@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from licensingapp.company_purge import purge_deleted_companies
+
+
+class Command(BaseCommand):
+    help = "Remove the licenses, employees and users of deleted companies in chunks. Use --loop to keep purging on an interval."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help="Rows deleted per transaction.")
+        parser.add_argument('--loop', action='store_true', help="Keep running and purge every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=60, help="Seconds between purges with --loop.")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.purge(options['batch_size'])
+            return
+
+        try:
+            while True:
+                self.purge(options['batch_size'])
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def purge(self, batch_size):
+        purged = purge_deleted_companies(batch_size=batch_size)
+        self.stdout.write(f"Purged {purged} companies.")
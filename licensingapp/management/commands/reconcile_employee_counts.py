@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from licensingapp.seat_usage import reconcile_employee_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Company.employee_count from the Employee table and repair drifted counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', type=int, action='append', dest='company_ids', help="Only reconcile this company id (repeatable).")
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        drifted = reconcile_employee_counts(options['company_ids'], options['batch_size'])
+        if drifted:
+            self.stdout.write(f"Repaired employee_count for {len(drifted)} companies: {', '.join(map(str, drifted))}")
+        else:
+            self.stdout.write("All employee counters are consistent.")
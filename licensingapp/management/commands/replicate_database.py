@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, close_old_connections
+
+from project.commons.db_routing import replicate_sqlite
+
+
+class Command(BaseCommand):
+    help = "Copy the primary SQLite database onto the read replica, a local stand-in for replication. Use --loop to refresh it on an interval."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--source', default=DEFAULT_DB_ALIAS, help="Alias copied from.")
+        parser.add_argument('--target', help="Alias copied to; defaults to DATABASE_REPLICA_ALIAS.")
+        parser.add_argument('--loop', action='store_true', help="Keep running and copy every --interval seconds.")
+        parser.add_argument('--interval', type=float, default=1, help="Seconds between copies with --loop, i.e. the replication lag.")
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.replicate(options['source'], options['target'])
+            return
+
+        try:
+            while True:
+                self.replicate(options['source'], options['target'])
+                close_old_connections()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Stopped.")
+
+    def replicate(self, source, target):
+        replicate_sqlite(source, target)
+        self.stdout.write(f"Replicated {source} to {target or 'the replica'}.")
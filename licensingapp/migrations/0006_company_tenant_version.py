@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0005_companylicense_license_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='tenant_version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:48
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicates(apps, schema_editor):
+    # The unique constraints below fail on rows that already break them; keep the oldest row.
+    Employee = apps.get_model('licensingapp', 'Employee')
+    LicenseType = apps.get_model('licensingapp', 'LicenseType')
+    CompanyLicense = apps.get_model('licensingapp', 'CompanyLicense')
+
+    for row in Employee.objects.order_by().values('user').annotate(rows=Count('id'), keep=Min('id')).filter(rows__gt=1):
+        Employee.objects.filter(user_id=row['user']).exclude(id=row['keep']).delete()
+
+    for row in LicenseType.objects.order_by().values('name').annotate(rows=Count('id'), keep=Min('id')).filter(rows__gt=1):
+        duplicates = LicenseType.objects.filter(name=row['name']).exclude(id=row['keep'])
+        # Licenses on a duplicate move to the kept type rather than cascading away with it.
+        CompanyLicense.objects.filter(license_type__in=duplicates).update(license_type_id=row['keep'])
+        duplicates.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0006_company_tenant_version'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicates, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='companylicense',
+            index=models.Index(fields=['company', 'status', '-end_date'], name='companylicense_status_end_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companylicense',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['company', '-end_date'], name='companylicense_active_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='employee',
+            constraint=models.UniqueConstraint(fields=('user',), name='employee_user_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='licensetype',
+            constraint=models.UniqueConstraint(fields=('name',), name='licensetype_name_unique'),
+        ),
+    ]
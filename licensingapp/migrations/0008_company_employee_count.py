@@ -0,0 +1,34 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def populate_employee_count(apps, schema_editor):
+    Company = apps.get_model('licensingapp', 'Company')
+    Employee = apps.get_model('licensingapp', 'Employee')
+    counts = (
+        Employee.objects.filter(company=OuterRef('pk'))
+        .order_by()
+        .values('company')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    Company.objects.update(employee_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0007_licensing_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='company',
+            name='employee_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(populate_employee_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:20
+
+import uuid
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_catalog_version(apps, schema_editor):
+    LicenseCatalogVersion = apps.get_model('licensingapp', 'LicenseCatalogVersion')
+    LicenseCatalogVersion.objects.get_or_create(pk=1, defaults={'stamp': uuid.uuid4().hex, 'updated_at': timezone.now()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0008_company_employee_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LicenseCatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stamp', models.CharField(max_length=32)),
+                ('updated_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(create_catalog_version, migrations.RunPython.noop),
+    ]
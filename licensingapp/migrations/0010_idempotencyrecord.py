@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 14:35
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0009_licensecatalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdempotencyRecord',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=255)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status_code', models.PositiveSmallIntegerField()),
+                ('response_body', models.JSONField(encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('expires_at', models.DateTimeField()),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='licensingapp.company')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['expires_at'], name='idempotencyrecord_expiry_idx')],
+                'constraints': [models.UniqueConstraint(fields=('company', 'scope', 'key'), name='idempotencyrecord_key_unique')],
+            },
+        ),
+    ]
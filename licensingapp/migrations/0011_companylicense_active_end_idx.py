@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0010_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='companylicense',
+            index=models.Index(condition=models.Q(('status', 'active')), fields=['end_date'], name='companylicense_active_end_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 15:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('licensingapp', '0011_companylicense_active_end_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CompanyPurge',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('company_id', models.PositiveIntegerField(db_index=True)),
+                ('phase', models.CharField(choices=[('licenses', 'LICENSES'), ('employees', 'EMPLOYEES'), ('company', 'COMPANY'), ('done', 'DONE')], default='licenses', max_length=10)),
+                ('licenses_deleted', models.PositiveIntegerField(default=0)),
+                ('employees_deleted', models.PositiveIntegerField(default=0)),
+                ('users_deleted', models.PositiveIntegerField(default=0)),
+                ('requested_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='company',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -1,6 +1,7 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.contrib.auth.models import User
-from project.commons.common_constants import DurationType, Role, LicenseStatus
+from project.commons.common_constants import DurationType, Role, LicenseStatus, PurgePhase
 
 
 class LicenseType(models.Model):
@@ -13,6 +14,11 @@ class LicenseType(models.Model):
     price_per_user = models.DecimalField(max_digits=10, decimal_places=2)
     name = models.CharField(max_length=255)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['name'], name='licensetype_name_unique'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -20,6 +26,10 @@ class LicenseType(models.Model):
 class Company(models.Model):
     name = models.CharField(max_length=255)
     address = models.TextField()
+    tenant_version = models.PositiveIntegerField(default=1)
+    employee_count = models.PositiveIntegerField(default=0)
+    # Set when the company is deleted; its data is removed later by the purger.
+    deleted_at = models.DateTimeField(null=True, blank=True)
 
     def __str__(self):
         return self.name
@@ -34,6 +44,11 @@ class Employee(models.Model):
         default=Role.USER.value
     )
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user'], name='employee_user_unique'),
+        ]
+
     def __str__(self):
         return f'{self.user.username} - {self.company.name} - {self.role}'
 
@@ -51,5 +66,77 @@ class CompanyLicense(models.Model):
         default=LicenseStatus.PENDING.value
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['company', 'status', '-end_date'], name='companylicense_status_end_idx'),
+            models.Index(
+                fields=['company', '-end_date'],
+                name='companylicense_active_idx',
+                condition=models.Q(status=LicenseStatus.ACTIVE.value),
+            ),
+            # Expiry sweep; small because the sweeper keeps only current licenses active.
+            models.Index(
+                fields=['end_date'],
+                name='companylicense_active_end_idx',
+                condition=models.Q(status=LicenseStatus.ACTIVE.value),
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.company.name} - {self.status}'
+
+class LicenseCatalogVersion(models.Model):
+    """
+    Single row stamped with a new value whenever a LicenseType is written, used to validate
+    cached copies of the license catalog.
+    """
+    stamp = models.CharField(max_length=32)
+    updated_at = models.DateTimeField()
+
+    def __str__(self):
+        return self.stamp
+
+
+class IdempotencyRecord(models.Model):
+    """
+    Response stored for an Idempotency-Key, replayed when the same request is sent again.
+    """
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField()
+    response_body = models.JSONField(encoder=DjangoJSONEncoder)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'scope', 'key'], name='idempotencyrecord_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotencyrecord_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.scope} - {self.key}'
+
+
+class CompanyPurge(models.Model):
+    """
+    Progress of removing the data of a deleted company. Kept after the company row is gone.
+    """
+    company_id = models.PositiveIntegerField(db_index=True)
+    phase = models.CharField(
+        max_length=10,
+        choices=[(tag.value, tag.name) for tag in PurgePhase],
+        default=PurgePhase.LICENSES.value
+    )
+    licenses_deleted = models.PositiveIntegerField(default=0)
+    employees_deleted = models.PositiveIntegerField(default=0)
+    users_deleted = models.PositiveIntegerField(default=0)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
     def __str__(self):
-        return f'{self.company.name} - {self.status}'
\ No newline at end of file
+        return f'{self.company_id} - {self.phase}'
@@ -0,0 +1,74 @@
+from rest_framework.response import Response
+from rest_framework import status
+from django.utils import timezone
+from .serializers import LicenseTypeSerializer, CompanySerializer, EmployeeLicenseCapacitySerializer, EmployeeGetSerializer, ActiveLicenseCheckSerializer
+
+from .license_catalog import with_catalog_validators
+
+# Responses of the read endpoints, built from data the sync (services.py) and async
+# (async_services.py) services load in their own way, so both return the same payloads.
+
+
+def employee_not_found_response():
+    return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
+
+
+def license_type_not_found_response():
+    return Response({"status": "error", "message": "License type not found"},
+                    status=status.HTTP_404_NOT_FOUND)
+
+
+def license_type_response(license_type, etag, version):
+    serializer = LicenseTypeSerializer(license_type)
+    response = Response({"license": [serializer.data], "status": "success"}, status=status.HTTP_200_OK)
+    return with_catalog_validators(response, etag, version, public=False)
+
+
+def license_types_response(license_types, etag, version):
+    serializer = LicenseTypeSerializer(license_types, many=True)
+    response = Response({"license_types": serializer.data, "status": "success"}, status=status.HTTP_200_OK)
+    return with_catalog_validators(response, etag, version, public=True)
+
+
+def license_capacity_response(company, license_state):
+    if not license_state:
+        return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
+
+    current_employees_count = company.employee_count
+    allowed_users = license_state.total_users
+    users_left = max(0, allowed_users - current_employees_count)
+
+    data = {
+        'current_employees': current_employees_count,
+        'allowed_users': allowed_users,
+        'users_left': users_left
+    }
+    serializer = EmployeeLicenseCapacitySerializer(data)
+    return Response({"message": "License capacity details retrieved successfully", "status": "success", "data": serializer.data}, status=status.HTTP_200_OK)
+
+
+def company_license_info_response(company, license_state):
+    license_data = None
+    if license_state and license_state.is_current(timezone.now().date()):
+        license_data = license_state.data
+
+    response_data = {
+        "company": CompanySerializer(company).data,
+        "active_license": license_data
+    }
+    return Response({"message": "Company and license info retrieved successfully", "status": "success", "data": response_data}, status=status.HTTP_200_OK)
+
+
+def user_company_and_employee_response(company, employee):
+    response_data = {
+        "company": CompanySerializer(company).data if company is not None else None,
+        "employee": EmployeeGetSerializer(employee).data if employee is not None else None
+    }
+    return Response({"message": "User company and employee info retrieved successfully", "status": "success", "data": response_data}, status=status.HTTP_200_OK)
+
+
+def active_license_response(license_state):
+    active_license_exists = license_state is not None and license_state.is_current(timezone.now().date())
+
+    serializer = ActiveLicenseCheckSerializer({'active_license': active_license_exists})
+    return Response({"status": "success", "message": "License active status retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
@@ -0,0 +1,127 @@
+from django.conf import settings
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from project.commons.common_constants import LicenseStatus
+from .models import Company, CompanyLicense, Employee, LicenseType
+from .license_cache import invalidate_license_state
+
+
+class LicenseUpdateConflict(Exception):
+    """
+    The license kept being replaced under a conditional update until the retries ran out.
+    """
+
+
+class LicenseTypeMissing(Exception):
+    """
+    The license refers to a license type that no longer exists.
+    """
+
+
+def adjust_employee_count(company_id, delta):
+    """
+    Atomically add delta to the company's employee counter.
+    """
+    if delta:
+        Company.objects.filter(pk=company_id).update(employee_count=F('employee_count') + delta)
+
+
+def actual_employee_count():
+    """
+    Subquery counting the Employee rows of the outer Company.
+    """
+    counts = (
+        Employee.objects.filter(company=OuterRef('pk'))
+        .order_by()
+        .values('company')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def reconcile_employee_counts(company_ids=None, batch_size=1000):
+    """
+    Repair employee counters that drifted from the Employee table, e.g. after raw SQL edits.
+    Returns the ids of the companies whose counter was corrected.
+    """
+    companies = Company.objects.all()
+    if company_ids:
+        companies = companies.filter(pk__in=company_ids)
+
+    drifted = list(
+        companies.annotate(actual=actual_employee_count())
+        .exclude(employee_count=F('actual'))
+        .values_list('pk', flat=True)
+    )
+    for start in range(0, len(drifted), batch_size):
+        batch = drifted[start:start + batch_size]
+        Company.objects.filter(pk__in=batch).update(employee_count=actual_employee_count())
+    return drifted
+
+
+def reserve_seats(company_id, allowed_users, requested):
+    """
+    Atomically claim up to ``requested`` seats of a license allowing ``allowed_users`` employees
+    by raising the company's counter. Returns the number of seats granted.
+    """
+    while requested > 0:
+        reserved = (
+            Company.objects.filter(pk=company_id, employee_count__lte=allowed_users - requested)
+            .update(employee_count=F('employee_count') + requested)
+        )
+        if reserved:
+            return requested
+        current = Company.objects.filter(pk=company_id).values_list('employee_count', flat=True).first()
+        if current is None:
+            return 0
+        requested = min(requested - 1, allowed_users - current)
+    return 0
+
+
+def _license_type_row(license_type_id):
+    # The LicenseType row, not the catalog snapshot, which other workers may hold stale.
+    return LicenseType.objects.filter(pk=license_type_id).first()
+
+
+def add_license_seats(company_id, seats, max_retries=None):
+    """
+    Add ``seats`` users to the company's latest active license and reprice it with one
+    conditional UPDATE of F() expressions. Concurrent increases commute, so the UPDATE is only
+    guarded by what the price depends on: the license is still active, still of the license
+    type that was priced, and that type still has the price that was charged. When another
+    writer changed that in between, the update is retried against the new latest license up
+    to ``max_retries`` times (LICENSE_UPDATE_MAX_RETRIES). Returns the id of the updated
+    license and the LicenseType it was priced with, or None when the company has no active
+    license.
+    """
+    if max_retries is None:
+        max_retries = getattr(settings, 'LICENSE_UPDATE_MAX_RETRIES', 5)
+
+    for _ in range(max_retries + 1):
+        latest_license = (
+            CompanyLicense.objects.filter(company_id=company_id, status=LicenseStatus.ACTIVE.value)
+            .order_by('-end_date')
+            .values('id', 'license_type_id')
+            .first()
+        )
+        if latest_license is None:
+            return None
+        license_type = _license_type_row(latest_license['license_type_id'])
+        if license_type is None:
+            raise LicenseTypeMissing(latest_license['license_type_id'])
+
+        total_amount = ExpressionWrapper(
+            (F('total_users') + seats) * Value(license_type.price_per_user),
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+        updated = CompanyLicense.objects.filter(
+            pk=latest_license['id'], license_type_id=latest_license['license_type_id'], status=LicenseStatus.ACTIVE.value,
+            license_type__price_per_user=license_type.price_per_user,
+        ).update(total_users=F('total_users') + seats, total_amount=total_amount)
+        if updated:
+            # QuerySet.update() sends no post_save, so the cached license state is dropped here.
+            invalidate_license_state(company_id)
+            return latest_license['id'], license_type
+    raise LicenseUpdateConflict(company_id)
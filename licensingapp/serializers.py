@@ -1,5 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from project.commons.password_hashing import set_user_password
 from .models import LicenseType, Company, Employee, CompanyLicense
 
 
@@ -24,7 +26,7 @@ class UserSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         password = validated_data.pop('password')
         user = User(**validated_data)
-        user.set_password(password)
+        set_user_password(user, password)
         user.save()
         return user
 
@@ -45,6 +47,40 @@ class EmployeeGetSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'company', 'role']
 
 
+EMPLOYEE_LISTING_VALUES = (
+    'id', 'role',
+    'user_id', 'user__username', 'user__email', 'user__first_name', 'user__last_name',
+    'company_id', 'company__name', 'company__address',
+)
+
+
+def employee_listing_row(row):
+    """
+    Build the EmployeeGetSerializer representation of one row of
+    ``queryset.values(*EMPLOYEE_LISTING_VALUES)``, without loading Employee, User or Company instances.
+    """
+    return {
+        'id': row['id'],
+        'user': {
+            'id': row['user_id'],
+            'username': row['user__username'],
+            'email': row['user__email'],
+            'first_name': row['user__first_name'],
+            'last_name': row['user__last_name'],
+        },
+        'company': {
+            'id': row['company_id'],
+            'name': row['company__name'],
+            'address': row['company__address'],
+        },
+        'role': row['role'],
+    }
+
+
+def employee_listing_data(rows):
+    return [employee_listing_row(row) for row in rows]
+
+
 class CompanyRegistrationSerializer(serializers.Serializer):
     user = UserSerializer()
     company = CompanySerializer()
@@ -73,27 +109,66 @@ class CompanyLicenseSerializer(serializers.ModelSerializer):
 
 
 class CompanyLicenseDetailSerializer(serializers.ModelSerializer):
+    company = CompanySerializer(read_only=True)
+    license_type = LicenseTypeSerializer(read_only=True)
+
     class Meta:
         model = CompanyLicense
-        fields = '__all__'
-        depth = 1
+        fields = ['id', 'total_users', 'total_amount', 'start_date', 'end_date', 'status', 'company', 'license_type']
         
 class CompanyLicenseIncreaseUsersSerializer(serializers.Serializer):
     total_users_to_add = serializers.IntegerField(min_value=1)
 
 
+class EmployeeBatchDeleteSerializer(serializers.Serializer):
+    employee_ids = serializers.ListField(child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000)
+
+
 class EmployeeLicenseCapacitySerializer(serializers.Serializer):
     current_employees = serializers.IntegerField()
     allowed_users = serializers.IntegerField()
     users_left = serializers.IntegerField()
 
 
+class LicenseUtilizationSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    name = serializers.CharField()
+    license_id = serializers.IntegerField(allow_null=True)
+    license_type = serializers.CharField(allow_null=True)
+    license_status = serializers.CharField(allow_null=True)
+    license_start_date = serializers.DateField(allow_null=True)
+    license_end_date = serializers.DateField(allow_null=True)
+    total_users = serializers.IntegerField(allow_null=True)
+    seats_used = serializers.IntegerField(source='employee_count')
+    seats_left = serializers.IntegerField(allow_null=True)
+    utilization = serializers.FloatField(allow_null=True)
+    period_revenue = serializers.DecimalField(max_digits=12, decimal_places=2)
+
+
 class EmployeeRegistrationByAdminSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ['username', 'password', 'email', 'first_name', 'last_name']
         extra_kwargs = {'password': {'write_only': True}}
 
+    def create(self, validated_data):
+        password = validated_data.pop('password')
+        user = User(**validated_data)
+        set_user_password(user, password)
+        user.save()
+        return user
+
+
+class EmployeeImportRowSerializer(serializers.ModelSerializer):
+    """
+    Validates one row of a bulk employee import. Username uniqueness is checked per
+    chunk by the importer instead of one query per row.
+    """
+    class Meta:
+        model = User
+        fields = ['username', 'password', 'email', 'first_name', 'last_name']
+        extra_kwargs = {'password': {'write_only': True}, 'username': {'validators': [UnicodeUsernameValidator()]}}
+
 
 class ActiveLicenseCheckSerializer(serializers.Serializer):
     active_license = serializers.BooleanField()
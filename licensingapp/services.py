@@ -1,18 +1,34 @@
 from rest_framework.response import Response
 from rest_framework import status
-from django.contrib.auth.models import User
-from .models import LicenseType, Company, Employee, CompanyLicense
-from .serializers import LicenseTypeSerializer, CompanySerializer, UserSerializer, EmployeeSerializer, CompanyRegistrationSerializer, CompanyLicenseSerializer, CompanyLicenseDetailSerializer, CompanyLicenseIncreaseUsersSerializer, EmployeeLicenseCapacitySerializer, EmployeeRegistrationByAdminSerializer, EmployeeGetSerializer, ActiveLicenseCheckSerializer
-from django.db import transaction
+from .models import LicenseType, Company, Employee, CompanyLicense, CompanyPurge
+from .serializers import LicenseTypeSerializer, CompanySerializer, UserSerializer, EmployeeSerializer, CompanyRegistrationSerializer, CompanyLicenseSerializer, CompanyLicenseDetailSerializer, CompanyLicenseIncreaseUsersSerializer, EmployeeBatchDeleteSerializer, EmployeeRegistrationByAdminSerializer, LicenseUtilizationSerializer, EMPLOYEE_LISTING_VALUES, employee_listing_data, employee_listing_row
+from django.db import router, transaction
 from django.utils import timezone
 import datetime
 import logging
-from project.commons.common_constants import Role, LicenseStatus
-
-from project.commons.common_methods import paginatedResponse
+from project.commons.common_constants import Role
+
+from project.commons.common_methods import paginatedResponse, streamingPaginatedResponse, canStreamResponse, cursorPaginatedResponse, keysetPage, decodeCursor, InvalidCursor
+from project.commons.tenant_context import get_tenant_context, clear_tenant_context
+from project.commons.tenant_tokens import bump_tenant_version
+from .license_cache import get_license_state, invalidate_license_state
+from .license_catalog import get_catalog_version, get_catalog_snapshot, catalog_not_modified
+from .read_responses import employee_not_found_response, license_type_not_found_response, license_type_response, license_types_response, license_capacity_response, company_license_info_response, user_company_and_employee_response, active_license_response
+from .employee_import import EmployeeImporter, ImportFormatError, iter_upload_rows
+from .seat_usage import LicenseTypeMissing, LicenseUpdateConflict, add_license_seats, adjust_employee_count
+from .bulk_delete import delete_employees_with_users
+from .idempotency import IdempotencyKeyReused, get_idempotency_key, lock_company, remember_response, replay_response, request_fingerprint
+from .utilization_report import REPORT_DEFAULT_LIMIT, REPORT_MAX_LIMIT, parse_report_filters, utilization_report
 
 logger = logging.getLogger(__name__)
 
+EMPLOYEE_SORT_FIELDS = {
+    'id': 'id',
+    'username': 'user__username',
+    'first_name': 'user__first_name',
+    'last_name': 'user__last_name',
+}
+
 
 class LicensingService:
     def __init__(self):
@@ -24,19 +40,20 @@ class LicensingService:
             return Response({"status": "error", "errors": {"name": ["This field is required."]}},
                             status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            license_type = LicenseType.objects.get(name=name)
+        # Writes check the row; another worker's snapshot may not have the type yet.
+        license_type = LicenseType.objects.filter(name=name).first()
+        if license_type is not None:
             serializer = LicenseTypeSerializer(license_type)
             return Response({"license": [serializer.data], "status": "success", "message": "License already exists"},
                             status=status.HTTP_200_OK)
-        except LicenseType.DoesNotExist:
-            serializer = LicenseTypeSerializer(data=request.data)
-            if serializer.is_valid():
-                serializer.save()
-                return Response({"license": [serializer.data], "status": "success"},
-                                status=status.HTTP_201_CREATED)
-            return Response({"status": "error", "errors": serializer.errors},
-                            status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = LicenseTypeSerializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response({"license": [serializer.data], "status": "success"},
+                            status=status.HTTP_201_CREATED)
+        return Response({"status": "error", "errors": serializer.errors},
+                        status=status.HTTP_400_BAD_REQUEST)
 
     def update_license_type(self, request, pk):
         try:
@@ -53,19 +70,29 @@ class LicensingService:
         return Response({"status": "error", "errors": serializer.errors},
                         status=status.HTTP_400_BAD_REQUEST)
 
-    def get_license_type(self, pk):
-        try:
-            license_type = LicenseType.objects.get(pk=pk)
-            serializer = LicenseTypeSerializer(license_type)
-            return Response({"license": [serializer.data], "status": "success"}, status=status.HTTP_200_OK)
-        except LicenseType.DoesNotExist:
-            return Response({"status": "error", "message": "License type not found"},
-                            status=status.HTTP_404_NOT_FOUND)
+    def get_license_type(self, request, pk):
+        # Read the version before the rows, so a concurrent write can only make the ETag older than the body.
+        version = get_catalog_version()
+        license_type = get_catalog_snapshot(version).get(pk)
+        if license_type is None:
+            # Before the conditional headers, so `If-None-Match: *` never gets a 304 for a missing type.
+            return license_type_not_found_response()
+
+        etag = version.etag(request, pk)
+        not_modified = catalog_not_modified(request, etag, version, public=False)
+        if not_modified is not None:
+            return not_modified
+
+        return license_type_response(license_type, etag, version)
 
-    def get_all_license_types(self):
-        license_types = LicenseType.objects.all()
-        serializer = LicenseTypeSerializer(license_types, many=True)
-        return Response({"license_types": serializer.data, "status": "success"}, status=status.HTTP_200_OK)
+    def get_all_license_types(self, request):
+        version = get_catalog_version()
+        etag = version.etag(request, 'all')
+        not_modified = catalog_not_modified(request, etag, version, public=True)
+        if not_modified is not None:
+            return not_modified
+
+        return license_types_response(get_catalog_snapshot(version).records, etag, version)
 
     @transaction.atomic
     def register_company(self, request):
@@ -94,16 +121,37 @@ class LicensingService:
             return Response({"status": "error", "errors": serializer.errors}, status=400)
 
     def activate_license(self, request):
-        license_type_id = request.data.get('license_type')
-        user = request.user
-
         try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-        except Employee.DoesNotExist:
+            idempotency_key = get_idempotency_key(request)
+        except ValueError as exc:
+            return Response({"status": "error", "message": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
 
-        latest_license: CompanyLicense = CompanyLicense.objects.filter(company=company).order_by('-end_date').first()
+        fingerprint = request_fingerprint(request) if idempotency_key else None
+        with transaction.atomic():
+            # The new license starts where the latest one ends, so activations of a company must not interleave.
+            lock_company(tenant.company_id)
+            if idempotency_key:
+                try:
+                    replayed = replay_response(tenant.company_id, 'activate_license', idempotency_key, fingerprint)
+                except IdempotencyKeyReused:
+                    return Response({"status": "error", "message": "Idempotency-Key was already used with a different request"},
+                                    status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+                if replayed is not None:
+                    return replayed
+
+            response = self._activate_next_license(request, tenant)
+            if idempotency_key:
+                remember_response(tenant.company_id, 'activate_license', idempotency_key, fingerprint, response)
+            return response
+
+    def _activate_next_license(self, request, tenant):
+        license_type_id = request.data.get('license_type')
+
+        latest_license: CompanyLicense = CompanyLicense.objects.filter(company_id=tenant.company_id).order_by('-end_date').first()
 
         if not license_type_id and not latest_license:
             return Response({"status": "error", "message": "No previous license found for this company"}, status=status.HTTP_400_BAD_REQUEST)
@@ -115,13 +163,14 @@ class LicensingService:
             start_date = timezone.now().date()
             total_users = 1
 
-        if license_type_id:
-            try:
-                license_type = LicenseType.objects.get(pk=license_type_id)
-            except LicenseType.DoesNotExist:
-                return Response({"status": "error", "message": "License type not found"}, status=status.HTTP_404_NOT_FOUND)
-        else:
-            license_type = latest_license.license_type
+        # Priced from the row read under the company lock. The catalog snapshot is for reads
+        # only: other workers may still hold the one from before a price change.
+        try:
+            license_type = LicenseType.objects.filter(pk=license_type_id or latest_license.license_type_id).first()
+        except (TypeError, ValueError):
+            license_type = None
+        if license_type is None:
+            return Response({"status": "error", "message": "License type not found"}, status=status.HTTP_404_NOT_FOUND)
 
 
         duration = license_type.duration
@@ -139,7 +188,7 @@ class LicensingService:
         total_amount = license_type.price_per_user * int(total_users)
 
         new_license = CompanyLicense.objects.create(
-            company=company,
+            company=tenant.company,
             license_type=license_type,
             total_users=total_users,
             total_amount=total_amount,
@@ -151,68 +200,49 @@ class LicensingService:
         serializer = CompanyLicenseDetailSerializer(new_license)
         return Response({"message": "License activated successfully", "status": "success", "data": serializer.data}, status=status.HTTP_201_CREATED)
 
-    @transaction.atomic
     def increase_total_users(self, request):
-        user = request.user
-        try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-        except Employee.DoesNotExist:
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
 
-        latest_license: CompanyLicense = CompanyLicense.objects.filter(company=company, status='active').order_by('-end_date').first()
-
-        if not latest_license:
-            return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
-
         serializer = CompanyLicenseIncreaseUsersSerializer(data=request.data)
         if not serializer.is_valid():
             return Response({"status": "error", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
         total_users_to_add = serializer.validated_data['total_users_to_add']
 
-        latest_license.total_users += total_users_to_add
-        latest_license.total_amount = latest_license.license_type.price_per_user * latest_license.total_users
-        latest_license.save()
+        # A single conditional UPDATE; no transaction is held open around it.
+        try:
+            updated = add_license_seats(tenant.company_id, total_users_to_add)
+        except LicenseTypeMissing:
+            return Response({"status": "error", "message": "License type not found"}, status=status.HTTP_404_NOT_FOUND)
+        except LicenseUpdateConflict:
+            return Response({"status": "error", "message": "License is being updated concurrently, please retry"}, status=status.HTTP_409_CONFLICT)
+        if updated is None:
+            return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
+
+        license_id, license_type = updated
+        latest_license = CompanyLicense.objects.select_related('company').filter(pk=license_id).first()
+        if latest_license is None:
+            # Deleted right after the update, e.g. together with its license type.
+            return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
+        # The license type the seats were priced with, not a lookup that may have changed since.
+        latest_license.license_type = license_type
 
         response_serializer = CompanyLicenseDetailSerializer(latest_license)
         return Response({"message": "Total users increased successfully", "status": "success", "data": response_serializer.data}, status=status.HTTP_200_OK)
 
     def check_license_capacity(self, request):
-        user = request.user
-        try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-        except Employee.DoesNotExist:
-            return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
-
-        current_employees_count = Employee.objects.filter(company=company).count()
-
-        latest_license: CompanyLicense = CompanyLicense.objects.filter(company=company, status='active').order_by('-end_date').first()
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
 
-        allowed_users = 0
-        if latest_license:
-            allowed_users = latest_license.total_users
-        else:
-            return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
-
-        users_left = max(0, allowed_users - current_employees_count)
-
-        data = {
-            'current_employees': current_employees_count,
-            'allowed_users': allowed_users,
-            'users_left': users_left
-        }
-        serializer = EmployeeLicenseCapacitySerializer(data)
-        return Response({"message": "License capacity details retrieved successfully", "status": "success", "data": serializer.data}, status=status.HTTP_200_OK)
+        return license_capacity_response(tenant.company, get_license_state(tenant.company_id))
 
     @transaction.atomic
     def register_employee_by_admin(self, request):
-        user = request.user
-        try:
-            admin_employee = Employee.objects.get(user=user)
-            company = admin_employee.company
-        except Employee.DoesNotExist:
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
 
         capacity_response = self.check_license_capacity(request)
@@ -234,7 +264,7 @@ class LicensingService:
 
             employee = Employee.objects.create(
                 user=new_user,
-                company=company,
+                company_id=tenant.company_id,
                 role=Role.USER.value
             )
 
@@ -246,21 +276,17 @@ class LicensingService:
             return Response({"status": "error", "message": "Failed to register employee.", "detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
     def get_company_employees(self, request):
-        user = request.user
-        try:
-            admin_employee = Employee.objects.get(user=user)
-            company = admin_employee.company
-        except Employee.DoesNotExist:
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
 
-        offset = int(request.query_params.get('offset', 0))
         limit = int(request.query_params.get('limit', 10))
 
         first_name = request.query_params.get('first_name', None)
         last_name = request.query_params.get('last_name', None)
         username = request.query_params.get('username', None)
 
-        employees = Employee.objects.filter(company=company)
+        employees = Employee.objects.filter(company_id=tenant.company_id)
 
         if first_name:
             employees = employees.filter(user__first_name__icontains=first_name)
@@ -269,100 +295,160 @@ class LicensingService:
         if username:
             employees = employees.filter(user__username__icontains=username)
 
+        if 'cursor' in request.query_params:
+            return self._get_company_employees_page(request, tenant, employees, limit, filtered=bool(first_name or last_name or username))
+
+        offset = int(request.query_params.get('offset', 0))
         total_count = employees.count()
-        employees = employees[offset:offset + limit]
+        rows = employees.values(*EMPLOYEE_LISTING_VALUES)[offset:offset + limit]
+
+        if canStreamResponse(request, limit):
+            # The rows are read while the response is consumed, after the view returned; bind the
+            # alias now, or read_from_replica has already reset it and they come from the primary.
+            rows = rows.using(router.db_for_read(Employee))
+            rows = (employee_listing_row(row) for row in rows.iterator(chunk_size=500))
+            return streamingPaginatedResponse(request, offset, limit, total_count, rows, 'employees')
+        return paginatedResponse(offset, limit, total_count, employee_listing_data(rows), 'employees')
+
+    def _get_company_employees_page(self, request, tenant, employees, limit, filtered):
+        sort = request.query_params.get('sort', 'id')
+        if sort not in EMPLOYEE_SORT_FIELDS:
+            return Response({"status": "error", "message": f"Invalid sort field. Allowed values: {', '.join(EMPLOYEE_SORT_FIELDS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        sort_field = EMPLOYEE_SORT_FIELDS[sort]
+
+        cursor = request.query_params.get('cursor') or None
+        try:
+            if cursor is not None:
+                cursor = decodeCursor(cursor)
+            rows, next_cursor, previous_cursor = keysetPage(
+                employees.values(*EMPLOYEE_LISTING_VALUES), sort_field, cursor, limit,
+                lambda row: row[sort_field]
+            )
+        except InvalidCursor:
+            return Response({"status": "error", "message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
 
-        serializer = EmployeeGetSerializer(employees, many=True)
-        return paginatedResponse(offset, limit, total_count, serializer, 'employees')
+        # The unfiltered total is the maintained seat counter; filtered totals cost a COUNT and are opt-in.
+        total_count = None
+        if not filtered:
+            total_count = tenant.company.employee_count
+        elif request.query_params.get('include_total') == 'true':
+            total_count = employees.count()
+
+        return cursorPaginatedResponse(next_cursor, previous_cursor, total_count, employee_listing_data(rows), 'employees')
     
+    def import_employees(self, request):
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
+
+        allowed_users = CompanyLicense.objects.filter(company_id=tenant.company_id, status='active').order_by('-end_date').values_list('total_users', flat=True).first()
+        if allowed_users is None:
+            return Response({"status": "error", "message": "No active license found for this company"}, status=status.HTTP_404_NOT_FOUND)
+
+        importer = EmployeeImporter(tenant.company_id, allowed_users)
+        content_type = request.content_type.split(';')[0].strip().lower()
+        try:
+            importer.run(iter_upload_rows(request.stream, content_type))
+        except ImportFormatError as e:
+            return Response({"status": "error", "message": str(e), "data": importer.report()}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"message": "Employee import completed", "status": "success", "data": importer.report()}, status=status.HTTP_200_OK)
+
     @transaction.atomic
     def delete_employee(self, request, pk):
-        user = request.user
-        try:
-            admin_employee = Employee.objects.get(user=user)
-            company = admin_employee.company
-        except Employee.DoesNotExist:
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            employee_to_delete = Employee.objects.get(pk=pk, company=company)
+            employee_to_delete = Employee.objects.select_related('user').get(pk=pk, company_id=tenant.company_id)
         except Employee.DoesNotExist:
             return Response({"status": "error", "message": "Employee not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if employee_to_delete == admin_employee:
+        if employee_to_delete.id == tenant.employee_id:
             return Response({"status": "error", "message": "Not authorized to delete yourself"}, status=status.HTTP_403_FORBIDDEN)
 
-        user_to_delete = User.objects.get(pk=employee_to_delete.user.id)
+        user_to_delete = employee_to_delete.user
 
         employee_to_delete.delete()
         user_to_delete.delete()
+        bump_tenant_version(tenant.company_id)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @transaction.atomic
+    def delete_employees(self, request):
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
+
+        serializer = EmployeeBatchDeleteSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({"status": "error", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
+        employee_ids = list(dict.fromkeys(serializer.validated_data['employee_ids']))
+
+        # One query checks ownership of every id; the caller can never delete itself.
+        found = dict(
+            Employee.objects.filter(pk__in=employee_ids, company_id=tenant.company_id)
+            .exclude(pk=tenant.employee_id)
+            .values_list('pk', 'user_id')
+        )
+        employees_deleted, _ = delete_employees_with_users(list(found), list(found.values()))
+        if employees_deleted:
+            # The raw deletes send no post_delete signals, so the counter is adjusted once here.
+            adjust_employee_count(tenant.company_id, -employees_deleted)
+            bump_tenant_version(tenant.company_id)
+
+        results = []
+        for employee_id in employee_ids:
+            if employee_id in found:
+                results.append({'employee_id': employee_id, 'status': 'deleted'})
+            elif employee_id == tenant.employee_id:
+                results.append({'employee_id': employee_id, 'status': 'error', 'message': "Not authorized to delete yourself"})
+            else:
+                results.append({'employee_id': employee_id, 'status': 'error', 'message': "Employee not found"})
+
+        response_data = {'total': len(employee_ids), 'deleted': employees_deleted, 'failed': len(employee_ids) - employees_deleted, 'results': results}
+        return Response({"message": "Employee batch deletion completed", "status": "success", "data": response_data}, status=status.HTTP_200_OK)
+
     @transaction.atomic
     def delete_company(self, request, pk):
-        user = request.user
-        try:
-            admin_employee = Employee.objects.get(user=user)
-            company_to_delete = Company.objects.get(pk=pk)
-        except Employee.DoesNotExist:
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
             return Response({"status": "error", "message": "Admin employee not found for this user"}, status=status.HTTP_403_FORBIDDEN)
+
+        try:
+            company_to_delete = Company.objects.get(pk=pk, deleted_at__isnull=True)
         except Company.DoesNotExist:
             return Response({"status": "error", "message": "Company not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        if admin_employee.role != Role.ADMIN.value:
+        if not tenant.is_admin:
             return Response({"status": "error", "message": "Only an admin can delete a company"}, status=status.HTTP_403_FORBIDDEN)
 
-        if company_to_delete.id != admin_employee.company.id:
+        if company_to_delete.id != tenant.company_id:
             return Response({"status": "error", "message": "Not authorized to delete other companies"}, status=status.HTTP_403_FORBIDDEN)
 
-        try:
-            user_ids_to_delete = list(Employee.objects.filter(company=company_to_delete).values_list('user__id', flat=True))
-
-            CompanyLicense.objects.filter(company=company_to_delete).delete()
-
-            Employee.objects.filter(company=company_to_delete).delete()
-
-            User.objects.filter(id__in=user_ids_to_delete).delete()
+        # Hide the company from every endpoint now; its licenses, employees and users are
+        # removed in chunks by the purge_deleted_companies command.
+        Company.objects.filter(pk=company_to_delete.id).update(deleted_at=timezone.now())
+        bump_tenant_version(company_to_delete.id)
+        invalidate_license_state(company_to_delete.id)
+        purge = CompanyPurge.objects.create(company_id=company_to_delete.id)
 
-            company_to_delete.delete()
-
-            return Response({"message": "Company and all associated data deleted successfully", "status": "success"}, status=status.HTTP_204_NO_CONTENT)
-        except Exception as e:
-            logger.error(f"Error deleting company (ID: {pk}): {e}")
-            return Response({"status": "error", "message": "An error occurred during company deletion", "detail": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({"message": "Company deletion accepted", "status": "success", "data": {"purge_id": purge.id}}, status=status.HTTP_202_ACCEPTED)
 
     def get_company_license_info(self, request):
-        user = request.user
-        try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-        except Employee.DoesNotExist:
-            return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
-
-        company_serializer = CompanySerializer(company)
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
 
-        active_license = CompanyLicense.objects.filter(
-            company=company,
-            status='active',
-            end_date__gte=timezone.now().date()
-        ).order_by('-end_date').first()
-
-        license_data = None
-        if active_license:
-            license_data = CompanyLicenseDetailSerializer(active_license).data
-
-        response_data = {
-            "company": company_serializer.data,
-            "active_license": license_data
-        }
-
-        return Response({"message": "Company and license info retrieved successfully", "status": "success", "data": response_data}, status=status.HTTP_200_OK)
+        return company_license_info_response(tenant.company, get_license_state(tenant.company_id))
 
     @transaction.atomic
     def register_company_for_existing_user(self, request):
         user = request.user
 
-        if Employee.objects.filter(user=user).exists():
+        # A user of a deleted company has no tenant but keeps its employee row until the purge.
+        if get_tenant_context(request).exists or Employee.objects.filter(user=user).exists():
             return Response({"status": "error", "message": "User is already associated with a company."}, status=status.HTTP_400_BAD_REQUEST)
 
         serializer = CompanySerializer(data=request.data)
@@ -380,6 +466,7 @@ class LicensingService:
                     'company': CompanySerializer(company_instance).data,
                     'employee': EmployeeSerializer(employee_instance).data
                 }
+                clear_tenant_context(request)
 
                 return Response({"message": "Company registered successfully for existing user", "status": "success", "data": response_data}, status=status.HTTP_201_CREATED)
             except Exception as e:
@@ -389,38 +476,34 @@ class LicensingService:
             return Response({"status": "error", "errors": serializer.errors}, status=status.HTTP_400_BAD_REQUEST)
 
     def get_user_company_and_employee_info(self, request):
-        user = request.user
-        company_data = None
-        employee_data = None
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return user_company_and_employee_response(None, None)
+        return user_company_and_employee_response(tenant.company, tenant.employee)
 
-        try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-            company_data = CompanySerializer(company).data
-            employee_data = EmployeeGetSerializer(employee).data
-        except Employee.DoesNotExist:
-            pass
+    def check_active_license(self, request):
+        tenant = get_tenant_context(request)
+        if not tenant.exists:
+            return employee_not_found_response()
 
-        response_data = {
-            "company": company_data,
-            "employee": employee_data
-        }
-        return Response({"message": "User company and employee info retrieved successfully", "status": "success", "data": response_data}, status=status.HTTP_200_OK)
+        return active_license_response(get_license_state(tenant.company_id))
 
-    def check_active_license(self, request):
-        user = request.user
+    def get_license_utilization_report(self, request):
+        limit = str(request.query_params.get('limit', REPORT_DEFAULT_LIMIT))
+        if not limit.isdigit() or not 1 <= int(limit) <= REPORT_MAX_LIMIT:
+            return Response({"status": "error", "message": f"limit must be between 1 and {REPORT_MAX_LIMIT}"}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            employee = Employee.objects.get(user=user)
-            company = employee.company
-        except Employee.DoesNotExist:
-            return Response({"status": "error", "message": "Employee not found for this user"}, status=status.HTTP_404_NOT_FOUND)
-        
-        active_license_exists = CompanyLicense.objects.filter(
-            company=company,
-            status=LicenseStatus.ACTIVE.value,
-            end_date__gte=timezone.now().date()
-        ).exists()
-
-        response_data = {'active_license': active_license_exists}
-        serializer = ActiveLicenseCheckSerializer(response_data)
-        return Response({"status": "success", "message": "License active status retrieved successfully", "data": serializer.data}, status=status.HTTP_200_OK)
\ No newline at end of file
+            filters = parse_report_filters(request.query_params)
+        except ValueError as e:
+            return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        cursor = request.query_params.get('cursor') or None
+        try:
+            if cursor is not None:
+                cursor = decodeCursor(cursor)
+            # Keyset on the primary key keeps every page as cheap as the first.
+            rows, next_cursor, previous_cursor = keysetPage(utilization_report(filters), 'id', cursor, int(limit), lambda row: row['id'])
+        except InvalidCursor:
+            return Response({"status": "error", "message": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+        return cursorPaginatedResponse(next_cursor, previous_cursor, None, LicenseUtilizationSerializer(rows, many=True), 'companies')
\ No newline at end of file
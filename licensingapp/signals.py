@@ -0,0 +1,44 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import LicenseType, Company, Employee, CompanyLicense
+from .license_cache import invalidate_license_state, invalidate_all_license_states
+from .license_catalog import bump_catalog_version
+from .seat_usage import adjust_employee_count
+
+
+@receiver([post_save, post_delete], sender=CompanyLicense)
+def company_license_changed(sender, instance, **kwargs):
+    invalidate_license_state(instance.company_id)
+
+
+@receiver([post_save, post_delete], sender=Company)
+def company_changed(sender, instance, **kwargs):
+    invalidate_license_state(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=LicenseType)
+def license_type_changed(sender, instance, **kwargs):
+    invalidate_all_license_states()
+    bump_catalog_version()
+
+
+@receiver(pre_save, sender=Employee)
+def employee_company_changing(sender, instance, **kwargs):
+    instance._previous_company_id = None
+    if not instance._state.adding and instance.pk is not None:
+        instance._previous_company_id = Employee.objects.filter(pk=instance.pk).values_list('company_id', flat=True).first()
+
+
+@receiver(post_save, sender=Employee)
+def employee_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_employee_count(instance.company_id, 1)
+    elif instance._previous_company_id not in (None, instance.company_id):
+        adjust_employee_count(instance._previous_company_id, -1)
+        adjust_employee_count(instance.company_id, 1)
+
+
+@receiver(post_delete, sender=Employee)
+def employee_deleted(sender, instance, **kwargs):
+    adjust_employee_count(instance.company_id, -1)
@@ -0,0 +1,200 @@
+import os
+import tempfile
+import threading
+import unittest
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from io import StringIO
+from rest_framework.test import APIClient, APITestCase, APITransactionTestCase
+from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense, IdempotencyRecord
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import date, timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+class ActivateLicenseIdempotencyTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('activate-license')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Monthly Basic', duration=1, duration_type='months', price_per_user='10.00')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def activate(self, key=None, license_type=None):
+        headers = {'HTTP_IDEMPOTENCY_KEY': key} if key is not None else {}
+        return self.client.post(self.url, {'license_type': license_type or self.license_type.id}, format='json', **headers)
+
+    def test_replay_returns_stored_response(self):
+        print("activate_license_idempotency test_replay_returns_stored_response Test a retried activation returns the first response without a new license")
+        first = self.activate('retry-1')
+        second = self.activate('retry-1')
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['Idempotent-Replayed'], 'true')
+        self.assertEqual(CompanyLicense.objects.filter(company=self.admin_company).count(), 1)
+
+    def test_replay_makes_no_writes(self):
+        print("activate_license_idempotency test_replay_makes_no_writes Test a replayed activation only runs the lock and the key lookup")
+        self.activate('retry-2')
+        with CaptureQueriesContext(connection) as context:
+            self.activate('retry-2')
+        inserts = [query['sql'] for query in context.captured_queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(inserts, [])
+
+    def test_key_reused_with_different_body(self):
+        print("activate_license_idempotency test_key_reused_with_different_body Test reusing a key for a different request is rejected")
+        other_type = LicenseType.objects.create(name='Yearly Pro', duration=1, duration_type='years', price_per_user='100.00')
+        self.activate('retry-3')
+        response = self.activate('retry-3', license_type=other_type.id)
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(CompanyLicense.objects.count(), 1)
+
+    def test_distinct_keys_chain_licenses(self):
+        print("activate_license_idempotency test_distinct_keys_chain_licenses Test different keys activate consecutive licenses")
+        first = self.activate('renewal-1')
+        second = self.activate('renewal-2')
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        first_end = date.fromisoformat(first.data['data']['end_date'])
+        second_start = date.fromisoformat(second.data['data']['start_date'])
+        self.assertEqual(second_start, first_end + timedelta(days=1))
+
+    def test_failed_activation_not_stored(self):
+        print("activate_license_idempotency test_failed_activation_not_stored Test a failed activation can be retried with the same key")
+        response = self.activate('retry-4', license_type=self.license_type.id + 100)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+        response = self.activate('retry-4')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_expired_key_activates_again(self):
+        print("activate_license_idempotency test_expired_key_activates_again Test an expired key is processed as a new request")
+        self.activate('retry-5')
+        IdempotencyRecord.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        response = self.activate('retry-5')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(CompanyLicense.objects.count(), 2)
+        self.assertEqual(IdempotencyRecord.objects.count(), 1)
+
+    def test_keys_are_scoped_to_company(self):
+        print("activate_license_idempotency test_keys_are_scoped_to_company Test the same key from another company is not replayed")
+        self.activate('shared-key')
+        other_user = User.objects.create_user(username='other', password='otherpassword')
+        other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        Employee.objects.create(user=other_user, company=other_company, role=Role.ADMIN.value)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(other_user)))
+        response = self.activate('shared-key')
+        self.assertEqual(response.data['data']['company']['id'], other_company.id)
+        self.assertEqual(CompanyLicense.objects.filter(company=other_company).count(), 1)
+
+    def test_invalid_key(self):
+        print("activate_license_idempotency test_invalid_key Test an oversized Idempotency-Key is rejected")
+        response = self.activate('k' * 256)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CompanyLicense.objects.exists())
+
+    def test_purge_command(self):
+        print("activate_license_idempotency test_purge_command Test the purge command deletes only expired keys")
+        self.activate('old-key')
+        self.activate('new-key')
+        IdempotencyRecord.objects.filter(key='old-key').update(expires_at=timezone.now() - timedelta(seconds=1))
+        out = StringIO()
+        call_command('purge_idempotency_records', stdout=out)
+        self.assertIn('Purged 1', out.getvalue())
+        self.assertEqual(list(IdempotencyRecord.objects.values_list('key', flat=True)), ['new-key'])
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "Points the default alias at a SQLite file")
+class ActivateLicenseConcurrencyTests(APITransactionTestCase):
+    """
+    Parallel activations on request threads, each with its own connection. They run against a
+    migrated SQLite file: threads sharing the in-memory test database fail on its shared-cache
+    table locks instead of waiting for the company lock like server workers do. Transactions
+    stay DEFERRED, so lock_company is what serializes them.
+    """
+    THREADS = 8
+
+    @classmethod
+    def setUpClass(cls):
+        cls.database_directory = tempfile.TemporaryDirectory()
+        cls.memory_connection = connections['default']
+        cls.memory_settings = connections.settings['default']
+        connections.settings['default'] = dict(
+            cls.memory_settings,
+            NAME=os.path.join(cls.database_directory.name, 'concurrency.sqlite3'),
+            OPTIONS={**cls.memory_settings.get('OPTIONS', {}), 'timeout': 30},
+        )
+        connections['default'] = connections.create_connection('default')
+        call_command('migrate', verbosity=0, interactive=False, run_syncdb=True)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['default'].close()
+        connections.settings['default'] = cls.memory_settings
+        connections['default'] = cls.memory_connection
+        cls.database_directory.cleanup()
+
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Monthly Basic', duration=1, duration_type='months', price_per_user='10.00')
+        self.token = str(AccessToken.for_user(self.admin_user))
+
+    def activate_in_parallel(self, keys):
+        """
+        POST one activation per key, all released at once, and return the responses in key order.
+        """
+        start = threading.Barrier(len(keys))
+
+        def activate(key):
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.token)
+            try:
+                start.wait()
+                return client.post(reverse('activate-license'), {'license_type': self.license_type.id}, format='json', HTTP_IDEMPOTENCY_KEY=key)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(keys)) as executor:
+            return list(executor.map(activate, keys))
+
+    def test_parallel_retries_activate_once(self):
+        print("activate_license_idempotency test_parallel_retries_activate_once Test parallel requests sharing a key create one license and replay its response")
+        responses = self.activate_in_parallel(['same-key'] * self.THREADS)
+
+        self.assertEqual([response.status_code for response in responses], [status.HTTP_201_CREATED] * self.THREADS)
+        self.assertEqual(len({response.content for response in responses}), 1)
+        self.assertEqual(sum(response.get('Idempotent-Replayed') == 'true' for response in responses), self.THREADS - 1)
+        self.assertEqual(CompanyLicense.objects.filter(company=self.admin_company).count(), 1)
+        self.assertEqual(IdempotencyRecord.objects.count(), 1)
+
+    def test_parallel_keys_activate_once_each(self):
+        print("activate_license_idempotency test_parallel_keys_activate_once_each Test parallel requests with distinct and repeated keys bill each key once")
+        keys = [f'renewal-{i % 4}' for i in range(self.THREADS)]
+        responses = self.activate_in_parallel(keys)
+        self.assertEqual({response.status_code for response in responses}, {status.HTTP_201_CREATED})
+
+        # Every request of a key gets the same license; every key gets its own.
+        license_by_key = {}
+        for key, response in zip(keys, responses):
+            self.assertEqual(license_by_key.setdefault(key, response.data['data']['id']), response.data['data']['id'])
+        self.assertEqual(len(set(license_by_key.values())), 4)
+
+        licenses = list(CompanyLicense.objects.filter(company=self.admin_company).order_by('start_date'))
+        self.assertEqual(sorted(license.id for license in licenses), sorted(license_by_key.values()))
+        self.assertEqual(sum(license.total_amount for license in licenses), Decimal('10.00') * 4)
+        for previous, following in zip(licenses, licenses[1:]):
+            self.assertEqual(following.start_date, previous.end_date + timedelta(days=1))
+        self.assertEqual(Counter(response.get('Idempotent-Replayed') for response in responses), Counter({None: 4, 'true': 4}))
@@ -0,0 +1,169 @@
+from rest_framework.test import APITestCase
+import asyncio
+from django.urls import path, resolve, reverse
+from django.test import override_settings
+from django.core.cache import cache
+from licensingapp import async_views
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+from project.commons.tenant_tokens import apply_tenant_claims, bump_tenant_version
+from project.commons.async_api import async_api_view
+from django.core.exceptions import PermissionDenied as DjangoPermissionDenied
+from django.http import Http404
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.throttling import UserRateThrottle
+
+class OncePerUserThrottle(UserRateThrottle):
+    rate = '1/minute'
+
+
+def _raise(kind):
+    if kind == 'not-found':
+        raise Http404
+    if kind == 'denied':
+        raise DjangoPermissionDenied
+    return Response({'status': 'success'})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@throttle_classes([OncePerUserThrottle])
+def _sync_raises(request, kind):
+    return _raise(kind)
+
+
+@async_api_view(['GET'], permission_classes=[IsAuthenticated])
+@throttle_classes([OncePerUserThrottle])
+async def _async_raises(request, kind):
+    return _raise(kind)
+
+
+# URLconf serving the read endpoints through the async views, as ASYNC_READ_ENDPOINTS does.
+urlpatterns = [
+    path('raises/sync/<str:kind>/', _sync_raises, name='raises-sync'),
+    path('raises/async/<str:kind>/', _async_raises, name='raises-async'),
+    path('api/licensing/types/get/<int:pk>/', async_views.get_license_type, name='get-license-type'),
+    path('api/licensing/types/all/', async_views.get_all_license_types, name='get-all-license-types'),
+    path('api/licensing/license/capacity-check/', async_views.check_license_capacity, name='check-license-capacity'),
+    path('api/licensing/company/license-info/', async_views.get_company_license_info, name='get-company-license-info'),
+    path('api/licensing/user/company-employee-info/', async_views.get_user_company_and_employee_info_view, name='get-user-company-employee-info'),
+    path('api/licensing/license/check-active/', async_views.check_active_license, name='check-active-license'),
+]
+
+class AsyncReadEndpointsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.regular_user = User.objects.create_user(username='regular', password='regularpassword')
+        Employee.objects.create(user=self.regular_user, company=self.admin_company, role=Role.USER.value)
+        self.regular_access_token = str(AccessToken.for_user(self.regular_user))
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def _get_both(self, url_name, token=None, **kwargs):
+        if token:
+            self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + token)
+        url = reverse(url_name, kwargs=kwargs or None)
+        sync_response = self.client.get(url)
+        with override_settings(ROOT_URLCONF=__name__):
+            async_response = self.client.get(url)
+        return sync_response, async_response
+
+    def assertSameResponse(self, sync_response, async_response):
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response['Content-Type'], sync_response['Content-Type'])
+
+    def test_same_payloads_as_sync_views(self):
+        print("async_read_endpoints test_same_payloads_as_sync_views Test the async views return the same bytes as the sync views")
+        for url_name in ['check-license-capacity', 'get-company-license-info', 'get-user-company-employee-info', 'check-active-license', 'get-all-license-types']:
+            with self.subTest(url_name=url_name):
+                self.assertSameResponse(*self._get_both(url_name, token=self.admin_access_token))
+        self.assertSameResponse(*self._get_both('get-license-type', token=self.admin_access_token, pk=self.license_type.id))
+        self.assertSameResponse(*self._get_both('get-license-type', token=self.admin_access_token, pk=999))
+
+        with override_settings(ROOT_URLCONF=__name__):
+            self.assertTrue(asyncio.iscoroutinefunction(resolve(reverse('check-active-license')).func))
+
+    def test_unauthenticated(self):
+        print("async_read_endpoints test_unauthenticated Test the async views reject missing and invalid tokens like the sync views")
+        sync_response, async_response = self._get_both('check-active-license')
+        self.assertEqual(async_response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync_response, async_response)
+        self.assertEqual(async_response['WWW-Authenticate'], sync_response['WWW-Authenticate'])
+
+        sync_response, async_response = self._get_both('check-active-license', token='invalid')
+        self.assertEqual(async_response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync_response, async_response)
+
+    def test_not_admin(self):
+        print("async_read_endpoints test_not_admin Test the async admin permission matches the sync one")
+        sync_response, async_response = self._get_both('check-license-capacity', token=self.regular_access_token)
+        self.assertEqual(async_response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertSameResponse(sync_response, async_response)
+
+    @override_settings(TENANT_TOKEN_CLAIMS=True)
+    def test_tenant_claims(self):
+        print("async_read_endpoints test_tenant_claims Test the async views accept current tenant claims and reject stale ones")
+        token = str(apply_tenant_claims(AccessToken.for_user(self.admin_user), self.admin_user.id))
+        self.assertSameResponse(*self._get_both('check-license-capacity', token=token))
+
+        bump_tenant_version(self.admin_company.id)
+        sync_response, async_response = self._get_both('check-license-capacity', token=token)
+        self.assertEqual(async_response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertSameResponse(sync_response, async_response)
+
+    def test_method_not_allowed(self):
+        print("async_read_endpoints test_method_not_allowed Test the async views reject other methods")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with override_settings(ROOT_URLCONF=__name__):
+            response = self.client.post(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_exceptions_use_the_exception_handler(self):
+        print("async_read_endpoints test_exceptions_use_the_exception_handler Test Django exceptions and throttling get the same responses as the sync views")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with override_settings(ROOT_URLCONF=__name__):
+            for kind, expected in (('not-found', status.HTTP_404_NOT_FOUND), ('denied', status.HTTP_403_FORBIDDEN)):
+                with self.subTest(kind=kind):
+                    cache.clear()
+                    sync_response = self.client.get(reverse('raises-sync', kwargs={'kind': kind}))
+                    cache.clear()
+                    async_response = self.client.get(reverse('raises-async', kwargs={'kind': kind}))
+                    self.assertEqual(async_response.status_code, expected)
+                    self.assertSameResponse(sync_response, async_response)
+
+            cache.clear()
+            self.assertEqual(self.client.get(reverse('raises-async', kwargs={'kind': 'ok'})).status_code, status.HTTP_200_OK)
+            throttled = self.client.get(reverse('raises-async', kwargs={'kind': 'ok'}))
+            self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', throttled)
+
+    def test_options(self):
+        print("async_read_endpoints test_options Test the async views answer OPTIONS with the view metadata")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with override_settings(ROOT_URLCONF=__name__):
+            response = self.client.options(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['name'], 'Check Active License')
+        self.assertEqual(set(response['Allow'].split(', ')), {'GET', 'OPTIONS'})
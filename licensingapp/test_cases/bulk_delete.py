@@ -0,0 +1,44 @@
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.contrib.admin.models import LogEntry, ADDITION
+from django.contrib.auth.models import User, Group, Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import PROTECT, ProtectedError
+from licensingapp.bulk_delete import delete_rows
+
+class BulkDeleteTests(APITestCase):
+    def setUp(self):
+        # ContentType has a CASCADE relation (Permission, itself linked to users and groups)
+        # and a SET_NULL one (LogEntry.content_type).
+        self.content_type = ContentType.objects.create(app_label='bulkdelete', model='widget')
+        self.permission = Permission.objects.create(name='Can frob widget', codename='frob_widget', content_type=self.content_type)
+        self.user = User.objects.create_user(username='admin', password='adminpassword')
+        self.user.user_permissions.add(self.permission)
+        self.group = Group.objects.create(name='Frobbers')
+        self.group.permissions.add(self.permission)
+        self.log_entry = LogEntry.objects.create(
+            user=self.user, content_type=self.content_type, object_id='1', object_repr='widget', action_flag=ADDITION
+        )
+
+    def test_cascades_recursively_and_sets_null(self):
+        print("bulk_delete test_cascades_recursively_and_sets_null Test raw deletes cascade into grandchildren and null SET_NULL columns")
+        self.assertEqual(delete_rows(ContentType, [self.content_type.id]), 1)
+
+        self.assertFalse(ContentType.objects.filter(pk=self.content_type.id).exists())
+        self.assertFalse(Permission.objects.filter(pk=self.permission.id).exists())
+        self.assertFalse(User.user_permissions.through.objects.filter(permission_id=self.permission.id).exists())
+        self.assertFalse(Group.permissions.through.objects.filter(permission_id=self.permission.id).exists())
+        self.log_entry.refresh_from_db()
+        self.assertIsNone(self.log_entry.content_type_id)
+        self.assertTrue(User.objects.filter(pk=self.user.id).exists())
+        self.assertTrue(Group.objects.filter(pk=self.group.id).exists())
+
+    def test_protected_relation_refuses_delete(self):
+        print("bulk_delete test_protected_relation_refuses_delete Test raw deletes raise instead of removing rows a PROTECT relation still references")
+        remote_field = LogEntry._meta.get_field('content_type').remote_field
+        with mock.patch.object(remote_field, 'on_delete', PROTECT):
+            with self.assertRaises(ProtectedError):
+                delete_rows(ContentType, [self.content_type.id])
+        self.assertTrue(ContentType.objects.filter(pk=self.content_type.id).exists())
+        self.log_entry.refresh_from_db()
+        self.assertEqual(self.log_entry.content_type_id, self.content_type.id)
@@ -0,0 +1,107 @@
+from io import StringIO
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.contrib.auth.models import User, Group
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense, CompanyPurge, IdempotencyRecord
+from licensingapp.company_purge import purge_company, purge_deleted_companies
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role, PurgePhase
+
+class CompanyPurgeTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        today = timezone.now().date()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        users = User.objects.bulk_create([User(username=f'user{i}', password='!') for i in range(6)])
+        Employee.objects.bulk_create([Employee(user=user, company=self.company, role=Role.USER.value) for user in users])
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.bulk_create([
+            CompanyLicense(
+                company=self.company, license_type=self.license_type, total_users=10, total_amount='1000.00',
+                start_date=today - timedelta(days=365 * (i + 1)), end_date=today + timedelta(days=30 - 365 * i),
+                status='active' if i == 0 else 'expired'
+            ) for i in range(3)
+        ])
+        IdempotencyRecord.objects.create(
+            company=self.company, scope='activate_license', key='key', request_hash='hash',
+            status_code=201, response_body={}, expires_at=timezone.now() + timedelta(days=1)
+        )
+        self.admin_user.groups.add(Group.objects.create(name='Auditors'))
+
+        self.other_user = User.objects.create_user(username='other', password='otherpassword')
+        self.other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        Employee.objects.create(user=self.other_user, company=self.other_company, role=Role.ADMIN.value)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def delete_company(self):
+        response = self.client.delete(reverse('delete-company', args=[self.company.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        return response
+
+    def test_deleted_company_is_hidden(self):
+        print("company_purge test_deleted_company_is_hidden Test a deleted company disappears from the endpoints before it is purged")
+        self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_200_OK)
+        self.delete_company()
+
+        self.assertEqual(Employee.objects.filter(company=self.company).count(), 7)
+        self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(reverse('get-user-company-employee-info'))
+        self.assertIsNone(response.data['data']['company'])
+        response = self.client.delete(reverse('delete-company', args=[self.company.id]))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.post(reverse('register-company-for-existing-user'), {'name': 'New Company', 'address': 'New St'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_purge_removes_company_data_in_chunks(self):
+        print("company_purge test_purge_removes_company_data_in_chunks Test the purge deletes licenses, employees and users chunk by chunk and records its progress")
+        purge_id = self.delete_company().data['data']['purge_id']
+
+        purge = purge_company(purge_id, batch_size=2)
+
+        self.assertEqual(purge.phase, PurgePhase.DONE.value)
+        self.assertIsNotNone(purge.finished_at)
+        self.assertEqual((purge.licenses_deleted, purge.employees_deleted, purge.users_deleted), (3, 7, 7))
+        self.assertFalse(Company.objects.filter(pk=self.company.id).exists())
+        self.assertFalse(CompanyLicense.objects.filter(company_id=self.company.id).exists())
+        self.assertFalse(Employee.objects.filter(company_id=self.company.id).exists())
+        self.assertFalse(IdempotencyRecord.objects.filter(company_id=self.company.id).exists())
+        self.assertEqual(list(User.objects.values_list('username', flat=True)), ['other'])
+        self.assertFalse(User.groups.through.objects.exists())
+        self.assertTrue(Employee.objects.filter(company=self.other_company).exists())
+
+    def test_purge_resumes_after_interruption(self):
+        print("company_purge test_purge_resumes_after_interruption Test an interrupted purge keeps the committed chunks and continues from its phase")
+        purge_id = self.delete_company().data['data']['purge_id']
+
+        with mock.patch('licensingapp.company_purge.delete_employees_with_users', side_effect=RuntimeError('worker killed')):
+            with self.assertRaises(RuntimeError):
+                purge_company(purge_id, batch_size=2)
+
+        purge = CompanyPurge.objects.get(pk=purge_id)
+        self.assertEqual(purge.phase, PurgePhase.EMPLOYEES.value)
+        self.assertEqual(purge.licenses_deleted, 3)
+        self.assertEqual(Employee.objects.filter(company_id=self.company.id).count(), 7)
+
+        self.assertEqual(purge_deleted_companies(batch_size=2), 1)
+        purge.refresh_from_db()
+        self.assertEqual((purge.employees_deleted, purge.users_deleted), (7, 7))
+        self.assertFalse(Company.objects.filter(pk=self.company.id).exists())
+        self.assertEqual(purge_deleted_companies(), 0)
+
+    def test_command(self):
+        print("company_purge test_command Test the management command reports the purged companies")
+        self.delete_company()
+        out = StringIO()
+        call_command('purge_deleted_companies', '--batch-size', '3', stdout=out)
+        self.assertIn('Purged 1 companies.', out.getvalue())
+        self.assertFalse(Company.objects.filter(pk=self.company.id).exists())
@@ -0,0 +1,90 @@
+from io import StringIO
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.contrib.auth.models import User
+from django.db.models import Count
+from django.utils import timezone
+from licensingapp.models import Company, Employee, CompanyLicense
+from licensingapp.dataset_generator import employee_distribution, generate_dataset
+from rest_framework import status
+from project.commons.common_constants import LicenseStatus, Role
+
+class DatasetGeneratorTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_skewed_distribution(self):
+        print("dataset_generator test_skewed_distribution Test employees follow a Zipf-like skew and every company gets one")
+        counts = employee_distribution(10, 1000, skew=1.0)
+        self.assertEqual(sum(counts), 1000)
+        self.assertEqual(counts, sorted(counts, reverse=True))
+        self.assertGreater(counts[0], 5 * counts[-1])
+        self.assertEqual(employee_distribution(4, 10, skew=0), [3, 3, 2, 2])
+        self.assertEqual(employee_distribution(3, 3, skew=2.0), [1, 1, 1])
+        with self.assertRaises(ValueError):
+            employee_distribution(5, 4, skew=1.0)
+
+    def test_generates_consistent_rows(self):
+        print("dataset_generator test_generates_consistent_rows Test generated counters, admins and license histories are consistent")
+        # A batch size that does not divide the employees splits batches across companies.
+        companies, employees, licenses = generate_dataset(12, 500, history=4, batch_size=37, password='datasetpassword')
+        self.assertEqual((companies, employees), (12, 500))
+        self.assertEqual(Employee.objects.count(), 500)
+        self.assertEqual(CompanyLicense.objects.count(), licenses)
+
+        for company in Company.objects.annotate(employees=Count('employee')):
+            self.assertEqual(company.employee_count, company.employees)
+        self.assertEqual(Employee.objects.filter(role=Role.ADMIN.value).values('company').distinct().count(), 12)
+
+        today = timezone.now().date()
+        statuses = set(CompanyLicense.objects.values_list('status', flat=True))
+        self.assertEqual(statuses, {license_status.value for license_status in LicenseStatus})
+        for active in CompanyLicense.objects.filter(status=LicenseStatus.ACTIVE.value):
+            self.assertTrue(active.start_date <= today <= active.end_date)
+        self.assertFalse(CompanyLicense.objects.filter(status__in=[LicenseStatus.EXPIRED.value, LicenseStatus.REJECTED.value], end_date__gte=today).exists())
+        self.assertFalse(CompanyLicense.objects.filter(status=LicenseStatus.PENDING.value, start_date__lte=today).exists())
+        self.assertEqual(CompanyLicense.objects.filter(status=LicenseStatus.ACTIVE.value).values('company').annotate(n=Count('id')).filter(n__gt=1).count(), 0)
+        for license in CompanyLicense.objects.filter(status__in=[LicenseStatus.ACTIVE.value, LicenseStatus.PENDING.value]).select_related('company'):
+            self.assertGreaterEqual(license.total_users, license.company.employee_count)
+
+        self.assertTrue(User.objects.order_by('-id').first().check_password('datasetpassword'))
+
+    def test_deterministic_for_seed(self):
+        print("dataset_generator test_deterministic_for_seed Test the same seed generates the same dataset")
+        def shape(prefix, seed):
+            generate_dataset(8, 80, history=3, seed=seed, prefix=prefix)
+            companies = Company.objects.filter(name__startswith=f'{prefix} ').order_by('id')
+            return [
+                (company.employee_count, list(company.companylicense_set.order_by('start_date').values_list('status', 'total_users', 'start_date', 'end_date', 'license_type__name')))
+                for company in companies
+            ]
+
+        first = shape('first', seed=7)
+        self.assertEqual(first, shape('second', seed=7))
+        self.assertNotEqual(first, shape('third', seed=8))
+
+    def test_generated_tenant_uses_endpoints(self):
+        print("dataset_generator test_generated_tenant_uses_endpoints Test a generated admin can log in and sees its company")
+        generate_dataset(3, 30, password='datasetpassword')
+        company = Company.objects.filter(companylicense__status=LicenseStatus.ACTIVE.value).order_by('id').first()
+        admin = Employee.objects.get(company=company, role=Role.ADMIN.value).user
+
+        tokens = self.client.post(reverse('token_obtain_pair'), {'username': admin.username, 'password': 'datasetpassword'}, format='json')
+        self.assertEqual(tokens.status_code, status.HTTP_200_OK)
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens.data['access'])
+        response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['current_employees'], company.employee_count)
+
+    def test_command(self):
+        print("dataset_generator test_command Test the generate_dataset command creates the requested rows")
+        out = StringIO()
+        call_command('generate_dataset', companies=5, employees=50, history=2, batch_size=20, stdout=out)
+        self.assertIn("Created 5 companies, 50 employees", out.getvalue())
+        self.assertEqual(Employee.objects.count(), 50)
+
+        with self.assertRaises(CommandError):
+            call_command('generate_dataset', companies=5, employees=4, stdout=StringIO())
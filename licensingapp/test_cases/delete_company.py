@@ -1,6 +1,7 @@
 from rest_framework.test import APITestCase
 from django.urls import reverse
 from licensingapp.models import Company, Employee, CompanyLicense, LicenseType
+from licensingapp.company_purge import purge_deleted_companies
 from rest_framework import status
 from django.contrib.auth.models import User
 from rest_framework_simplejwt.tokens import AccessToken
@@ -50,7 +51,10 @@ class DeleteCompanyTests(APITestCase):
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
         response = self.client.delete(self.delete_url)
 
-        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertIsNotNone(Company.objects.get(id=self.admin_company.id).deleted_at)
+
+        self.assertEqual(purge_deleted_companies(), 1)
 
         self.assertFalse(Company.objects.filter(id=self.admin_company.id).exists())
         self.assertFalse(Employee.objects.filter(company=self.admin_company).exists())
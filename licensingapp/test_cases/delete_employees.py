@@ -0,0 +1,85 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import Company, Employee
+from rest_framework import status
+from django.contrib.auth.models import User, Group
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons.common_constants import Role
+
+class DeleteEmployeesTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('delete-employees')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.employees = [
+            Employee.objects.create(
+                user=User.objects.create_user(username=f'employee{i}', password='employeepass'),
+                company=self.admin_company, role=Role.USER.value
+            ) for i in range(4)
+        ]
+        self.employees[0].user.groups.add(Group.objects.create(name='Sales'))
+
+        self.other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        self.other_employee = Employee.objects.create(
+            user=User.objects.create_user(username='othercompanyemp', password='otherpass'),
+            company=self.other_company, role=Role.USER.value
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def test_success(self):
+        print("delete_employees test_success Test an admin deletes several employees and their users in one request")
+        ids = [employee.id for employee in self.employees[:3]]
+        response = self.client.post(self.url, {'employee_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['deleted'], 3)
+        self.assertEqual([result['status'] for result in response.data['data']['results']], ['deleted'] * 3)
+        self.assertFalse(Employee.objects.filter(id__in=ids).exists())
+        self.assertFalse(User.objects.filter(username__in=['employee0', 'employee1', 'employee2']).exists())
+        self.assertFalse(User.groups.through.objects.exists())
+        self.assertTrue(Employee.objects.filter(id=self.employees[3].id).exists())
+
+        self.admin_company.refresh_from_db()
+        self.assertEqual(self.admin_company.employee_count, 2)
+
+    def test_per_id_outcomes(self):
+        print("delete_employees test_per_id_outcomes Test ids of other companies, unknown ids and the caller are reported and kept")
+        ids = [self.employees[0].id, self.other_employee.id, self.admin_employee.id, 999999, self.employees[0].id]
+        response = self.client.post(self.url, {'employee_ids': ids}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data['data']
+        self.assertEqual((data['total'], data['deleted'], data['failed']), (4, 1, 3))
+        self.assertEqual(data['results'], [
+            {'employee_id': self.employees[0].id, 'status': 'deleted'},
+            {'employee_id': self.other_employee.id, 'status': 'error', 'message': "Employee not found"},
+            {'employee_id': self.admin_employee.id, 'status': 'error', 'message': "Not authorized to delete yourself"},
+            {'employee_id': 999999, 'status': 'error', 'message': "Employee not found"},
+        ])
+        self.assertTrue(Employee.objects.filter(id=self.other_employee.id).exists())
+        self.assertTrue(Employee.objects.filter(id=self.admin_employee.id).exists())
+
+    def test_constant_query_count(self):
+        print("delete_employees test_constant_query_count Test the number of queries does not grow with the number of ids")
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(self.url, {'employee_ids': [self.employees[0].id]}, format='json')
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(self.url, {'employee_ids': [employee.id for employee in self.employees[1:]]}, format='json')
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+
+    def test_invalid_payload(self):
+        print("delete_employees test_invalid_payload Test an empty or malformed id list is rejected")
+        response = self.client.post(self.url, {'employee_ids': []}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post(self.url, {'employee_ids': ['abc']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_not_admin(self):
+        print("delete_employees test_not_admin Test a non-admin employee cannot delete employees")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.employees[0].user)))
+        response = self.client.post(self.url, {'employee_ids': [self.employees[1].id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertTrue(Employee.objects.filter(id=self.employees[1].id).exists())
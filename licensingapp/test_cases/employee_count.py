@@ -0,0 +1,89 @@
+from io import StringIO
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+class EmployeeCountTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.other_company = Company.objects.create(name='Other Company', address='456 Other St')
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def _count(self, company):
+        company.refresh_from_db(fields=['employee_count'])
+        return company.employee_count
+
+    def test_counter_tracks_employee_changes(self):
+        print("employee_count test_counter_tracks_employee_changes Test the counter follows employee creation, moves and deletion")
+        self.assertEqual(self._count(self.admin_company), 1)
+
+        user = User.objects.create_user(username='employee', password='employeepassword')
+        employee = Employee.objects.create(user=user, company=self.admin_company, role=Role.USER.value)
+        self.assertEqual(self._count(self.admin_company), 2)
+
+        employee.company = self.other_company
+        employee.save()
+        self.assertEqual(self._count(self.admin_company), 1)
+        self.assertEqual(self._count(self.other_company), 1)
+
+        employee.delete()
+        self.assertEqual(self._count(self.other_company), 0)
+
+    def test_registration_and_deletion_endpoints(self):
+        print("employee_count test_registration_and_deletion_endpoints Test the endpoints keep the counter exact")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        payload = {"username": "newemployee", "password": "employeepassword"}
+        response = self.client.post(reverse('register-employee-by-admin'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self._count(self.admin_company), 2)
+
+        response = self.client.delete(reverse('delete-employee', args=[response.data['data']['id']]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(self._count(self.admin_company), 1)
+
+    def test_capacity_reads_counter(self):
+        print("employee_count test_capacity_reads_counter Test the capacity check reads the counter instead of counting")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.data['data']['current_employees'], 1)
+        self.assertEqual(response.data['data']['users_left'], 4)
+        self.assertFalse(any('COUNT(' in q['sql'] for q in ctx.captured_queries))
+
+    def test_reconcile_command_repairs_drift(self):
+        print("employee_count test_reconcile_command_repairs_drift Test the reconcile command repairs drifted counters")
+        Company.objects.filter(pk=self.admin_company.pk).update(employee_count=42)
+        Company.objects.filter(pk=self.other_company.pk).update(employee_count=3)
+
+        out = StringIO()
+        call_command('reconcile_employee_counts', stdout=out)
+        self.assertIn('Repaired employee_count for 2 companies', out.getvalue())
+        self.assertEqual(self._count(self.admin_company), 1)
+        self.assertEqual(self._count(self.other_company), 0)
+
+        out = StringIO()
+        call_command('reconcile_employee_counts', stdout=out)
+        self.assertIn('All employee counters are consistent.', out.getvalue())
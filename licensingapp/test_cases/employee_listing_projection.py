@@ -0,0 +1,71 @@
+from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import Company, Employee
+from licensingapp.serializers import EmployeeGetSerializer
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons.common_constants import Role
+from project.commons.common_methods import paginatedResponse
+
+class EmployeeListingProjectionTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('get-company-employees')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword', email='admin@example.com', first_name='Ada', last_name='Admin')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St\nSuite "4"')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        for i in range(14):
+            user = User.objects.create_user(username=f'user{i}', password='password', first_name=f'Fïrst{i}', last_name='' if i % 2 else f'Last{i}')
+            Employee.objects.create(user=user, company=self.admin_company, role=Role.USER.value)
+
+        other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        other_user = User.objects.create_user(username='otheruser', password='otherpassword')
+        Employee.objects.create(user=other_user, company=other_company, role=Role.USER.value)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+
+    def _legacy_content(self, offset, limit, employees):
+        total_count = employees.count()
+        serializer = EmployeeGetSerializer(employees[offset:offset + limit], many=True)
+        return JSONRenderer().render(paginatedResponse(offset, limit, total_count, serializer, 'employees').data)
+
+    def test_byte_identical_to_serializer(self):
+        print("employee_listing_projection test_byte_identical_to_serializer Test the projected listing matches EmployeeGetSerializer byte for byte")
+        employees = Employee.objects.filter(company_id=self.admin_company.id)
+        for offset, limit in [(0, 10), (10, 10), (3, 4), (0, 100)]:
+            with self.subTest(offset=offset, limit=limit):
+                response = self.client.get(f"{self.url}?offset={offset}&limit={limit}")
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, self._legacy_content(offset, limit, employees))
+
+        response = self.client.get(f"{self.url}?first_name=rst1&limit=10")
+        filtered = Employee.objects.filter(company_id=self.admin_company.id, user__first_name__icontains='rst1')
+        self.assertEqual(response.content, self._legacy_content(0, 10, filtered))
+
+    def test_cursor_page_matches_serializer(self):
+        print("employee_listing_projection test_cursor_page_matches_serializer Test cursor pages carry the same employee payloads")
+        response = self.client.get(f"{self.url}?cursor=&limit=5&sort=username")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        employees = Employee.objects.filter(company_id=self.admin_company.id).order_by('user__username', 'id')[:5]
+        self.assertEqual(response.data['employees'], EmployeeGetSerializer(employees, many=True).data)
+
+    def test_query_count_independent_of_page_size(self):
+        print("employee_listing_projection test_query_count_independent_of_page_size Test a page costs the same number of queries at any size")
+        # Authentication, tenant context, COUNT and the projected page.
+        with self.assertNumQueries(4):
+            self.client.get(f"{self.url}?limit=2")
+        with self.assertNumQueries(4):
+            self.client.get(f"{self.url}?limit=15")
+
+    def test_password_hash_not_loaded(self):
+        print("employee_listing_projection test_password_hash_not_loaded Test the listing query does not select password hashes")
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(f"{self.url}?limit=15")
+        listing_sql = queries.captured_queries[-1]['sql']
+        self.assertIn('"licensingapp_employee"', listing_sql)
+        self.assertNotIn('"password"', listing_sql)
@@ -0,0 +1,73 @@
+from io import StringIO
+from rest_framework.test import APITransactionTestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from licensingapp.license_expiry import expire_licenses
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role, LicenseStatus
+
+class ExpireLicensesTests(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def create_license(self, end_offset, status=LicenseStatus.ACTIVE.value, company=None):
+        return CompanyLicense.objects.create(
+            company=company or self.company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=self.today - timedelta(days=365),
+            end_date=self.today + timedelta(days=end_offset),
+            status=status
+        )
+
+    def test_expires_only_past_due_active_licenses(self):
+        print("expire_licenses test_expires_only_past_due_active_licenses Test the sweep expires active licenses that ended before today")
+        past_due = self.create_license(-1)
+        ends_today = self.create_license(0)
+        pending = self.create_license(-10, status=LicenseStatus.PENDING.value)
+
+        self.assertEqual(expire_licenses(), 1)
+
+        past_due.refresh_from_db()
+        self.assertEqual(past_due.status, LicenseStatus.EXPIRED.value)
+        self.assertEqual(CompanyLicense.objects.get(pk=ends_today.pk).status, LicenseStatus.ACTIVE.value)
+        self.assertEqual(CompanyLicense.objects.get(pk=pending.pk).status, LicenseStatus.PENDING.value)
+
+    def test_sweep_is_idempotent_and_batched(self):
+        print("expire_licenses test_sweep_is_idempotent_and_batched Test the sweep works through small batches and a rerun changes nothing")
+        for offset in range(1, 8):
+            self.create_license(-offset)
+        self.assertEqual(expire_licenses(batch_size=3), 7)
+        self.assertEqual(expire_licenses(batch_size=3), 0)
+        self.assertFalse(CompanyLicense.objects.filter(status=LicenseStatus.ACTIVE.value).exists())
+
+    def test_sweep_invalidates_license_state(self):
+        print("expire_licenses test_sweep_invalidates_license_state Test expiring a license drops the cached license state")
+        license = self.create_license(30)
+        self.assertEqual(self.client.get(reverse('check-license-capacity')).status_code, status.HTTP_200_OK)
+        CompanyLicense.objects.filter(pk=license.pk).update(end_date=self.today - timedelta(days=1))
+
+        expire_licenses()
+
+        response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command(self):
+        print("expire_licenses test_command Test the management command reports the expired licenses")
+        self.create_license(-3)
+        out = StringIO()
+        call_command('expire_licenses', stdout=out)
+        self.assertIn('Expired 1 licenses.', out.getvalue())
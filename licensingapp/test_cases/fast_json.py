@@ -0,0 +1,123 @@
+import datetime
+import decimal
+import io
+import uuid
+from unittest import mock
+from rest_framework.test import APITestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.parsers import JSONParser
+from rest_framework.exceptions import ParseError
+from django.urls import reverse
+from django.test import AsyncClient, override_settings
+from django.utils.translation import gettext_lazy
+from licensingapp.models import LicenseType, Company, Employee
+from licensingapp.serializers import LicenseTypeSerializer
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons import fast_json
+from project.commons.common_constants import Role
+from project.commons.fast_json import FastJSONParser, FastJSONRenderer
+
+class FastJSONTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+        for i in range(12):
+            user = User.objects.create_user(username=f'user{i}', password='password', first_name=f'Émile{i}')
+            Employee.objects.create(user=user, company=self.admin_company, role=Role.USER.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.50')
+
+    def _payload(self):
+        return {
+            'price': decimal.Decimal('100.50'),
+            'today': datetime.date(2025, 1, 31),
+            'now': datetime.datetime(2025, 1, 31, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            'naive': datetime.datetime(2025, 1, 31, 12, 30, 15),
+            'time': datetime.time(8, 15, 0, 500000),
+            'duration': datetime.timedelta(hours=1, seconds=3),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'lazy': gettext_lazy('License type not found'),
+            'text': 'Zoë   line   "quoted" \\ slash',
+            'wide': 2 ** 70,
+            'nested': [{'a': 1, 'b': None, 'c': True, 'd': 1.5}, [], {}],
+            'license': LicenseTypeSerializer(self.license_type).data,
+            'users': User.objects.filter(username__startswith='user1').values_list('username', flat=True),
+        }
+
+    def test_renderer_matches_json_renderer(self):
+        print("fast_json test_renderer_matches_json_renderer Test the fast renderer produces the same bytes as JSONRenderer")
+        payload = self._payload()
+        self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+
+        indented = 'application/json; indent=4'
+        self.assertEqual(FastJSONRenderer().render(payload, indented), JSONRenderer().render(payload, indented))
+
+    def test_stdlib_fallback_without_orjson(self):
+        print("fast_json test_stdlib_fallback_without_orjson Test the renderer and parser work without orjson installed")
+        payload = self._payload()
+        with mock.patch.object(fast_json, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(payload), JSONRenderer().render(payload))
+            self.assertEqual(FastJSONParser().parse(io.BytesIO(b'{"a": [1, 2.5]}')), {'a': [1, 2.5]})
+
+    def test_parser_matches_json_parser(self):
+        print("fast_json test_parser_matches_json_parser Test the fast parser accepts and rejects the same bodies as JSONParser")
+        for body in [b'{"username": "Zo\\u00eb", "n": [1, 2.5, -0, 1e2, null, true]}', b'123456789012345678901234567890', b'"\\ud800"', b'1.5e400']:
+            with self.subTest(body=body):
+                self.assertEqual(FastJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+        for body in [b'', b'{"a": }', b'NaN', b'{"a": 1']:
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError) as expected:
+                    JSONParser().parse(io.BytesIO(body))
+                with self.assertRaises(ParseError) as actual:
+                    FastJSONParser().parse(io.BytesIO(body))
+                self.assertEqual(str(actual.exception.detail), str(expected.exception.detail))
+
+    def test_endpoints_render_like_json_renderer(self):
+        print("fast_json test_endpoints_render_like_json_renderer Test endpoints respond with JSONRenderer-identical bodies")
+        response = self.client.get(reverse('get-all-license-types'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+        self.assertEqual(response['Content-Type'], 'application/json')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        response = self.client.post(reverse('create-license-type'), {'name': 'Basic', 'duration': 1, 'duration_type': 'months', 'price_per_user': '9.99'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.content, JSONRenderer().render(response.data))
+
+    def test_large_pages_are_streamed(self):
+        print("fast_json test_large_pages_are_streamed Test large employee pages stream the same body as a buffered response")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        url = reverse('get-company-employees')
+        buffered = self.client.get(f"{url}?offset=2&limit=8")
+        self.assertFalse(buffered.streaming)
+
+        with override_settings(JSON_STREAMING_MIN_ITEMS=5):
+            for query in ['offset=2&limit=8', 'offset=0&limit=50', 'offset=40&limit=10']:
+                with self.subTest(query=query):
+                    streamed = self.client.get(f"{url}?{query}")
+                    with override_settings(JSON_STREAMING_MIN_ITEMS=1000):
+                        expected = self.client.get(f"{url}?{query}")
+                    self.assertTrue(streamed.streaming)
+                    self.assertEqual(streamed['Content-Type'], 'application/json')
+                    self.assertEqual(b''.join(streamed.streaming_content), expected.content)
+
+    @override_settings(JSON_STREAMING_MIN_ITEMS=5)
+    async def test_large_pages_stream_asynchronously_under_asgi(self):
+        print("fast_json test_large_pages_stream_asynchronously_under_asgi Test ASGI requests get an async stream instead of a body Django would buffer")
+        url = reverse('get-company-employees')
+        client = AsyncClient()
+        headers = {'authorization': 'Bearer ' + self.admin_access_token}
+        streamed = await client.get(f"{url}?offset=2&limit=8", headers=headers)
+        self.assertTrue(streamed.streaming)
+        self.assertTrue(streamed.is_async)
+        body = b''.join([chunk async for chunk in streamed.streaming_content])
+
+        with override_settings(JSON_STREAMING_MIN_ITEMS=1000):
+            expected = await client.get(f"{url}?offset=2&limit=8", headers=headers)
+        self.assertFalse(expected.streaming)
+        self.assertEqual(body, expected.content)
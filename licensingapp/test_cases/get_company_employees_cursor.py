@@ -0,0 +1,101 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from licensingapp.models import Company, Employee
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons.common_constants import Role
+from project.commons.common_methods import encodeCursor
+
+class GetCompanyEmployeesCursorTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('get-company-employees')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        for i, first_name in enumerate(['Zoe', 'Adam', 'Mia', 'Adam', 'Liam']):
+            user = User.objects.create_user(username=f'user{i}', password='password', first_name=first_name)
+            Employee.objects.create(user=user, company=self.admin_company, role=Role.USER.value)
+
+        other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        other_user = User.objects.create_user(username='otheruser', password='otherpassword')
+        Employee.objects.create(user=other_user, company=other_company, role=Role.USER.value)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+
+    def _walk(self, query):
+        ids, cursor, pages = [], '', []
+        while cursor is not None:
+            response = self.client.get(f"{self.url}?{query}&cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+            ids.extend(employee['id'] for employee in response.data['employees'])
+            cursor = response.data['next_cursor']
+        return ids, pages
+
+    def test_walks_all_pages_in_order(self):
+        print("get_company_employees_cursor test_walks_all_pages_in_order Test cursor pages cover every employee exactly once")
+        ids, pages = self._walk('limit=2')
+        expected = list(Employee.objects.filter(company=self.admin_company).order_by('id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(pages[0]['total_count'], 6)
+        self.assertFalse(pages[0]['has_previous_page'])
+        self.assertFalse(pages[-1]['has_next_page'])
+        self.assertIsNone(pages[0]['next_offset'])
+
+    def test_sort_by_user_field_with_ties(self):
+        print("get_company_employees_cursor test_sort_by_user_field_with_ties Test sorting by first name keeps ties stable")
+        ids, _ = self._walk('limit=2&sort=first_name')
+        expected = list(Employee.objects.filter(company=self.admin_company).order_by('user__first_name', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_previous_cursor(self):
+        print("get_company_employees_cursor test_previous_cursor Test the previous cursor returns the preceding page")
+        first = self.client.get(f"{self.url}?limit=2&cursor=")
+        second = self.client.get(f"{self.url}?limit=2&cursor={first.data['next_cursor']}")
+        back = self.client.get(f"{self.url}?limit=2&cursor={second.data['previous_cursor']}")
+        self.assertEqual([e['id'] for e in back.data['employees']], [e['id'] for e in first.data['employees']])
+        self.assertFalse(back.data['has_previous_page'])
+        self.assertTrue(back.data['has_next_page'])
+
+    def test_filters_and_optional_total(self):
+        print("get_company_employees_cursor test_filters_and_optional_total Test filters apply and the filtered total is opt-in")
+        response = self.client.get(f"{self.url}?first_name=adam&cursor=")
+        self.assertEqual(len(response.data['employees']), 2)
+        self.assertIsNone(response.data['total_count'])
+
+        response = self.client.get(f"{self.url}?first_name=adam&include_total=true&cursor=")
+        self.assertEqual(response.data['total_count'], 2)
+
+    def test_invalid_cursor(self):
+        print("get_company_employees_cursor test_invalid_cursor Test malformed or mismatched cursors are rejected")
+        response = self.client.get(f"{self.url}?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], "Invalid cursor")
+
+        first = self.client.get(f"{self.url}?limit=2&cursor=")
+        response = self.client.get(f"{self.url}?limit=2&sort=username&cursor={first.data['next_cursor']}")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_tampered_cursor(self):
+        print("get_company_employees_cursor test_tampered_cursor Test cursors with values of the wrong type are rejected")
+        for sort, payload in (
+            ('id', {'s': 'id', 'v': 'abc', 'id': 1, 'd': 'next'}),
+            ('id', {'s': 'id', 'v': 1, 'id': 'abc', 'd': 'prev'}),
+            ('id', {'s': 'id', 'v': None, 'id': 1, 'd': 'next'}),
+            ('id', {'s': 'id', 'v': [1], 'id': 1, 'd': 'next'}),
+            ('username', {'s': 'user__username', 'v': 'user1', 'id': {'a': 1}, 'd': 'next'}),
+            ('id', {'s': 'id', 'v': 1, 'id': 1, 'd': 'sideways'}),
+        ):
+            cursor = encodeCursor(payload)
+            response = self.client.get(f"{self.url}?limit=2&sort={sort}&cursor={cursor}")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+            self.assertEqual(response.data['message'], "Invalid cursor")
+
+    def test_invalid_sort(self):
+        print("get_company_employees_cursor test_invalid_sort Test unknown sort fields are rejected")
+        response = self.client.get(f"{self.url}?sort=password&cursor=")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,157 @@
+import json
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.test import override_settings
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+class ImportEmployeesTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.regular_user = User.objects.create_user(username='regular', password='regularpassword')
+        Employee.objects.create(user=self.regular_user, company=self.admin_company, role=Role.USER.value)
+        self.regular_access_token = str(AccessToken.for_user(self.regular_user))
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.company_license = CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def _post(self, body, content_type, token=None):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + (token or self.admin_access_token))
+        return self.client.generic('POST', reverse('import-employees'), body, content_type=content_type)
+
+    def _ndjson(self, rows):
+        return '\n'.join(json.dumps(row) for row in rows)
+
+    def test_import_employees_csv_success(self):
+        print("import_employees test_import_employees_csv_success Test importing employees from a CSV upload")
+        body = "username,password,email,first_name,last_name\n" \
+               "alice,alicepassword,alice@example.com,Alice,Smith\n" \
+               "bob,bobpassword,bob@example.com,Bob,Jones\n"
+        response = self._post(body, 'text/csv; charset=utf-8')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'success')
+        self.assertEqual(response.data['data']['created'], 2)
+        self.assertEqual(response.data['data']['failed'], 0)
+        self.assertEqual(response.data['data']['failures'], [])
+
+        alice = User.objects.get(username='alice')
+        self.assertTrue(alice.check_password('alicepassword'))
+        self.assertEqual(alice.email, 'alice@example.com')
+        self.assertTrue(Employee.objects.filter(user=alice, company=self.admin_company, role=Role.USER.value).exists())
+        self.admin_company.refresh_from_db(fields=['employee_count'])
+        self.assertEqual(self.admin_company.employee_count, 4)
+
+    def test_import_employees_csv_with_bom(self):
+        print("import_employees test_import_employees_csv_with_bom Test importing a CSV exported with a UTF-8 byte order mark")
+        body = "\ufeffusername,password,email,first_name,last_name\n" \
+               "alice,alicepassword,alice@example.com,Alice,Smith\n"
+        response = self._post(body.encode('utf-8'), 'text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 1)
+        self.assertEqual(response.data['data']['failed'], 0)
+        self.assertTrue(User.objects.get(username='alice').check_password('alicepassword'))
+
+    @override_settings(EMPLOYEE_IMPORT_CHUNK_SIZE=1)
+    def test_import_employees_ndjson_success(self):
+        print("import_employees test_import_employees_ndjson_success Test importing employees from an NDJSON upload in several chunks")
+        body = self._ndjson([
+            {"username": "carol", "password": "carolpassword"},
+            {"username": "dave", "password": "davepassword", "first_name": "Dave"},
+        ])
+        response = self._post(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 2)
+        self.assertEqual(Employee.objects.filter(company=self.admin_company).count(), 4)
+
+    def test_import_employees_duplicate_usernames(self):
+        print("import_employees test_import_employees_duplicate_usernames Test existing and repeated usernames are reported per row")
+        body = self._ndjson([
+            {"username": "regular", "password": "password"},
+            {"username": "erin", "password": "erinpassword"},
+            {"username": "erin", "password": "erinpassword"},
+        ])
+        response = self._post(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        failures = response.data['data']['failures']
+        self.assertEqual([row['row'] for row in failures], [1, 3])
+        self.assertIn('username', failures[0]['errors'])
+        self.assertIn('username', failures[1]['errors'])
+        self.assertEqual(User.objects.filter(username='erin').count(), 1)
+
+    def test_import_employees_capacity_exhausted(self):
+        print("import_employees test_import_employees_capacity_exhausted Test rows beyond the license capacity are rejected")
+        body = self._ndjson([{"username": f"user{i}", "password": "userpassword"} for i in range(5)])
+        response = self._post(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['created'], 3)
+        self.assertEqual(response.data['data']['failed'], 2)
+        self.assertEqual(Employee.objects.filter(company=self.admin_company).count(), 5)
+        self.assertEqual([row['row'] for row in response.data['data']['failures']], [4, 5])
+        self.assertIn('non_field_errors', response.data['data']['failures'][1]['errors'])
+
+    def test_import_employees_invalid_rows(self):
+        print("import_employees test_import_employees_invalid_rows Test rows failing validation are reported without aborting the import")
+        body = self._ndjson([
+            {"username": "frank"},
+            {"username": "bad name!", "password": "password"},
+            {"username": "grace", "password": "gracepassword", "email": "not-an-email"},
+            {"username": "heidi", "password": "heidipassword"},
+        ])
+        response = self._post(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        failures = response.data['data']['failures']
+        self.assertEqual([row['row'] for row in failures], [1, 2, 3])
+        self.assertEqual(response.data['data']['created'], 1)
+        self.assertIn('password', failures[0]['errors'])
+        self.assertIn('email', failures[2]['errors'])
+
+    @override_settings(EMPLOYEE_IMPORT_CHUNK_SIZE=2, EMPLOYEE_IMPORT_MAX_REPORTED_FAILURES=3)
+    def test_import_employees_failures_truncated(self):
+        print("import_employees test_import_employees_failures_truncated Test only the first failed rows are listed and the rest are counted")
+        body = self._ndjson([{"username": f"user{i}"} for i in range(7)])
+        response = self._post(body, 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['failed'], 7)
+        self.assertEqual([row['row'] for row in response.data['data']['failures']], [1, 2, 3])
+        self.assertTrue(response.data['data']['failures_truncated'])
+
+    def test_import_employees_malformed_ndjson(self):
+        print("import_employees test_import_employees_malformed_ndjson Test a malformed line aborts the import with a bad request")
+        response = self._post('{"username": "ivan", "password": "ivanpassword"}\nnot json\n', 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['status'], 'error')
+
+    def test_import_employees_unsupported_content_type(self):
+        print("import_employees test_import_employees_unsupported_content_type Test an unsupported content type is rejected")
+        response = self._post('{"username": "judy"}', 'application/xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(User.objects.filter(username='judy').exists())
+
+    def test_import_employees_no_active_license(self):
+        print("import_employees test_import_employees_no_active_license Test importing without an active license")
+        self.company_license.status = 'expired'
+        self.company_license.save()
+        response = self._post(self._ndjson([{"username": "kim", "password": "kimpassword"}]), 'application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_import_employees_not_admin(self):
+        print("import_employees test_import_employees_not_admin Test a non-admin cannot import employees")
+        response = self._post(self._ndjson([{"username": "leo", "password": "leopassword"}]), 'application/x-ndjson', token=self.regular_access_token)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
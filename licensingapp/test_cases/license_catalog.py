@@ -0,0 +1,127 @@
+from rest_framework.test import APITransactionTestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
+from licensingapp.models import LicenseType, LicenseCatalogVersion
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+
+class LicenseCatalogConditionalTests(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='testadmin', password='testpassword')
+        self.access_token = str(AccessToken.for_user(self.user))
+        self.license_type = LicenseType.objects.create(name='Basic', duration=1, duration_type='years', price_per_user='10.00')
+        self.all_url = reverse('get-all-license-types')
+        self.get_url = reverse('get-license-type', args=[self.license_type.id])
+
+    def test_all_emits_validators(self):
+        print("license_catalog test_all_emits_validators Test the catalog listing carries a strong ETag, Last-Modified and public Cache-Control")
+        response = self.client.get(self.all_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Last-Modified', response)
+        self.assertIn('public', response['Cache-Control'])
+        self.assertIn('must-revalidate', response['Cache-Control'])
+
+    def test_all_not_modified_reads_version_row(self):
+        print("license_catalog test_all_not_modified_reads_version_row Test a matching If-None-Match is answered with 304 after reading only the version row")
+        etag = self.client.get(self.all_url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.all_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    @override_settings(LICENSE_CATALOG_VERSION_CACHE={'ALIAS': 'default', 'TIMEOUT': 300})
+    def test_all_not_modified_without_queries(self):
+        print("license_catalog test_all_not_modified_without_queries Test a matching If-None-Match is answered with 304 from a shared cached version stamp")
+        etag = self.client.get(self.all_url)['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(self.all_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_get_not_modified_is_private(self):
+        print("license_catalog test_get_not_modified_is_private Test a single license type revalidates with 304 and is not shared between users")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+        response = self.client.get(self.get_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(self.get_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_get_requires_authentication_before_304(self):
+        print("license_catalog test_get_requires_authentication_before_304 Test unauthenticated revalidation of a license type is rejected")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+        etag = self.client.get(self.get_url)['ETag']
+        self.client.credentials()
+        response = self.client.get(self.get_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_update_changes_etag(self):
+        print("license_catalog test_update_changes_etag Test updating a license type invalidates the catalog ETags")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+        all_etag = self.client.get(self.all_url)['ETag']
+        get_etag = self.client.get(self.get_url)['ETag']
+
+        self.client.patch(reverse('update-license-type', args=[self.license_type.id]), {'price_per_user': '12.00'}, format='json')
+
+        response = self.client.get(self.all_url, HTTP_IF_NONE_MATCH=all_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['license_types'][0]['price_per_user'], '12.00')
+        self.assertNotEqual(response['ETag'], all_etag)
+        response = self.client.get(self.get_url, HTTP_IF_NONE_MATCH=get_etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_create_changes_etag(self):
+        print("license_catalog test_create_changes_etag Test creating a license type invalidates the catalog listing ETag")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+        etag = self.client.get(self.all_url)['ETag']
+
+        self.client.post(reverse('create-license-type'), {'name': 'Pro', 'duration': 6, 'duration_type': 'months', 'price_per_user': '50.00'}, format='json')
+
+        response = self.client.get(self.all_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['license_types']), 2)
+
+    def test_representations_have_distinct_etags(self):
+        print("license_catalog test_representations_have_distinct_etags Test JSON and browsable API responses do not share an ETag")
+        json_response = self.client.get(self.all_url, HTTP_ACCEPT='application/json')
+        html_response = self.client.get(self.all_url, HTTP_ACCEPT='text/html')
+        self.assertNotEqual(json_response['ETag'], html_response['ETag'])
+        self.assertIn('Accept', json_response['Vary'])
+
+    def test_write_seen_by_other_workers(self):
+        print("license_catalog test_write_seen_by_other_workers Test the default settings stop answering 304 once another worker changed the catalog")
+        # Every worker process has its own LocMemCache; each LOCATION stands in for one worker.
+        worker_a = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        worker_b = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'}}
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+
+        with override_settings(CACHES=worker_b):
+            etag = self.client.get(self.all_url)['ETag']
+        with override_settings(CACHES=worker_a):
+            self.client.patch(reverse('update-license-type', args=[self.license_type.id]), {'price_per_user': '12.00'}, format='json')
+        with override_settings(CACHES=worker_b):
+            response = self.client.get(self.all_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['license_types'][0]['price_per_user'], '12.00')
+        self.assertIn(LicenseCatalogVersion.objects.get().stamp, response['ETag'])
+
+    def test_unknown_type_not_found_before_304(self):
+        print("license_catalog test_unknown_type_not_found_before_304 Test revalidating a license type that does not exist returns 404, never 304")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.access_token)
+        missing_id = self.license_type.id + 100
+        url = reverse('get-license-type', args=[missing_id])
+        self.client.get(self.get_url)
+        # The ETag the catalog would hand out for that id, were it to exist.
+        etag = '"%s-%s-json"' % (LicenseCatalogVersion.objects.get().stamp, missing_id)
+        for urlconf in ('project.urls', 'licensingapp.test_cases.async_read_endpoints'):
+            with self.subTest(urlconf=urlconf), override_settings(ROOT_URLCONF=urlconf):
+                for if_none_match in ('*', etag):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=if_none_match)
+                    self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+                    self.assertNotIn('ETag', response)
@@ -0,0 +1,115 @@
+from rest_framework.test import APITransactionTestCase
+from django.apps import apps
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, LicenseCatalogVersion, Company, Employee, CompanyLicense
+from licensingapp import license_catalog
+from licensingapp.license_catalog import get_catalog_snapshot, reset_catalog_snapshot, warm_catalog_snapshot
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons.common_constants import Role
+
+class LicenseCatalogSnapshotTests(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_catalog_snapshot()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def license_type_queries(self, context):
+        return [query['sql'] for query in context.captured_queries if 'licensingapp_licensetype' in query['sql']]
+
+    def test_reads_served_from_snapshot(self):
+        print("license_catalog_snapshot test_reads_served_from_snapshot Test catalog reads do not query LicenseType once the snapshot is loaded")
+        self.client.get(reverse('get-all-license-types'))
+        with CaptureQueriesContext(connection) as context:
+            all_response = self.client.get(reverse('get-all-license-types'))
+            get_response = self.client.get(reverse('get-license-type', args=[self.license_type.id]))
+        self.assertEqual(self.license_type_queries(context), [])
+        self.assertEqual(all_response.data['license_types'][0]['price_per_user'], '100.00')
+        self.assertEqual(get_response.data['license'][0]['name'], 'Pro License')
+
+    def test_write_reloads_snapshot(self):
+        print("license_catalog_snapshot test_write_reloads_snapshot Test a LicenseType write replaces the snapshot")
+        before = get_catalog_snapshot()
+        self.client.patch(reverse('update-license-type', args=[self.license_type.id]), {'price_per_user': '120.00'}, format='json')
+        after = get_catalog_snapshot()
+        self.assertIsNot(before, after)
+        self.assertEqual(str(after.get(self.license_type.id).price_per_user), '120.00')
+        self.assertEqual(str(before.get(self.license_type.id).price_per_user), '100.00')
+
+    def test_records_are_immutable(self):
+        print("license_catalog_snapshot test_records_are_immutable Test snapshot records and indexes cannot be modified")
+        snapshot = get_catalog_snapshot()
+        record = snapshot.get(self.license_type.id)
+        with self.assertRaises(AttributeError):
+            record.price_per_user = 0
+        with self.assertRaises(TypeError):
+            snapshot.by_name['Other'] = record
+        self.assertIs(snapshot.get_by_name('Pro License'), record)
+        self.assertIsNone(snapshot.get('not-a-number'))
+
+    def test_uncommitted_snapshot_not_published(self):
+        print("license_catalog_snapshot test_uncommitted_snapshot_not_published Test a snapshot read inside a transaction is not shared")
+        published = get_catalog_snapshot()
+        with transaction.atomic():
+            LicenseType.objects.create(name='Draft', duration=1, duration_type='months', price_per_user='1.00')
+            self.assertIsNotNone(get_catalog_snapshot().get_by_name('Draft'))
+            transaction.set_rollback(True)
+        self.assertIs(license_catalog._snapshot, published)
+        self.assertIsNone(get_catalog_snapshot().get_by_name('Draft'))
+
+    @override_settings(LICENSE_CATALOG_VERSION_CACHE={'ALIAS': 'default', 'TIMEOUT': 300})
+    def test_license_writes_price_from_rows(self):
+        print("license_catalog_snapshot test_license_writes_price_from_rows Test activating and increasing a license price from the LicenseType row, not a stale snapshot")
+        get_catalog_snapshot()
+        # Writes of another worker: they stamp a new version row, but this process keeps its
+        # cached stamp, and so its snapshot, until the cache entry expires.
+        LicenseType.objects.filter(pk=self.license_type.pk).update(price_per_user='150.00')
+        LicenseType.objects.bulk_create([LicenseType(name='Team License', duration=1, duration_type='years', price_per_user='50.00')])
+        LicenseCatalogVersion.objects.update(stamp='other-worker')
+        self.assertEqual(get_catalog_snapshot().get(self.license_type.id).price_per_user, 100)
+        self.assertIsNone(get_catalog_snapshot().get_by_name('Team License'))
+
+        response = self.client.post(reverse('create-license-type'), {'name': 'Team License'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['message'], 'License already exists')
+
+        response = self.client.post(reverse('activate-license'), {'license_type': self.license_type.id}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['total_amount'], '150.00')
+        response = self.client.post(reverse('increase-license-users'), {'total_users_to_add': 2}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['total_amount'], '450.00')
+        self.assertEqual(response.data['data']['license_type']['price_per_user'], '150.00')
+
+    def test_activate_unknown_license_type(self):
+        print("license_catalog_snapshot test_activate_unknown_license_type Test activating an unknown license type returns 404")
+        response = self.client.post(reverse('activate-license'), {'license_type': self.license_type.id + 100}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(CompanyLicense.objects.exists())
+
+    def test_warm_loads_snapshot(self):
+        print("license_catalog_snapshot test_warm_loads_snapshot Test warming at startup publishes the snapshot")
+        get_catalog_snapshot()
+        reset_catalog_snapshot()
+        snapshot = warm_catalog_snapshot()
+        self.assertIs(license_catalog._snapshot, snapshot)
+        self.assertIsNotNone(snapshot.get(self.license_type.id))
+        with self.settings(LICENSE_CATALOG_PRELOAD=False):
+            self.assertIsNone(warm_catalog_snapshot())
+
+    def test_app_ready_does_not_load(self):
+        print("license_catalog_snapshot test_app_ready_does_not_load Test app initialization leaves the snapshot to worker startup")
+        reset_catalog_snapshot()
+        with CaptureQueriesContext(connection) as context:
+            apps.get_app_config('licensingapp').ready()
+        self.assertEqual(len(context.captured_queries), 0)
+        self.assertIsNone(license_catalog._snapshot)
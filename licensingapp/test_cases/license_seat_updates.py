@@ -0,0 +1,132 @@
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.db.models import F
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from licensingapp.seat_usage import add_license_seats, _license_type_row
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+class LicenseSeatUpdateTests(APITestCase):
+    def setUp(self):
+        self.url = reverse('increase-license-users')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Odd Price', duration=1, duration_type='years', price_per_user='19.99')
+        self.license = CompanyLicense.objects.create(
+            company=self.company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='99.95',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def concurrent_writer(self, times):
+        """
+        Stand-in for another request that renews the license between our read and our UPDATE.
+        """
+        remaining = [times]
+
+        def license_type_row(license_type_id):
+            if remaining[0]:
+                remaining[0] -= 1
+                latest = CompanyLicense.objects.filter(company=self.company, status='active').order_by('-end_date').first()
+                CompanyLicense.objects.filter(pk=latest.pk).update(status='expired')
+                CompanyLicense.objects.create(
+                    company=self.company,
+                    license_type=self.license_type,
+                    total_users=latest.total_users,
+                    total_amount=latest.total_amount,
+                    start_date=latest.end_date + timedelta(days=1),
+                    end_date=latest.end_date + timedelta(days=366),
+                    status='active'
+                )
+            return _license_type_row(license_type_id)
+        return mock.patch('licensingapp.seat_usage._license_type_row', side_effect=license_type_row)
+
+    def test_update_reprices(self):
+        print("license_seat_updates test_update_reprices Test adding seats updates users and amount in one statement")
+        response = self.client.post(self.url, {'total_users_to_add': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['total_users'], 8)
+        self.assertEqual(response.data['data']['total_amount'], '159.92')
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.total_users, 8)
+
+    def test_retries_after_concurrent_write(self):
+        print("license_seat_updates test_retries_after_concurrent_write Test seats are added to the new license when the priced one was replaced")
+        with self.concurrent_writer(times=2):
+            license_id, license_type = add_license_seats(self.company.id, 3, max_retries=2)
+        self.assertEqual(license_type.id, self.license_type.id)
+        latest = CompanyLicense.objects.get(pk=license_id)
+        self.assertNotEqual(license_id, self.license.pk)
+        self.assertEqual(latest.total_users, 8)
+        self.assertEqual(str(latest.total_amount), '159.92')
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.total_users, 5)
+
+    def test_concurrent_increases_commute(self):
+        print("license_seat_updates test_concurrent_increases_commute Test an increase landing in between does not force a retry or get lost")
+        def license_type_row(license_type_id):
+            CompanyLicense.objects.filter(pk=self.license.pk).update(total_users=F('total_users') + 1)
+            return _license_type_row(license_type_id)
+        with mock.patch('licensingapp.seat_usage._license_type_row', side_effect=license_type_row):
+            add_license_seats(self.company.id, 3, max_retries=0)
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.total_users, 9)
+        self.assertEqual(str(self.license.total_amount), '179.91')
+
+    def test_retries_after_price_change(self):
+        print("license_seat_updates test_retries_after_price_change Test seats priced at a price changed before the UPDATE are repriced")
+        prices = ['24.99']
+
+        def license_type_row(license_type_id):
+            row = _license_type_row(license_type_id)
+            if prices:
+                LicenseType.objects.filter(pk=license_type_id).update(price_per_user=prices.pop())
+            return row
+        with mock.patch('licensingapp.seat_usage._license_type_row', side_effect=license_type_row):
+            license_id, license_type = add_license_seats(self.company.id, 3, max_retries=1)
+        self.assertEqual(str(license_type.price_per_user), '24.99')
+        self.license.refresh_from_db()
+        self.assertEqual(str(self.license.total_amount), '199.92')
+
+    def test_license_type_changed_after_update(self):
+        print("license_seat_updates test_license_type_changed_after_update Test a license type renamed or deleted right after the update does not fail the request")
+        def update_then(change):
+            def side_effect(*args, **kwargs):
+                updated = add_license_seats(*args, **kwargs)
+                change()
+                return updated
+            return mock.patch('licensingapp.services.add_license_seats', side_effect=side_effect)
+
+        with update_then(lambda: LicenseType.objects.filter(pk=self.license_type.pk).update(name='Renamed')):
+            response = self.client.post(self.url, {'total_users_to_add': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['license_type']['name'], 'Odd Price')
+
+        with update_then(lambda: LicenseType.objects.filter(pk=self.license_type.pk).delete()):
+            response = self.client.post(self.url, {'total_users_to_add': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_conflict_after_retries(self):
+        print("license_seat_updates test_conflict_after_retries Test the request fails with 409 once the retries run out")
+        with self.settings(LICENSE_UPDATE_MAX_RETRIES=1), self.concurrent_writer(times=5):
+            response = self.client.post(self.url, {'total_users_to_add': 3}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(CompanyLicense.objects.filter(company=self.company, total_users=8).count(), 0)
+
+    def test_expired_license_not_updated(self):
+        print("license_seat_updates test_expired_license_not_updated Test no seats are added once the license is no longer active")
+        CompanyLicense.objects.filter(pk=self.license.pk).update(status='expired')
+        self.assertIsNone(add_license_seats(self.company.id, 3))
+        self.license.refresh_from_db()
+        self.assertEqual(self.license.total_users, 5)
@@ -0,0 +1,98 @@
+from rest_framework.test import APITransactionTestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.test import override_settings
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from licensingapp.license_cache import license_state_cache_stats, reset_license_state_cache_stats
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+@override_settings(LICENSE_STATE_CACHE={'ALIAS': 'default', 'TIMEOUT': 30})
+class LicenseStateCacheTests(APITransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        reset_license_state_cache_stats()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.active_license = CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+
+    def test_repeated_reads_hit_cache(self):
+        print("license_state_cache test_repeated_reads_hit_cache Test repeated license reads are served from the cache")
+        self.client.get(reverse('check-active-license'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('check-active-license'))
+        self.assertTrue(response.data['data']['active_license'])
+        self.assertEqual(license_state_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_endpoints_share_cached_state(self):
+        print("license_state_cache test_endpoints_share_cached_state Test capacity and license info reuse the same cached state")
+        self.client.get(reverse('check-license-capacity'))
+        response = self.client.get(reverse('get-company-license-info'))
+        self.assertEqual(response.data['data']['active_license']['id'], self.active_license.id)
+        self.assertEqual(license_state_cache_stats(), {'hits': 1, 'misses': 1})
+
+    def test_increase_total_users_invalidates(self):
+        print("license_state_cache test_increase_total_users_invalidates Test increasing users invalidates the cached state")
+        self.client.get(reverse('check-license-capacity'))
+        self.client.post(reverse('increase-license-users'), {'total_users_to_add': 3}, format='json')
+        response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.data['data']['allowed_users'], 8)
+
+    def test_activate_license_invalidates(self):
+        print("license_state_cache test_activate_license_invalidates Test activating a license invalidates the cached state")
+        self.active_license.status = 'expired'
+        self.active_license.save()
+        response = self.client.get(reverse('check-active-license'))
+        self.assertFalse(response.data['data']['active_license'])
+
+        self.client.post(reverse('activate-license'), {'license_type': self.license_type.id}, format='json')
+        response = self.client.get(reverse('check-active-license'))
+        self.assertTrue(response.data['data']['active_license'])
+
+    def test_license_type_edit_invalidates(self):
+        print("license_state_cache test_license_type_edit_invalidates Test editing a license type refreshes nested license data")
+        self.client.get(reverse('get-company-license-info'))
+        self.license_type.name = 'Renamed License'
+        self.license_type.save()
+        response = self.client.get(reverse('get-company-license-info'))
+        self.assertEqual(response.data['data']['active_license']['license_type']['name'], 'Renamed License')
+
+
+class LicenseStateAcrossWorkersTests(APITransactionTestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def test_activation_seen_by_other_workers(self):
+        print("license_state_cache test_activation_seen_by_other_workers Test the default settings serve a license activated by another worker")
+        # Every worker process has its own LocMemCache; each LOCATION stands in for one worker.
+        worker_a = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        worker_b = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'}}
+
+        with override_settings(CACHES=worker_b):
+            self.assertFalse(self.client.get(reverse('check-active-license')).data['data']['active_license'])
+        with override_settings(CACHES=worker_a):
+            response = self.client.post(reverse('activate-license'), {'license_type': self.license_type.id}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with override_settings(CACHES=worker_b):
+            self.assertTrue(self.client.get(reverse('check-active-license')).data['data']['active_license'])
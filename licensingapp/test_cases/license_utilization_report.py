@@ -0,0 +1,179 @@
+from decimal import Decimal
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role, LicenseStatus
+from project.commons.common_methods import encodeCursor
+
+class LicenseUtilizationReportTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.today = timezone.now().date()
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.superuser = User.objects.create_superuser(username='operations', password='operationspassword')
+
+        # Active: 4 employees on 10 seats, with an expired license before it and a pending renewal after it.
+        self.active_company = Company.objects.create(name='Active Company', address='1 Active St')
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        Employee.objects.create(user=self.admin_user, company=self.active_company, role=Role.ADMIN.value)
+        for i in range(3):
+            Employee.objects.create(user=User.objects.create_user(username=f'employee{i}', password='employeepass'), company=self.active_company)
+        self.active_license = self.add_license(self.active_company, 10, '1000.00', self.today - timedelta(days=30), LicenseStatus.ACTIVE, days=335)
+        self.add_license(self.active_company, 5, '500.00', self.today - timedelta(days=396), LicenseStatus.EXPIRED, days=365)
+        self.add_license(self.active_company, 10, '1000.00', self.today + timedelta(days=306), LicenseStatus.PENDING, days=365)
+
+        # Expired and over its seats: 2 employees on 1 seat; a rejected license does not count as revenue.
+        self.expired_company = Company.objects.create(name='Expired Company', address='2 Expired St')
+        for i in range(2):
+            Employee.objects.create(user=User.objects.create_user(username=f'expired{i}', password='expiredpass'), company=self.expired_company)
+        self.add_license(self.expired_company, 1, '100.00', self.today - timedelta(days=100), LicenseStatus.EXPIRED, days=90)
+        self.add_license(self.expired_company, 5, '500.00', self.today - timedelta(days=5), LicenseStatus.REJECTED, days=365)
+
+        self.unlicensed_company = Company.objects.create(name='Unlicensed Company', address='3 Unlicensed St')
+        self.deleted_company = Company.objects.create(name='Deleted Company', address='4 Deleted St', deleted_at=timezone.now())
+        self.login(self.superuser)
+
+    def add_license(self, company, total_users, total_amount, start_date, license_status, days):
+        return CompanyLicense.objects.create(
+            company=company, license_type=self.license_type, total_users=total_users, total_amount=total_amount,
+            start_date=start_date, end_date=start_date + timedelta(days=days), status=license_status.value
+        )
+
+    def login(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(user)))
+
+    def report(self, **params):
+        response = self.client.get(reverse('license-utilization-report'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        return response
+
+    def rows(self, **params):
+        return {row['name']: row for row in self.report(**params).data['companies']}
+
+    def test_superuser_only(self):
+        print("license_utilization_report test_superuser_only Test the cross-tenant report is only served to superusers")
+        self.login(self.admin_user)
+        response = self.client.get(reverse('license-utilization-report'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.credentials()
+        response = self.client.get(reverse('license-utilization-report'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_utilization_and_revenue(self):
+        print("license_utilization_report test_utilization_and_revenue Test current license, seats, utilization and period revenue per company")
+        rows = self.rows()
+        self.assertEqual(set(rows), {'Active Company', 'Expired Company', 'Unlicensed Company'})
+
+        active = rows['Active Company']
+        self.assertEqual(active['license_id'], self.active_license.id)
+        self.assertEqual(active['license_status'], LicenseStatus.ACTIVE.value)
+        self.assertEqual(active['license_type'], 'Pro License')
+        self.assertEqual((active['total_users'], active['seats_used'], active['seats_left']), (10, 4, 6))
+        self.assertEqual(active['utilization'], 0.4)
+        # The expired license started more than a year ago; the pending one is not revenue.
+        self.assertEqual(Decimal(active['period_revenue']), Decimal('1000.00'))
+
+        expired = rows['Expired Company']
+        self.assertEqual(expired['license_status'], LicenseStatus.EXPIRED.value)
+        self.assertEqual((expired['total_users'], expired['seats_used'], expired['seats_left']), (1, 2, 0))
+        self.assertEqual(expired['utilization'], 2.0)
+        self.assertEqual(Decimal(expired['period_revenue']), Decimal('100.00'))
+
+        unlicensed = rows['Unlicensed Company']
+        self.assertIsNone(unlicensed['license_id'])
+        self.assertIsNone(unlicensed['seats_left'])
+        self.assertIsNone(unlicensed['utilization'])
+        self.assertEqual(Decimal(unlicensed['period_revenue']), Decimal('0'))
+
+        window = {'revenue_from': (self.today - timedelta(days=400)).isoformat(), 'revenue_to': (self.today - timedelta(days=50)).isoformat()}
+        rows = self.rows(**window)
+        self.assertEqual(Decimal(rows['Active Company']['period_revenue']), Decimal('500.00'))
+        self.assertEqual(Decimal(rows['Expired Company']['period_revenue']), Decimal('100.00'))
+
+    def test_filters(self):
+        print("license_utilization_report test_filters Test filtering by current license status and expiry window")
+        self.assertEqual(set(self.rows(status='active')), {'Active Company'})
+        self.assertEqual(set(self.rows(status='expired,none')), {'Expired Company', 'Unlicensed Company'})
+        self.assertEqual(set(self.rows(status='none')), {'Unlicensed Company'})
+        self.assertEqual(set(self.rows(status='pending')), set())
+
+        expiring = {'expires_from': self.today.isoformat(), 'expires_to': (self.today + timedelta(days=365)).isoformat()}
+        self.assertEqual(set(self.rows(**expiring)), {'Active Company'})
+        self.assertEqual(set(self.rows(expires_to=self.today.isoformat())), {'Expired Company'})
+
+        for params in ({'status': 'archived'}, {'expires_from': '2026-13-01'}, {'revenue_from': 'yesterday'},
+                       {'revenue_from': '2026-02-01', 'revenue_to': '2026-01-01'}, {'limit': '0'}, {'limit': 'ten'}, {'cursor': 'not-a-cursor'}):
+            response = self.client.get(reverse('license-utilization-report'), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, params)
+            self.assertEqual(response.data['status'], 'error')
+
+    def test_keyset_pagination(self):
+        print("license_utilization_report test_keyset_pagination Test the report pages by keyset in company order")
+        Company.objects.bulk_create([Company(name=f'Bulk Company {i}', address='Bulk St') for i in range(7)])
+        expected = list(Company.objects.filter(deleted_at__isnull=True).order_by('id').values_list('id', flat=True))
+
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.report(**params).data
+            self.assertIsNone(page['total_count'])
+            seen += [row['id'] for row in page['companies']]
+            cursor = page['next_cursor']
+            if not page['has_next_page']:
+                break
+        self.assertEqual(seen, expected)
+
+        last_page_start = expected.index(page['companies'][0]['id'])
+        previous = self.report(limit=3, cursor=page['previous_cursor']).data
+        self.assertEqual([row['id'] for row in previous['companies']], expected[last_page_start - 3:last_page_start])
+
+    def test_tampered_cursor(self):
+        print("license_utilization_report test_tampered_cursor Test cursors with values of the wrong type are rejected")
+        for payload in (
+            {'s': 'id', 'v': 'abc', 'id': 1, 'd': 'next'},
+            {'s': 'id', 'v': 1, 'id': 'abc', 'd': 'prev'},
+            {'s': 'id', 'v': None, 'id': 1, 'd': 'next'},
+            {'s': 'id', 'v': {'a': 1}, 'id': 1, 'd': 'next'},
+            {'s': 'name', 'v': 'Active Company', 'id': 1, 'd': 'next'},
+        ):
+            response = self.client.get(reverse('license-utilization-report'), {'cursor': encodeCursor(payload)})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, payload)
+            self.assertEqual(response.data['message'], "Invalid cursor")
+
+    def test_current_license_ties(self):
+        print("license_utilization_report test_current_license_ties Test the latest license of the first status in precedence is current")
+        latest = self.add_license(self.active_company, 20, '2000.00', self.active_license.start_date, LicenseStatus.ACTIVE, days=335)
+        self.assertEqual(self.rows()['Active Company']['license_id'], latest.id)
+        CompanyLicense.objects.filter(company=self.active_company, status=LicenseStatus.ACTIVE.value).update(status=LicenseStatus.EXPIRED.value)
+        # The pending renewal ends last, but an expired license takes precedence over it.
+        self.assertEqual(self.rows()['Active Company']['license_id'], latest.id)
+        self.assertEqual(self.rows()['Active Company']['license_status'], LicenseStatus.EXPIRED.value)
+
+    def test_single_query_independent_of_company_count(self):
+        print("license_utilization_report test_single_query_independent_of_company_count Test a page is one report query however many companies exist")
+        def report_queries():
+            with CaptureQueriesContext(connection) as ctx:
+                self.report(limit=2)
+            return [query['sql'] for query in ctx.captured_queries if 'licensingapp_company' in query['sql']]
+
+        before = report_queries()
+        companies = Company.objects.bulk_create([Company(name=f'Bulk Company {i}', address='Bulk St', employee_count=1) for i in range(30)])
+        CompanyLicense.objects.bulk_create([
+            CompanyLicense(company=company, license_type=self.license_type, total_users=5, total_amount='500.00',
+                           start_date=self.today, end_date=self.today + timedelta(days=365), status=LicenseStatus.ACTIVE.value)
+            for company in companies
+        ])
+        after = report_queries()
+        self.assertEqual(len(before), 1)
+        self.assertEqual(len(after), 1)
@@ -0,0 +1,73 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.test import override_settings
+from django.core.management import call_command
+from rest_framework import status
+from licensingapp.serializers import CompanyRegistrationSerializer, LicenseTypeSerializer
+from project.commons import openapi_schema
+from project.commons.common_methods import get_serializer_schema
+
+class OpenAPISchemaTests(APITestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.artifact = os.path.join(self.directory.name, 'schema.json')
+        self.settings_override = override_settings(OPENAPI_SCHEMA_PATH=self.artifact)
+        self.settings_override.enable()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.directory.cleanup()
+
+    def test_command_writes_artifact(self):
+        print("openapi_schema test_command_writes_artifact Test the management command compiles the schema to a file")
+        out = StringIO()
+        call_command('generate_openapi_schema', stdout=out)
+        self.assertIn(self.artifact, out.getvalue())
+        with open(self.artifact) as artifact:
+            schema = json.load(artifact)
+        self.assertEqual(schema['info']['version'], 'v1')
+        self.assertIn('/licensing/license/check-active/', schema['paths'])
+
+    def test_serves_artifact_with_etag(self):
+        print("openapi_schema test_serves_artifact_with_etag Test the schema endpoint serves the artifact and revalidates with 304")
+        call_command('generate_openapi_schema', stdout=StringIO())
+        response = self.client.get(reverse('openapi-schema'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        with open(self.artifact, 'rb') as artifact:
+            self.assertEqual(response.content, artifact.read())
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(reverse('openapi-schema'), HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_compiles_lazily_once_without_artifact(self):
+        print("openapi_schema test_compiles_lazily_once_without_artifact Test the schema is compiled once on first access when no artifact exists")
+        with mock.patch('project.commons.openapi_schema.build_schema', wraps=openapi_schema.build_schema) as build:
+            first = self.client.get(reverse('openapi-schema'))
+            second = self.client.get(reverse('openapi-schema'))
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(first.content, second.content)
+        self.assertIn('/licensing/license/check-active/', json.loads(first.content)['paths'])
+
+    def test_swagger_ui_uses_spec_url(self):
+        print("openapi_schema test_swagger_ui_uses_spec_url Test the Swagger UI loads the precompiled schema")
+        response = self.client.get(reverse('schema-swagger-ui'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(reverse('openapi-schema').encode(), response.content)
+
+    def test_serializer_schema_memoized(self):
+        print("openapi_schema test_serializer_schema_memoized Test serializer schemas are computed once per class")
+        first = get_serializer_schema(CompanyRegistrationSerializer)
+        with mock.patch.object(LicenseTypeSerializer, 'get_fields') as get_fields:
+            self.assertEqual(get_serializer_schema(LicenseTypeSerializer), get_serializer_schema(LicenseTypeSerializer))
+        get_fields.assert_not_called()
+        self.assertEqual(set(first), {'user', 'company'})
+        first['extra'] = None
+        self.assertNotIn('extra', get_serializer_schema(CompanyRegistrationSerializer))
@@ -0,0 +1,108 @@
+import asyncio
+from unittest import mock
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.test import override_settings
+from django.contrib.auth.hashers import make_password
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+from project.commons import password_hashing
+from project.commons.password_hashing import ahash_password, averify_password, get_password_pool, hash_password, hash_passwords, shutdown_password_pool, verify_password
+
+class PasswordHashingTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def tearDown(self):
+        shutdown_password_pool()
+
+    def test_inline_without_workers(self):
+        print("password_hashing test_inline_without_workers Test passwords are hashed inline when no pool is configured")
+        self.assertIsNone(get_password_pool())
+        encoded = hash_password('secretpassword')
+        self.assertEqual(verify_password('secretpassword', encoded), (True, False))
+        self.assertEqual(verify_password('wrongpassword', encoded)[0], False)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1)
+    def test_pool_hashes_and_verifies(self):
+        print("password_hashing test_pool_hashes_and_verifies Test the process pool hashes and verifies passwords")
+        self.assertIsNotNone(get_password_pool())
+        encoded = hash_password('secretpassword')
+        self.assertEqual(verify_password('secretpassword', encoded), (True, False))
+        self.assertTrue(asyncio.run(averify_password('secretpassword', asyncio.run(ahash_password('secretpassword'))))[0])
+
+    def test_hash_passwords_prefers_pool(self):
+        print("password_hashing test_hash_passwords_prefers_pool Test batch hashing uses the pool, then the given executor, then hashes inline")
+        executor = mock.Mock(map=mock.Mock(side_effect=map))
+        hashes = hash_passwords(['first', 'second'], executor)
+        executor.map.assert_called_once()
+        self.assertEqual([verify_password(password, encoded)[0] for password, encoded in zip(['first', 'second'], hashes)], [True, True])
+        self.assertTrue(verify_password('first', hash_passwords(['first'])[0])[0])
+
+        with override_settings(PASSWORD_HASHING_WORKERS=1):
+            executor.map.reset_mock()
+            hashes = hash_passwords(['third'], executor)
+            executor.map.assert_not_called()
+            self.assertTrue(verify_password('third', hashes[0])[0])
+
+    def test_pool_is_reset_when_settings_change(self):
+        print("password_hashing test_pool_is_reset_when_settings_change Test changing the worker count replaces the pool")
+        with override_settings(PASSWORD_HASHING_WORKERS=1):
+            pool = get_password_pool()
+            self.assertIs(get_password_pool(), pool)
+        self.assertIsNone(password_hashing._pool)
+        self.assertIsNone(get_password_pool())
+
+    def test_registered_employee_can_log_in(self):
+        print("password_hashing test_registered_employee_can_log_in Test employees registered by an admin get a hashed password")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        payload = {"username": "newemployee", "password": "employeepassword"}
+        response = self.client.post(reverse('register-employee-by-admin'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertNotEqual(User.objects.get(username='newemployee').password, 'employeepassword')
+
+        self.client.credentials()
+        response = self.client.post(reverse('token_obtain_pair'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data)
+
+    def test_login_uses_hashing_service(self):
+        print("password_hashing test_login_uses_hashing_service Test the token endpoint verifies passwords through the hashing service")
+        with mock.patch('project.commons.password_hashing._verify', wraps=password_hashing._verify) as verify:
+            response = self.client.post(reverse('token_obtain_pair'), {"username": "admin", "password": "adminpassword"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        verify.assert_called_once()
+
+        response = self.client.post(reverse('token_obtain_pair'), {"username": "admin", "password": "wrongpassword"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_obtain_pair'), {"username": "nobody", "password": "wrongpassword"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.PBKDF2PasswordHasher', 'django.contrib.auth.hashers.MD5PasswordHasher'])
+    def test_login_upgrades_outdated_hash(self):
+        print("password_hashing test_login_upgrades_outdated_hash Test logging in rehashes a password stored with an old hasher")
+        self.admin_user.password = make_password('adminpassword', hasher='md5')
+        self.admin_user.save(update_fields=['password'])
+        response = self.client.post(reverse('token_obtain_pair'), {"username": "admin", "password": "adminpassword"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.admin_user.refresh_from_db()
+        self.assertTrue(self.admin_user.password.startswith('pbkdf2_sha256$'))
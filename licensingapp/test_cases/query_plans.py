@@ -0,0 +1,130 @@
+import unittest
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role, LicenseStatus
+
+# Tables whose hot queries must be served from an index.
+INDEXED_TABLES = ('licensingapp_employee', 'licensingapp_company', 'licensingapp_companylicense', 'licensingapp_licensetype', 'auth_user')
+
+# Queries that read a whole table by design.
+FULL_SCAN_ALLOWED = (
+    'FROM "licensingapp_licensetype" ORDER BY',
+)
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "EXPLAIN QUERY PLAN checks are SQLite specific")
+class QueryPlanTests(APITestCase):
+    def setUp(self):
+        today = timezone.now().date()
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        LicenseType.objects.bulk_create([
+            LicenseType(name=f'License {i}', duration=1, duration_type='months', price_per_user='10.00') for i in range(20)
+        ])
+
+        companies = Company.objects.bulk_create([Company(name=f'Company {i}', address='Street') for i in range(20)])
+        users = User.objects.bulk_create([User(username=f'user{i}', password='!') for i in range(400)])
+        Employee.objects.bulk_create([
+            Employee(user=user, company=companies[i % len(companies)], role=Role.USER.value) for i, user in enumerate(users)
+        ])
+        CompanyLicense.objects.bulk_create([
+            CompanyLicense(
+                company=companies[i % len(companies)], license_type=self.license_type, total_users=50, total_amount='5000.00',
+                start_date=today - timedelta(days=400 - i), end_date=today - timedelta(days=35 - i),
+                status=list(LicenseStatus)[i % len(LicenseStatus)].value,
+            ) for i in range(200)
+        ])
+
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.employee = Employee.objects.create(
+            user=User.objects.create_user(username='employee', password='employeepassword', first_name='John'),
+            company=self.admin_company, role=Role.USER.value
+        )
+        CompanyLicense.objects.create(
+            company=self.admin_company, license_type=self.license_type, total_users=50, total_amount='5000.00',
+            start_date=today, end_date=today + timedelta(days=365), status=LicenseStatus.ACTIVE.value
+        )
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def _full_scans(self, sql):
+        if not sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')) or any(allowed in sql for allowed in FULL_SCAN_ALLOWED):
+            return []
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+            details = [row[-1] for row in cursor.fetchall()]
+        return [detail for detail in details if detail.startswith('SCAN ') and detail.split()[1] in INDEXED_TABLES]
+
+    def _assert_no_full_scans(self, method, url, data=None):
+        with CaptureQueriesContext(connection) as ctx:
+            getattr(self.client, method)(url, data, format='json')
+        for query in ctx.captured_queries:
+            self.assertEqual(self._full_scans(query['sql']), [], query['sql'])
+
+    def test_read_endpoints_use_indexes(self):
+        print("query_plans test_read_endpoints_use_indexes Test read endpoint queries avoid full table scans")
+        self._assert_no_full_scans('get', reverse('get-license-type', args=[self.license_type.id]))
+        self._assert_no_full_scans('get', reverse('check-license-capacity'))
+        self._assert_no_full_scans('get', reverse('check-active-license'))
+        self._assert_no_full_scans('get', reverse('get-company-license-info'))
+        self._assert_no_full_scans('get', reverse('get-user-company-employee-info'))
+        self._assert_no_full_scans('get', reverse('get-company-employees') + '?first_name=John')
+
+    def test_write_endpoints_use_indexes(self):
+        print("query_plans test_write_endpoints_use_indexes Test write endpoint queries avoid full table scans")
+        self._assert_no_full_scans('post', reverse('create-license-type'), {'name': 'Pro License', 'duration': 1, 'duration_type': 'years', 'price_per_user': '100.00'})
+        self._assert_no_full_scans('post', reverse('activate-license'), {'license_type': self.license_type.id})
+        self._assert_no_full_scans('post', reverse('increase-license-users'), {'total_users_to_add': 2})
+        self._assert_no_full_scans('post', reverse('register-employee-by-admin'), {'username': 'newemployee', 'password': 'employeepassword'})
+        self._assert_no_full_scans('delete', reverse('delete-employee', args=[self.employee.id]))
+        leaver = Employee.objects.create(user=User.objects.create_user(username='leaver', password='leaverpassword'), company=self.admin_company)
+        self._assert_no_full_scans('post', reverse('delete-employees'), {'employee_ids': [leaver.id]})
+        self._assert_no_full_scans('delete', reverse('delete-company', args=[self.admin_company.id]))
+
+    def test_expiry_sweep_uses_partial_index(self):
+        print("query_plans test_expiry_sweep_uses_partial_index Test the expiry sweep reads and updates through the partial active index")
+        from licensingapp.license_expiry import expire_licenses
+        with CaptureQueriesContext(connection) as ctx:
+            expired = expire_licenses(batch_size=10)
+        self.assertGreater(expired, 0)
+        for query in ctx.captured_queries:
+            self.assertEqual(self._full_scans(query['sql']), [], query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + ctx.captured_queries[0]['sql'])
+            self.assertIn('companylicense_active_end_idx', ' '.join(row[-1] for row in cursor.fetchall()))
+
+    def test_company_purge_uses_indexes(self):
+        print("query_plans test_company_purge_uses_indexes Test the chunked company purge deletes through indexes")
+        from licensingapp.models import CompanyPurge
+        from licensingapp.company_purge import purge_company
+        Company.objects.filter(pk=self.admin_company.id).update(deleted_at=timezone.now())
+        purge = CompanyPurge.objects.create(company_id=self.admin_company.id)
+        with CaptureQueriesContext(connection) as ctx:
+            purge_company(purge.id, batch_size=1)
+        self.assertFalse(Company.objects.filter(pk=self.admin_company.id).exists())
+        for query in ctx.captured_queries:
+            self.assertEqual(self._full_scans(query['sql']), [], query['sql'])
+
+    def test_utilization_report_uses_indexes(self):
+        print("query_plans test_utilization_report_uses_indexes Test the report reads licenses per company through indexes")
+        superuser = User.objects.create_superuser(username='operations', password='operationspassword')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(superuser)))
+        first_page = self.client.get(reverse('license-utilization-report'), {'limit': 5, 'status': 'active,expired'})
+        # The first page walks the primary key from the start; later pages seek to the cursor.
+        self._assert_no_full_scans('get', reverse('license-utilization-report') + '?limit=5&cursor=' + first_page.data['next_cursor'])
+
+        # The current license is found by one index seek per status, never by sorting a company's licenses.
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(reverse('license-utilization-report'), {'limit': 5})
+        report_sql = next(query['sql'] for query in ctx.captured_queries if 'licensingapp_company' in query['sql'])
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN QUERY PLAN ' + report_sql)
+            details = [row[-1] for row in cursor.fetchall()]
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', details)
+        self.assertGreaterEqual(sum('companylicense_status_end_idx' in detail for detail in details), len(LicenseStatus))
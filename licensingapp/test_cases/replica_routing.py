@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import unittest
+from io import StringIO
+from rest_framework.test import APITransactionTestCase
+from django.urls import reverse
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, connections, router
+from django.test import override_settings
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+REPLICA = 'replica'
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "The replication stand-in copies SQLite files")
+@override_settings(DATABASE_REPLICA_ALIAS=REPLICA, REPLICA_STICKY_SECONDS=60)
+class ReplicaRoutingTests(APITransactionTestCase):
+    @classmethod
+    def setUpClass(cls):
+        # A second SQLite file stands in for the replica; replicate_database refreshes it.
+        # The alias only exists while this class runs, so the test runner never creates it.
+        cls.replica_directory = tempfile.TemporaryDirectory()
+        connections.settings[REPLICA] = dict(connections['default'].settings_dict, NAME=os.path.join(cls.replica_directory.name, 'replica.sqlite3'))
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+        cls.replica_directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        self.other_admin = User.objects.create_user(username='otheradmin', password='otherpassword')
+        self.other_company = Company.objects.create(name='Other Company', address='456 Other St')
+        Employee.objects.create(user=self.other_admin, company=self.other_company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.replicate()
+
+    def activate_license(self, company):
+        CompanyLicense.objects.create(
+            company=company, license_type=self.license_type, total_users=5, total_amount='500.00',
+            start_date=timezone.now().date(), end_date=timezone.now().date() + timedelta(days=365), status='active'
+        )
+
+    def replicate(self):
+        call_command('replicate_database', stdout=StringIO())
+
+    def login(self, user):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(user)))
+
+    def listed_usernames(self):
+        response = self.client.get(reverse('get-company-employees'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {employee['user']['username'] for employee in response.data['employees']}
+
+    def add_employee(self, company, username):
+        Employee.objects.create(user=User.objects.create_user(username=username, password='employeepass'), company=company)
+
+    def test_reads_served_by_replica(self):
+        print("replica_routing test_reads_served_by_replica Test read endpoints see the replica until it catches up")
+        self.add_employee(self.company, 'lagging')
+        self.login(self.admin_user)
+        self.assertNotIn('lagging', self.listed_usernames())
+
+        self.replicate()
+        self.assertIn('lagging', self.listed_usernames())
+
+    @override_settings(JSON_STREAMING_MIN_ITEMS=5)
+    def test_streamed_pages_read_from_replica(self):
+        print("replica_routing test_streamed_pages_read_from_replica Test large pages streamed after the view returned still read from the replica")
+        for i in range(6):
+            self.add_employee(self.company, f'replicated{i}')
+        self.replicate()
+        self.add_employee(self.company, 'lagging')
+        self.login(self.admin_user)
+
+        response = self.client.get(reverse('get-company-employees'), {'limit': 50})
+        self.assertTrue(response.streaming)
+        body = json.loads(b''.join(response.streaming_content))
+        usernames = {employee['user']['username'] for employee in body['employees']}
+        self.assertIn('replicated0', usernames)
+        self.assertNotIn('lagging', usernames)
+
+    def test_sticky_primary_after_own_write(self):
+        print("replica_routing test_sticky_primary_after_own_write Test a company reads its own writes while other companies keep using the replica")
+        self.activate_license(self.company)
+        self.login(self.admin_user)
+        response = self.client.post(reverse('register-employee-by-admin'), {'username': 'newhire', 'password': 'newhirepass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('newhire', self.listed_usernames())
+
+        self.add_employee(self.other_company, 'otherlagging')
+        self.login(self.other_admin)
+        self.assertNotIn('otherlagging', self.listed_usernames())
+
+    def test_sticky_across_workers(self):
+        print("replica_routing test_sticky_across_workers Test a client reads its own writes when the next request reaches another worker")
+        # Every worker process has its own LocMemCache; each LOCATION stands in for one worker.
+        worker_a = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        worker_b = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'}}
+        self.activate_license(self.company)
+        self.replicate()
+        self.login(self.admin_user)
+        with override_settings(CACHES=worker_a):
+            response = self.client.post(reverse('register-employee-by-admin'), {'username': 'newhire', 'password': 'newhirepass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with override_settings(CACHES=worker_b):
+            self.assertIn('newhire', self.listed_usernames())
+
+    @override_settings(REPLICA_STICKY_CACHE={'ALIAS': 'default'})
+    def test_shared_sticky_cache_covers_company(self):
+        print("replica_routing test_shared_sticky_cache_covers_company Test a shared sticky cache keeps the writer's company on the primary")
+        colleague = User.objects.create_user(username='colleague', password='colleaguepass')
+        Employee.objects.create(user=colleague, company=self.company, role=Role.ADMIN.value)
+        self.activate_license(self.company)
+        self.replicate()
+        self.login(self.admin_user)
+        response = self.client.post(reverse('register-employee-by-admin'), {'username': 'newhire', 'password': 'newhirepass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.client.cookies.clear()
+        self.login(colleague)
+        self.assertIn('newhire', self.listed_usernames())
+
+    @override_settings(LICENSE_STATE_CACHE={'ALIAS': 'default', 'TIMEOUT': 30})
+    def test_license_state_not_cached_from_replica(self):
+        print("replica_routing test_license_state_not_cached_from_replica Test the shared license cache is filled from the primary")
+        self.activate_license(self.company)
+        self.login(self.admin_user)
+        response = self.client.get(reverse('check-active-license'))
+        self.assertTrue(response.data['data']['active_license'])
+
+    def test_writes_routed_to_primary(self):
+        print("replica_routing test_writes_routed_to_primary Test the router never sends writes to the replica")
+        self.assertEqual(router.db_for_write(CompanyLicense), 'default')
+        self.assertFalse(router.allow_migrate(REPLICA, 'licensingapp'))
+        self.assertTrue(router.allow_migrate('default', 'licensingapp'))
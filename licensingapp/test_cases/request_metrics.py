@@ -0,0 +1,97 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.test import Client, override_settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from project.commons.common_constants import Role
+from project.commons.metrics import MetricsRegistry, registry
+
+SAMPLE = re.compile(r'^(?P<name>\w+)\{(?P<labels>[^}]*)\} (?P<value>\S+)$')
+
+METRICS_TOKEN = 'metrics-test-token'
+
+@override_settings(METRICS_TOKEN=METRICS_TOKEN)
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.admin_user, company=self.company, role=Role.ADMIN.value)
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(AccessToken.for_user(self.admin_user)))
+
+    def scrape(self):
+        # A separate client: APIClient credentials would replace the scraper's Authorization header.
+        response = Client().get(reverse('metrics'), HTTP_AUTHORIZATION=f'Bearer {METRICS_TOKEN}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        samples = {}
+        for line in response.content.decode().splitlines():
+            match = SAMPLE.match(line)
+            if match:
+                samples[(match['name'], match['labels'])] = float(match['value'])
+        return samples
+
+    def test_records_route_queries_and_size(self):
+        print("request_metrics test_records_route_queries_and_size Test requests, SQL queries and response bytes are recorded per URL name")
+        url = reverse('check-license-capacity')
+        with CaptureQueriesContext(connection) as ctx:
+            first = self.client.get(url)
+        # Read before the next request: request_started clears the query log captured_queries slices.
+        executed = len(ctx.captured_queries)
+        second = self.client.get(url)
+
+        samples = self.scrape()
+        labels = 'route="check-license-capacity",method="GET"'
+        self.assertEqual(samples[('licensing_http_requests_total', labels + f',status="{first.status_code}"')], 2)
+        self.assertEqual(samples[('licensing_http_request_duration_seconds_count', labels)], 2)
+        self.assertEqual(samples[('licensing_http_request_duration_seconds_bucket', labels + ',le="+Inf"')], 2)
+        self.assertGreater(executed, 0)
+        self.assertGreaterEqual(samples[('licensing_http_db_queries_total', labels)], executed)
+        self.assertGreater(samples[('licensing_http_db_query_seconds_total', labels)], 0)
+        self.assertEqual(samples[('licensing_http_response_bytes_total', labels)], len(first.content) + len(second.content))
+
+    def test_query_count_matches_executed_queries(self):
+        print("request_metrics test_query_count_matches_executed_queries Test the recorded query count is exactly the SQL the request ran")
+        url = reverse('get-license-type', args=[self.license_type.id])
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(url)
+        executed = len(ctx.captured_queries)
+        samples = self.scrape()
+        self.assertEqual(samples[('licensing_http_db_queries_total', 'route="get-license-type",method="GET"')], executed)
+
+    def test_unmatched_and_restricted(self):
+        print("request_metrics test_unmatched_and_restricted Test unknown paths share one route label and the endpoint is internal only")
+        self.client.get('/no/such/path/')
+        self.assertIn(('licensing_http_requests_total', 'route="unmatched",method="GET",status="404"'), self.scrape())
+
+        # Loopback is what every request looks like behind a reverse proxy; it proves nothing.
+        for authorization in ('', 'Bearer wrong-token', f'Basic {METRICS_TOKEN}'):
+            response = Client().get(reverse('metrics'), REMOTE_ADDR='127.0.0.1', HTTP_AUTHORIZATION=authorization)
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED, authorization)
+
+        with self.settings(METRICS_TOKEN=None):
+            response = Client().get(reverse('metrics'), HTTP_AUTHORIZATION=f'Bearer {METRICS_TOKEN}')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_concurrent_recording(self):
+        print("request_metrics test_concurrent_recording Test aggregation from many threads loses no observations")
+        metrics = MetricsRegistry(buckets=(0.1, 1.0))
+        def observe(i):
+            metrics.record('route', 'GET', 200, (i % 3) * 0.6, 2, 0.001, 10)
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(observe, range(3000)))
+
+        statuses, bucket_counts, _, queries, _, response_bytes = metrics.snapshot()[('route', 'GET')]
+        self.assertEqual(statuses, {200: 3000})
+        self.assertEqual(bucket_counts, [1000, 1000, 1000])
+        self.assertEqual((queries, response_bytes), (6000, 30000))
+        self.assertIn('licensing_http_request_duration_seconds_bucket{route="route",method="GET",le="1.0"} 2000', metrics.render())
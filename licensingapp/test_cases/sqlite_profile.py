@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, connections
+from django.test import SimpleTestCase
+from project.commons.db_profile import SQLITE_PRAGMAS, sqlite_database
+
+@unittest.skipUnless(connection.vendor == 'sqlite', "SQLite profile checks are SQLite specific")
+class SQLiteProfileTests(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.name = os.path.join(directory.name, 'profile.sqlite3')
+        self.wrapper = self.connect(sqlite_database(self.name, profile='production'))
+
+    def connect(self, database):
+        default = connections['default']
+        wrapper = type(default)({**default.settings_dict, 'OPTIONS': {}, 'CONN_MAX_AGE': 0, 'CONN_HEALTH_CHECKS': False, **database}, alias='sqlite_profile')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, name, wrapper=None):
+        with (wrapper or self.wrapper).cursor() as cursor:
+            cursor.execute(f'PRAGMA {name}')
+            return cursor.fetchone()[0]
+
+    def test_pragmas_applied_on_connect(self):
+        print("sqlite_profile test_pragmas_applied_on_connect Test every new production connection runs with the tuned pragmas")
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous'), 1)
+        self.assertEqual(self.pragma('busy_timeout'), SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.pragma('cache_size'), SQLITE_PRAGMAS['cache_size'])
+        self.assertEqual(self.pragma('temp_store'), 2)
+        self.assertEqual(self.pragma('mmap_size'), SQLITE_PRAGMAS['mmap_size'])
+
+    def test_transactions_take_write_lock_upfront(self):
+        print("sqlite_profile test_transactions_take_write_lock_upfront Test production transactions begin IMMEDIATE and connections are persistent")
+        self.wrapper.ensure_connection()
+        self.assertEqual(self.wrapper.transaction_mode, 'IMMEDIATE')
+        self.assertGreater(sqlite_database(self.name, profile='production')['CONN_MAX_AGE'], 0)
+
+    def test_profile_is_opt_in(self):
+        print("sqlite_profile test_profile_is_opt_in Test development keeps Django's defaults and ASGI never keeps connections")
+        self.assertEqual(settings.DATABASE_PROFILE, 'development')
+        development = sqlite_database(self.name)
+        self.assertNotIn('OPTIONS', development)
+        self.assertEqual(self.pragma('journal_mode', self.connect(development)), 'delete')
+
+        asgi = sqlite_database(self.name, profile='production', server_interface='asgi')
+        self.assertEqual(asgi.get('CONN_MAX_AGE', 0), 0)
+        self.assertEqual(asgi['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+
+        with self.assertRaises(ImproperlyConfigured):
+            sqlite_database(self.name, profile='staging')
@@ -0,0 +1,59 @@
+from rest_framework.test import APITestCase
+from django.urls import reverse
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+
+class TenantContextTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+        self.admin_access_token = str(AccessToken.for_user(self.admin_user))
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def _tenant_lookups(self, queries):
+        return [q for q in queries if 'FROM "licensingapp_employee"' in q['sql'] and '"licensingapp_employee"."user_id" =' in q['sql']]
+
+    def test_permission_and_service_share_lookup(self):
+        print("tenant_context test_permission_and_service_share_lookup Test the employee lookup runs once for permission and service")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self._tenant_lookups(ctx.captured_queries)), 1)
+
+    def test_nested_service_call_reuses_lookup(self):
+        print("tenant_context test_nested_service_call_reuses_lookup Test register_employee reuses the lookup in its capacity check")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        payload = {"username": "newemployee", "password": "employeepassword", "email": "employee@example.com"}
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('register-employee-by-admin'), payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self._tenant_lookups(ctx.captured_queries)), 1)
+
+    def test_company_loaded_with_employee(self):
+        print("tenant_context test_company_loaded_with_employee Test company and user info are served from the joined lookup")
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + self.admin_access_token)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('get-user-company-employee-info'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['company']['id'], self.admin_company.id)
+        self.assertEqual(response.data['data']['employee']['user']['username'], 'admin')
+        self.assertFalse(any('FROM "licensingapp_company"' in q['sql'] and 'JOIN' not in q['sql'] for q in ctx.captured_queries))
@@ -0,0 +1,162 @@
+from rest_framework.test import APITestCase, APITransactionTestCase
+from django.urls import reverse
+from django.db import connection
+from django.core.cache import cache
+from unittest import mock
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from licensingapp.models import LicenseType, Company, Employee, CompanyLicense
+from rest_framework import status
+from django.contrib.auth.models import User
+from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework_simplejwt import serializers as simplejwt_serializers
+from datetime import timedelta
+from django.utils import timezone
+from project.commons.common_constants import Role
+from project.commons.tenant_tokens import apply_tenant_claims, bump_tenant_version, _tenant_version_cache_key
+
+@override_settings(TENANT_TOKEN_CLAIMS=True)
+class TenantTokenClaimsTests(APITestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_user(username='admin', password='adminpassword')
+        self.admin_company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        self.admin_employee = Employee.objects.create(user=self.admin_user, company=self.admin_company, role=Role.ADMIN.value)
+
+        self.employee_user = User.objects.create_user(username='employee', password='employeepassword')
+        self.employee = Employee.objects.create(user=self.employee_user, company=self.admin_company, role=Role.USER.value)
+
+        self.license_type = LicenseType.objects.create(name='Pro License', duration=1, duration_type='years', price_per_user='100.00')
+        CompanyLicense.objects.create(
+            company=self.admin_company,
+            license_type=self.license_type,
+            total_users=5,
+            total_amount='500.00',
+            start_date=timezone.now().date(),
+            end_date=timezone.now().date() + timedelta(days=365),
+            status='active'
+        )
+
+    def _obtain(self, username, password):
+        response = self.client.post(reverse('token_obtain_pair'), {'username': username, 'password': password}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_token_carries_tenant_claims(self):
+        print("tenant_token_claims test_token_carries_tenant_claims Test tokens from /api/token/ carry tenant claims")
+        tokens = self._obtain('admin', 'adminpassword')
+        access = AccessToken(tokens['access'])
+        self.assertEqual(access['employee_id'], self.admin_employee.id)
+        self.assertEqual(access['company_id'], self.admin_company.id)
+        self.assertEqual(access['role'], Role.ADMIN.value)
+        self.assertEqual(access['tenant_version'], 1)
+
+    @override_settings(TENANT_TOKEN_CLAIMS=False)
+    def test_claims_are_opt_in(self):
+        print("tenant_token_claims test_claims_are_opt_in Test tokens carry no tenant claims unless enabled")
+        tokens = self._obtain('admin', 'adminpassword')
+        self.assertNotIn('company_id', AccessToken(tokens['access']).payload)
+
+    def test_authorization_without_user_or_employee_queries(self):
+        print("tenant_token_claims test_authorization_without_user_or_employee_queries Test claims are trusted without loading auth_user or Employee")
+        tokens = self._obtain('admin', 'adminpassword')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('check-active-license'))
+            capacity_response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['data']['active_license'])
+        self.assertEqual(capacity_response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('FROM "auth_user"' in q['sql'] for q in ctx.captured_queries))
+        self.assertFalse(any('"licensingapp_employee"."user_id" =' in q['sql'] for q in ctx.captured_queries))
+
+    def test_role_claim_is_enforced(self):
+        print("tenant_token_claims test_role_claim_is_enforced Test a user role claim is rejected by admin endpoints")
+        tokens = self._obtain('employee', 'employeepassword')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+        response = self.client.get(reverse('check-license-capacity'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_delete_employee_rejects_stale_tokens(self):
+        print("tenant_token_claims test_delete_employee_rejects_stale_tokens Test deleting an employee invalidates outstanding tenant tokens")
+        admin_tokens = self._obtain('admin', 'adminpassword')
+        employee_tokens = self._obtain('employee', 'employeepassword')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + admin_tokens['access'])
+        response = self.client.delete(reverse('delete-employee', args=[self.employee.id]))
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + employee_tokens['access'])
+        response = self.client.get(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    # Rotation needs the token_blacklist app, which this project does not install.
+    @mock.patch.object(simplejwt_serializers.api_settings, 'ROTATE_REFRESH_TOKENS', False)
+    def test_refresh_recovers_from_version_bump(self):
+        print("tenant_token_claims test_refresh_recovers_from_version_bump Test refreshing re-reads the tenant claims")
+        admin_tokens = self._obtain('admin', 'adminpassword')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + admin_tokens['access'])
+        self.client.delete(reverse('delete-employee', args=[self.employee.id]))
+
+        response = self.client.get(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        refreshed = self.client.post(reverse('token_refresh'), {'refresh': admin_tokens['refresh']}, format='json')
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+        self.assertEqual(AccessToken(refreshed.data['access'])['tenant_version'], 2)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + refreshed.data['access'])
+        response = self.client.get(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(TENANT_VERSION_CACHE={'ALIAS': 'default', 'TIMEOUT': 60})
+    def test_shared_version_cache(self):
+        print("tenant_token_claims test_shared_version_cache Test a shared TENANT_VERSION_CACHE serves the version and is cleared by a bump")
+        tokens = self._obtain('employee', 'employeepassword')
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+        # Versions read inside the test transaction are never cached, so seed the entry.
+        cache.set(_tenant_version_cache_key(self.admin_company.id), 1)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_200_OK)
+        self.assertFalse(any('SELECT "licensingapp_company"."tenant_version"' in q['sql'] for q in ctx.captured_queries))
+
+        bump_tenant_version(self.admin_company.id)
+        self.assertIsNone(cache.get(_tenant_version_cache_key(self.admin_company.id)))
+        self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_delete_company_rejects_stale_tokens(self):
+        print("tenant_token_claims test_delete_company_rejects_stale_tokens Test deleting a company invalidates its tenant tokens")
+        outsider = User.objects.create_user(username='outsider', password='outsiderpassword')
+        outsider_company = Company.objects.create(name='Outsider Company', address='456 Other St')
+        Employee.objects.create(user=outsider, company=outsider_company, role=Role.ADMIN.value)
+        tokens = self._obtain('outsider', 'outsiderpassword')
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + tokens['access'])
+        response = self.client.delete(reverse('delete-company', args=[outsider_company.id]))
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+
+        response = self.client.get(reverse('check-active-license'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+@override_settings(TENANT_TOKEN_CLAIMS=True)
+class TenantVersionAcrossWorkersTests(APITransactionTestCase):
+    # Outside a test transaction, so versions are read the way committed requests read them.
+    def setUp(self):
+        self.user = User.objects.create_user(username='employee', password='employeepassword')
+        self.company = Company.objects.create(name='Admin Company', address='123 Admin St')
+        Employee.objects.create(user=self.user, company=self.company, role=Role.USER.value)
+
+    def test_bump_rejected_by_other_workers(self):
+        print("tenant_token_claims test_bump_rejected_by_other_workers Test a version bump made by one worker is enforced by another")
+        # Every worker process has its own LocMemCache; each LOCATION stands in for one worker.
+        worker_a = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-a'}}
+        worker_b = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'worker-b'}}
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + str(apply_tenant_claims(AccessToken.for_user(self.user), self.user.id)))
+
+        with override_settings(CACHES=worker_b):
+            self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_200_OK)
+        with override_settings(CACHES=worker_a):
+            bump_tenant_version(self.company.id)
+        with override_settings(CACHES=worker_b):
+            self.assertEqual(self.client.get(reverse('check-active-license')).status_code, status.HTTP_401_UNAUTHORIZED)
@@ -12,4 +12,29 @@ from licensingapp.test_cases.delete_employee import DeleteEmployeeTests
 from licensingapp.test_cases.delete_company import DeleteCompanyTests
 from licensingapp.test_cases.get_company_license_info import GetCompanyLicenseInfoTests
 from licensingapp.test_cases.register_company_for_existing_user import RegisterCompanyForExistingUserTests
-from licensingapp.test_cases.get_user_company_and_employee_info import GetUserCompanyAndEmployeeInfoTests
\ No newline at end of file
+from licensingapp.test_cases.get_user_company_and_employee_info import GetUserCompanyAndEmployeeInfoTests
+from licensingapp.test_cases.tenant_context import TenantContextTests
+from licensingapp.test_cases.tenant_token_claims import TenantTokenClaimsTests, TenantVersionAcrossWorkersTests
+from licensingapp.test_cases.license_state_cache import LicenseStateCacheTests, LicenseStateAcrossWorkersTests
+from licensingapp.test_cases.query_plans import QueryPlanTests
+from licensingapp.test_cases.employee_count import EmployeeCountTests
+from licensingapp.test_cases.get_company_employees_cursor import GetCompanyEmployeesCursorTests
+from licensingapp.test_cases.import_employees import ImportEmployeesTests
+from licensingapp.test_cases.password_hashing import PasswordHashingTests
+from licensingapp.test_cases.async_read_endpoints import AsyncReadEndpointsTests
+from licensingapp.test_cases.openapi_schema import OpenAPISchemaTests
+from licensingapp.test_cases.employee_listing_projection import EmployeeListingProjectionTests
+from licensingapp.test_cases.fast_json import FastJSONTests
+from licensingapp.test_cases.license_catalog import LicenseCatalogConditionalTests
+from licensingapp.test_cases.license_catalog_snapshot import LicenseCatalogSnapshotTests
+from licensingapp.test_cases.activate_license_idempotency import ActivateLicenseIdempotencyTests, ActivateLicenseConcurrencyTests
+from licensingapp.test_cases.license_seat_updates import LicenseSeatUpdateTests
+from licensingapp.test_cases.expire_licenses import ExpireLicensesTests
+from licensingapp.test_cases.company_purge import CompanyPurgeTests
+from licensingapp.test_cases.bulk_delete import BulkDeleteTests
+from licensingapp.test_cases.delete_employees import DeleteEmployeesTests
+from licensingapp.test_cases.sqlite_profile import SQLiteProfileTests
+from licensingapp.test_cases.replica_routing import ReplicaRoutingTests
+from licensingapp.test_cases.request_metrics import RequestMetricsTests
+from licensingapp.test_cases.dataset_generator import DatasetGeneratorTests
+from licensingapp.test_cases.license_utilization_report import LicenseUtilizationReportTests
@@ -1,6 +1,11 @@
+from django.conf import settings
 from django.urls import path
 from .views import *
 
+if getattr(settings, 'ASYNC_READ_ENDPOINTS', False):
+    # Serve the read endpoints natively under ASGI instead of on the sync thread pool.
+    from .async_views import *
+
 urlpatterns = [
     path('types/create/', create_license_type, name='create-license-type'),
     path('types/update/<int:pk>/', update_license_type, name='update-license-type'),
@@ -12,10 +17,13 @@ urlpatterns = [
     path('license/capacity-check/', check_license_capacity, name='check-license-capacity'),
     path('employee/register/', register_employee, name='register-employee-by-admin'),
     path('employees/company/', get_company_employees, name='get-company-employees'),
+    path('employees/import/', import_employees, name='import-employees'),
     path('employee/delete/<int:pk>/', delete_employee, name='delete-employee'),
+    path('employees/delete/', delete_employees, name='delete-employees'),
     path('company/delete/<int:pk>/', delete_company, name='delete-company'),
     path('company/license-info/', get_company_license_info, name='get-company-license-info'),
     path('company/register-for-existing-user/', register_company_for_existing_user_view, name='register-company-for-existing-user'),
     path('user/company-employee-info/', get_user_company_and_employee_info_view, name='get-user-company-employee-info'),
     path('license/check-active/', check_active_license, name='check-active-license'),
+    path('report/license-utilization/', get_license_utilization_report, name='license-utilization-report'),
 ]
\ No newline at end of file
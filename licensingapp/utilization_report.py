@@ -0,0 +1,141 @@
+import datetime
+from decimal import Decimal
+
+from django.db.models import Case, DecimalField, F, FilteredRelation, FloatField, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce, NullIf, Round
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from project.commons.common_constants import LicenseStatus
+from .models import Company, CompanyLicense
+
+REPORT_DEFAULT_LIMIT = 50
+REPORT_MAX_LIMIT = 500
+# Status filter value for companies that never had a license.
+NO_LICENSE = 'none'
+REPORT_STATUSES = tuple(tag.value for tag in LicenseStatus) + (NO_LICENSE,)
+# Licenses that were billed; pending and rejected ones earned nothing.
+REVENUE_STATUSES = (LicenseStatus.ACTIVE.value, LicenseStatus.EXPIRED.value)
+REVENUE_DEFAULT_DAYS = 365
+
+# Columns of one report row.
+REPORT_VALUES = (
+    'id', 'name', 'employee_count', 'license_id', 'license_type', 'license_status', 'license_start_date',
+    'license_end_date', 'total_users', 'seats_left', 'utilization', 'period_revenue',
+)
+
+
+class ReportFilters:
+    def __init__(self, statuses=None, expires_from=None, expires_to=None, revenue_from=None, revenue_to=None):
+        today = timezone.now().date()
+        self.statuses = statuses
+        self.expires_from = expires_from
+        self.expires_to = expires_to
+        self.revenue_to = revenue_to or today
+        self.revenue_from = revenue_from or self.revenue_to - datetime.timedelta(days=REVENUE_DEFAULT_DAYS)
+
+
+def _date_param(query_params, name):
+    raw = query_params.get(name)
+    if not raw:
+        return None
+    try:
+        value = parse_date(raw)
+    except ValueError:
+        value = None
+    if value is None:
+        raise ValueError(f"{name} must be a date formatted YYYY-MM-DD")
+    return value
+
+
+def parse_report_filters(query_params):
+    """
+    Build ReportFilters from the query string; raises ValueError with a client facing message.
+    """
+    statuses = None
+    if query_params.get('status'):
+        statuses = [value.strip() for value in query_params['status'].split(',')]
+        invalid = [value for value in statuses if value not in REPORT_STATUSES]
+        if invalid:
+            raise ValueError(f"Invalid status. Allowed values: {', '.join(REPORT_STATUSES)}")
+    filters = ReportFilters(
+        statuses=statuses,
+        expires_from=_date_param(query_params, 'expires_from'),
+        expires_to=_date_param(query_params, 'expires_to'),
+        revenue_from=_date_param(query_params, 'revenue_from'),
+        revenue_to=_date_param(query_params, 'revenue_to'),
+    )
+    if filters.revenue_from > filters.revenue_to:
+        raise ValueError("revenue_from must not be after revenue_to")
+    return filters
+
+
+# Which license of a company is reported as current: the latest one in the first of these statuses it has.
+CURRENT_LICENSE_PRECEDENCE = (LicenseStatus.ACTIVE, LicenseStatus.EXPIRED, LicenseStatus.PENDING, LicenseStatus.REJECTED)
+
+
+def _current_license_id():
+    """
+    Id of the current license of the company, or NULL when it has none. One subquery per status,
+    tried in precedence order, so every lookup is a seek on companylicense_status_end_idx instead
+    of sorting all the licenses of the company by precedence.
+    """
+    return Coalesce(*(
+        Subquery(
+            CompanyLicense.objects
+            .filter(company=OuterRef('pk'), status=license_status.value)
+            .order_by('-end_date', '-id')
+            .values('id')[:1]
+        )
+        for license_status in CURRENT_LICENSE_PRECEDENCE
+    ))
+
+
+def utilization_report(filters):
+    """
+    Per company rows of its current license, seats used (the maintained employee_count),
+    seats left, utilization and the revenue of licenses started within the revenue window,
+    as one SQL statement. The current license is resolved once per company and joined, and
+    the revenue is a correlated subquery, all served by the company_id indexes. Read by keyset
+    on the primary key, a page costs one such lookup per company it scans: the page size when
+    unfiltered, but with status or expiry filters every company skipped between two matches is
+    scanned too, so sparse filters cost up to the number of companies after the cursor.
+    """
+    revenue = (
+        CompanyLicense.objects
+        .filter(company=OuterRef('pk'), status__in=REVENUE_STATUSES, start_date__range=(filters.revenue_from, filters.revenue_to))
+        .order_by()
+        .values('company')
+        .annotate(total=Sum('total_amount'))
+        .values('total')
+    )
+    money = DecimalField(max_digits=12, decimal_places=2)
+    companies = Company.objects.filter(deleted_at__isnull=True).annotate(
+        current_license=FilteredRelation('companylicense', condition=Q(companylicense__id=_current_license_id())),
+    ).annotate(
+        license_id=F('current_license__id'),
+        license_type=F('current_license__license_type__name'),
+        license_status=F('current_license__status'),
+        license_start_date=F('current_license__start_date'),
+        license_end_date=F('current_license__end_date'),
+        total_users=F('current_license__total_users'),
+        period_revenue=Coalesce(Subquery(revenue, output_field=money), Value(Decimal('0.00')), output_field=money),
+    ).annotate(
+        seats_left=Case(
+            When(total_users__lt=F('employee_count'), then=Value(0)),
+            default=F('total_users') - F('employee_count'),
+            output_field=IntegerField(),
+        ),
+        utilization=Round(Cast('employee_count', FloatField()) / NullIf(Cast('total_users', FloatField()), Value(0.0)), 4),
+    )
+
+    if filters.statuses:
+        condition = Q(license_status__in=[value for value in filters.statuses if value != NO_LICENSE])
+        if NO_LICENSE in filters.statuses:
+            condition |= Q(license_id__isnull=True)
+        companies = companies.filter(condition)
+    if filters.expires_from:
+        companies = companies.filter(license_end_date__gte=filters.expires_from)
+    if filters.expires_to:
+        companies = companies.filter(license_end_date__lte=filters.expires_to)
+    return companies.values(*REPORT_VALUES)
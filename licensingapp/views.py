@@ -5,10 +5,11 @@ from rest_framework.response import Response
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from rest_framework import status
-from project.commons.middleware import AdminRoleCheckPermission
+from project.commons.middleware import AdminRoleCheckPermission, SuperuserPermission
+from project.commons.db_routing import read_from_replica
 
 from .services import LicensingService
-from .serializers import LicenseTypeSerializer, CompanySerializer, CompanyRegistrationSerializer, CompanyLicenseSerializer, CompanyLicenseIncreaseUsersSerializer, CompanyLicenseDetailSerializer, EmployeeLicenseCapacitySerializer, EmployeeRegistrationByAdminSerializer, EmployeeSerializer, EmployeeGetSerializer, ActiveLicenseCheckSerializer
+from .serializers import LicenseTypeSerializer, CompanySerializer, CompanyRegistrationSerializer, CompanyLicenseSerializer, CompanyLicenseIncreaseUsersSerializer, CompanyLicenseDetailSerializer, EmployeeLicenseCapacitySerializer, EmployeeBatchDeleteSerializer, EmployeeRegistrationByAdminSerializer, EmployeeSerializer, EmployeeGetSerializer, ActiveLicenseCheckSerializer, LicenseUtilizationSerializer
 from .models import CompanyLicense, Employee
 
 
@@ -75,7 +76,7 @@ def update_license_type(request: Request, pk: int) -> Response:
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_license_type(request: Request, pk: int) -> Response:
-    return licensing_service.get_license_type(pk)
+    return licensing_service.get_license_type(request, pk)
 
 
 @swagger_auto_schema(
@@ -96,7 +97,7 @@ def get_license_type(request: Request, pk: int) -> Response:
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_all_license_types(request: Request) -> Response:
-    return licensing_service.get_all_license_types()
+    return licensing_service.get_all_license_types(request)
 
 
 @swagger_auto_schema(
@@ -122,6 +123,10 @@ def register_company(request: Request) -> Response:
 
 @swagger_auto_schema(
     method='post', operation_id="activate_license", request_body=CompanyLicenseSerializer,
+    manual_parameters=[openapi.Parameter(
+        'Idempotency-Key', openapi.IN_HEADER, type=openapi.TYPE_STRING, required=False,
+        description='Retries with the same key return the stored response instead of activating again',
+    )],
     responses={201: openapi.Response(
         description="",
         schema=openapi.Schema(
@@ -179,6 +184,7 @@ def increase_total_users(request: Request) -> Response:
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, AdminRoleCheckPermission])
+@read_from_replica
 def check_license_capacity(request: Request) -> Response:
     return licensing_service.check_license_capacity(request)
 
@@ -238,17 +244,75 @@ def register_employee(request: Request) -> Response:
                 'has_next_page': openapi.Schema(type=openapi.TYPE_BOOLEAN, description=''),
                 'next_offset': openapi.Schema(type=openapi.TYPE_INTEGER, description=''),
                 'has_previous_page': openapi.Schema(type=openapi.TYPE_BOOLEAN, description=''),
-                'previous_offset': openapi.Schema(type=openapi.TYPE_INTEGER, description='')
+                'previous_offset': openapi.Schema(type=openapi.TYPE_INTEGER, description=''),
+                'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, description='Only in cursor mode (cursor query parameter sent)'),
+                'previous_cursor': openapi.Schema(type=openapi.TYPE_STRING, description='Only in cursor mode (cursor query parameter sent)')
             },
         ),
     )}
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, AdminRoleCheckPermission])
+@read_from_replica
 def get_company_employees(request: Request) -> Response:
     return licensing_service.get_company_employees(request)
 
 
+@swagger_auto_schema(
+    method='post', operation_id="import_employees",
+    operation_description="Stream a text/csv or application/x-ndjson body with username, password, email, first_name and last_name per row.",
+    responses={200: openapi.Response(
+        description="Import counts and the rows that failed",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'message': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'status': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'data': openapi.Schema(
+                    type=openapi.TYPE_OBJECT, properties={
+                        'total': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'created': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'failed': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'failures': openapi.Schema(
+                            type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT, properties={
+                                    'row': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'username': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'status': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'errors': openapi.Schema(type=openapi.TYPE_OBJECT, additionalProperties=True)
+                                }
+                            )
+                        ),
+                        'failures_truncated': openapi.Schema(type=openapi.TYPE_BOOLEAN)
+                    }
+                ),
+            },
+        ),
+    ),
+    400: openapi.Response(
+        description="Unsupported content type or malformed row",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'message': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )
+    ),
+    404: openapi.Response(
+        description="No active license found for this company",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'message': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )
+    )}
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, AdminRoleCheckPermission])
+def import_employees(request: Request) -> Response:
+    return licensing_service.import_employees(request)
+
+
 @swagger_auto_schema(
     method='delete', operation_id="delete_employee", responses={204: openapi.Response(
         description="No Content",
@@ -277,9 +341,70 @@ def get_company_employees(request: Request) -> Response:
 def delete_employee(request: Request, pk: int) -> Response:
     return licensing_service.delete_employee(request, pk)
 
+
 @swagger_auto_schema(
-    method='delete', operation_id="delete_company", responses={204: openapi.Response(
-        description="No Content",
+    method='post', operation_id="delete_employees", request_body=EmployeeBatchDeleteSerializer,
+    responses={200: openapi.Response(
+        description="Per-id deletion report",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'message': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'status': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'data': openapi.Schema(
+                    type=openapi.TYPE_OBJECT, properties={
+                        'total': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'deleted': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'failed': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'results': openapi.Schema(
+                            type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT, properties={
+                                    'employee_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'status': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'message': openapi.Schema(type=openapi.TYPE_STRING)
+                                }
+                            )
+                        )
+                    }
+                ),
+            }
+        )
+    ),
+    400: openapi.Response(
+        description="Invalid list of employee ids",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'errors': openapi.Schema(type=openapi.TYPE_OBJECT, additionalProperties=True)
+            }
+        )
+    ),
+    404: openapi.Response(
+        description="Admin employee not found",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'message': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )
+    )}
+)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, AdminRoleCheckPermission])
+def delete_employees(request: Request) -> Response:
+    return licensing_service.delete_employees(request)
+
+@swagger_auto_schema(
+    method='delete', operation_id="delete_company", responses={202: openapi.Response(
+        description="Company marked as deleted; its data is purged in the background",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'message': openapi.Schema(type=openapi.TYPE_STRING),
+                'data': openapi.Schema(type=openapi.TYPE_OBJECT, properties={
+                    'purge_id': openapi.Schema(type=openapi.TYPE_INTEGER)
+                })
+            }
+        )
     ),
     404: openapi.Response(
         description="Company not found or Admin employee not found",
@@ -359,6 +484,7 @@ def delete_company(request: Request, pk: int) -> Response:
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, AdminRoleCheckPermission])
+@read_from_replica
 def get_company_license_info(request: Request) -> Response:
     return licensing_service.get_company_license_info(request)
 
@@ -450,6 +576,7 @@ def register_company_for_existing_user_view(request: Request) -> Response:
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def get_user_company_and_employee_info_view(request: Request) -> Response:
     return licensing_service.get_user_company_and_employee_info(request)
 
@@ -487,5 +614,54 @@ def get_user_company_and_employee_info_view(request: Request) -> Response:
 )
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@read_from_replica
 def check_active_license(request: Request) -> Response:
     return licensing_service.check_active_license(request)
+
+
+@swagger_auto_schema(
+    method='get', operation_id="get_license_utilization_report",
+    manual_parameters=[
+        openapi.Parameter('limit', openapi.IN_QUERY, type=openapi.TYPE_INTEGER, required=False, description='Companies per page, 1 to 500 (default 50)'),
+        openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False, description='next_cursor or previous_cursor of a previous page'),
+        openapi.Parameter('status', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=False,
+                          description='Comma separated current license statuses (active, expired, pending, rejected, none)'),
+        openapi.Parameter('expires_from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+        openapi.Parameter('expires_to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False),
+        openapi.Parameter('revenue_from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False,
+                          description='Start of the revenue period (default 365 days before revenue_to)'),
+        openapi.Parameter('revenue_to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE, required=False,
+                          description='End of the revenue period (default today)'),
+    ],
+    responses={200: openapi.Response(
+        description="",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'companies': openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT, properties=get_serializer_schema(LicenseUtilizationSerializer),
+                    ),
+                ),
+                'has_next_page': openapi.Schema(type=openapi.TYPE_BOOLEAN, description=''),
+                'has_previous_page': openapi.Schema(type=openapi.TYPE_BOOLEAN, description=''),
+                'next_cursor': openapi.Schema(type=openapi.TYPE_STRING, description=''),
+                'previous_cursor': openapi.Schema(type=openapi.TYPE_STRING, description='')
+            },
+        ),
+    ),
+    400: openapi.Response(
+        description="Invalid filter, limit or cursor",
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT, properties={
+                'status': openapi.Schema(type=openapi.TYPE_STRING),
+                'message': openapi.Schema(type=openapi.TYPE_STRING)
+            }
+        )
+    )}
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, SuperuserPermission])
+@read_from_replica(tenant_scoped=False)
+def get_license_utilization_report(request: Request) -> Response:
+    return licensing_service.get_license_utilization_report(request)
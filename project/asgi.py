@@ -12,5 +12,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Selects the ASGI variant of the database profile (no persistent connections).
+os.environ.setdefault('DJANGO_SERVER_INTERFACE', 'asgi')
 
 application = get_asgi_application()
+
+# Worker startup: load the license catalog now that the apps are ready, instead of on the first request.
+from licensingapp.license_catalog import warm_catalog_snapshot  # noqa: E402
+
+warm_catalog_snapshot()
@@ -0,0 +1,115 @@
+import inspect
+
+from rest_framework import exceptions
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from project.commons.fast_json import FastJSONRenderer
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose dispatch awaits the handler, authenticators and permissions. Authenticators
+    and permissions are awaited through their optional aauthenticate and ahas_permission
+    methods. Content negotiation, throttling, OPTIONS metadata, exception handling and
+    response finalization are APIView's own. Responses are rendered with the JSON renderer only.
+    """
+    renderer_classes = [FastJSONRenderer]
+
+    async def aperform_authentication(self, request):
+        # Request._authenticate, awaiting authenticators that can be awaited.
+        for authenticator in request.authenticators:
+            try:
+                if hasattr(authenticator, 'aauthenticate'):
+                    user_auth_tuple = await authenticator.aauthenticate(request)
+                else:
+                    user_auth_tuple = authenticator.authenticate(request)
+            except exceptions.APIException:
+                request._not_authenticated()
+                raise
+            if user_auth_tuple is not None:
+                request._authenticator = authenticator
+                request.user, request.auth = user_auth_tuple
+                return
+        request._not_authenticated()
+
+    async def acheck_permissions(self, request):
+        for permission in self.get_permissions():
+            if hasattr(permission, 'ahas_permission'):
+                allowed = await permission.ahas_permission(request, self)
+            else:
+                allowed = permission.has_permission(request, self)
+            if not allowed:
+                self.permission_denied(
+                    request,
+                    message=getattr(permission, 'message', None),
+                    code=getattr(permission, 'code', None)
+                )
+
+    async def ainitial(self, request, *args, **kwargs):
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+
+        neg = self.perform_content_negotiation(request)
+        request.accepted_renderer, request.accepted_media_type = neg
+
+        version, scheme = self.determine_version(request, *args, **kwargs)
+        request.version, request.versioning_scheme = version, scheme
+
+        await self.aperform_authentication(request)
+        await self.acheck_permissions(request)
+        self.check_throttles(request)
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await self.ainitial(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        if isinstance(self.response, Response):
+            # Render here; Django would otherwise render the response on the sync thread pool.
+            self.response.render()
+        return self.response
+
+
+def async_api_view(http_method_names, permission_classes=None, authentication_classes=None):
+    """
+    Async counterpart of @api_view + @permission_classes for read endpoints served under ASGI.
+    """
+    allowed_methods = set(http_method_names) | {'options'}
+
+    def decorator(func):
+        async def handler(self, *args, **kwargs):
+            return await func(*args, **kwargs)
+
+        attrs = {
+            'http_method_names': [method.lower() for method in allowed_methods],
+            'permission_classes': permission_classes if permission_classes is not None else api_settings.DEFAULT_PERMISSION_CLASSES,
+            'authentication_classes': authentication_classes if authentication_classes is not None else api_settings.DEFAULT_AUTHENTICATION_CLASSES,
+            # Set by DRF's @throttle_classes, as @api_view reads it.
+            'throttle_classes': getattr(func, 'throttle_classes', APIView.throttle_classes),
+            '__module__': func.__module__,
+            '__doc__': func.__doc__,
+        }
+        for method in http_method_names:
+            attrs[method.lower()] = handler
+        # Named after the function, like @api_view, so OPTIONS and the schema report its name.
+        WrappedAsyncAPIView = type(func.__name__, (AsyncAPIView,), attrs)
+        return WrappedAsyncAPIView.as_view()
+    return decorator
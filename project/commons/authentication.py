@@ -0,0 +1,112 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from project.commons.password_hashing import acheck_user_password, ahash_password, check_user_password, hash_password
+from project.commons.tenant_tokens import COMPANY_ID_CLAIM, TENANT_VERSION_CLAIM, ais_tenant_version_current, is_tenant_version_current
+
+
+class TenantTokenUser(TokenUser):
+    """
+    Stateless user backed by a token whose tenant claims were checked against the tenant version.
+    """
+
+
+class TenantClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the tenant claims of the token instead of loading auth_user.
+    Tokens without tenant claims are authenticated exactly like JWTAuthentication does.
+    """
+
+    def get_user(self, validated_token):
+        company_id = validated_token.get(COMPANY_ID_CLAIM)
+        if company_id is None:
+            return super().get_user(validated_token)
+
+        if not is_tenant_version_current(company_id, validated_token.get(TENANT_VERSION_CLAIM)):
+            raise InvalidToken(_("Token tenant claims are no longer valid"))
+
+        return TenantTokenUser(validated_token)
+
+    async def aauthenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        company_id = validated_token.get(COMPANY_ID_CLAIM)
+        if company_id is None:
+            return await self._aget_database_user(validated_token)
+
+        if not await ais_tenant_version_current(company_id, validated_token.get(TENANT_VERSION_CLAIM)):
+            raise InvalidToken(_("Token tenant claims are no longer valid"))
+
+        return TenantTokenUser(validated_token)
+
+    async def _aget_database_user(self, validated_token):
+        # Async version of JWTAuthentication.get_user.
+        try:
+            user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = await self.user_model.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if jwt_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if jwt_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(jwt_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+
+class PooledPasswordBackend(ModelBackend):
+    """
+    ModelBackend that verifies passwords in the password hashing pool instead of the request thread.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway so unknown usernames take as long as wrong passwords.
+            hash_password(password)
+        else:
+            if check_user_password(user, password) and self.user_can_authenticate(user):
+                return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        UserModel = get_user_model()
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await ahash_password(password)
+        else:
+            if await acheck_user_password(user, password) and self.user_can_authenticate(user):
+                return user
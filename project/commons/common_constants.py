@@ -16,4 +16,10 @@ class LicenseStatus(Enum):
     ACTIVE = 'active'
     EXPIRED = 'expired'
     PENDING = 'pending'
-    REJECTED = 'rejected'
\ No newline at end of file
+    REJECTED = 'rejected'
+
+class PurgePhase(Enum):
+    LICENSES = 'licenses'
+    EMPLOYEES = 'employees'
+    COMPANY = 'company'
+    DONE = 'done'
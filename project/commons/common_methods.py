@@ -1,3 +1,14 @@
+import base64
+import functools
+import json
+from itertools import islice
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import StreamingHttpResponse
 from drf_yasg import openapi
 from rest_framework import serializers
 from rest_framework.response import Response
@@ -7,13 +18,20 @@ def get_serializer_schema(serializer):
     """
     Extract fields from a serializer and return them as openapi.Schema format,
     handling different field types and nested serializers.
+    Results for serializer classes are memoized, so each class is only inspected once.
     """
     # Check if `serializer` is a class or an instance
     if isinstance(serializer, type):
-        serializer_instance = serializer()  # Instantiate if it's a class
-    else:
-        serializer_instance = serializer  # Already an instance
+        return dict(_get_serializer_class_schema(serializer))
+    return _build_serializer_schema(serializer)  # Already an instance
+
 
+@functools.lru_cache(maxsize=None)
+def _get_serializer_class_schema(serializer_class):
+    return _build_serializer_schema(serializer_class())
+
+
+def _build_serializer_schema(serializer_instance):
     fields = serializer_instance.get_fields()
     properties = {}
 
@@ -57,6 +75,11 @@ def get_serializer_schema(serializer):
 
     return properties
 
+def _serialized(serializer):
+    # Listings may pass rows that were already built, e.g. from values() projections.
+    return serializer.data if isinstance(serializer, serializers.BaseSerializer) else serializer
+
+
 def paginatedResponse(offset, limit, total_count, serializer, result_type):
     has_next_page = (offset + limit) < total_count
     next_offset = offset + limit if has_next_page else None
@@ -67,7 +90,7 @@ def paginatedResponse(offset, limit, total_count, serializer, result_type):
     try:
         return Response({
             'status': "success",
-            result_type: serializer.data,
+            result_type: _serialized(serializer),
             'total_count': total_count,
             'has_next_page': has_next_page,
             'next_offset': next_offset,
@@ -76,3 +99,154 @@ def paginatedResponse(offset, limit, total_count, serializer, result_type):
         }, status.HTTP_200_OK)
     except Exception as e:
         return Response({"status": "error", "message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+# Rendered chunks pulled per thread hop when a page is streamed to an ASGI server.
+ASYNC_STREAMING_BATCH = 100
+
+
+async def _asyncChunks(chunks):
+    # Pulled on the request's thread-sensitive thread, where the view ran and the rows' connection lives.
+    next_batch = sync_to_async(lambda: list(islice(chunks, ASYNC_STREAMING_BATCH)), thread_sensitive=True)
+    try:
+        while batch := await next_batch():
+            for chunk in batch:
+                yield chunk
+    finally:
+        await sync_to_async(chunks.close, thread_sensitive=True)()
+
+
+def streamingPaginatedResponse(request, offset, limit, total_count, rows, result_type):
+    """
+    paginatedResponse for large pages. ``rows`` is an iterable of already serialized rows that is
+    rendered one row at a time into a StreamingHttpResponse, so the page is never held in memory
+    as a whole. The body is identical to the one paginatedResponse renders. ``rows`` is consumed
+    after the view returned, so querysets behind it must be bound to their database with using().
+    Under ASGI Django reads a synchronous iterator to the end before sending anything, so there
+    the chunks are handed over as an async iterator, ASYNC_STREAMING_BATCH at a time; memory is
+    bounded by one batch, not one row.
+    """
+    has_next_page = (offset + limit) < total_count
+    has_previous_page = offset > 0
+    data = {
+        'status': "success",
+        result_type: None,
+        'total_count': total_count,
+        'has_next_page': has_next_page,
+        'next_offset': offset + limit if has_next_page else None,
+        'has_previous_page': has_previous_page,
+        'previous_offset': offset - limit if has_previous_page else None
+    }
+    renderer_context = {'request': request}
+    chunks = request.accepted_renderer.iter_list_response(data, result_type, rows, request.accepted_media_type, renderer_context)
+    if isinstance(getattr(request, '_request', request), ASGIRequest):
+        chunks = _asyncChunks(chunks)
+    return StreamingHttpResponse(chunks, status=status.HTTP_200_OK, content_type=request.accepted_media_type)
+
+
+def canStreamResponse(request, limit):
+    return (
+        limit >= getattr(settings, 'JSON_STREAMING_MIN_ITEMS', 500)
+        and hasattr(getattr(request, 'accepted_renderer', None), 'iter_list_response')
+    )
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encodeCursor(payload):
+    """
+    Encode a keyset position into an opaque, URL safe cursor string.
+    """
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decodeCursor(cursor):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Cursor payload must be an object")
+    return payload
+
+
+def _cursorValue(model, field_path, value):
+    # Cursors come back from the client; coerce their keys to the sort field's type before they reach the query.
+    field = None
+    for name in field_path.split('__'):
+        if field is not None:
+            model = field.related_model
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            raise InvalidCursor("Cursor does not match this listing")
+    if value is None or isinstance(value, (bool, dict, list)):
+        raise InvalidCursor("Cursor value has the wrong type")
+    try:
+        return field.to_python(value)
+    except ValidationError:
+        raise InvalidCursor("Cursor value has the wrong type")
+
+
+def keysetPage(queryset, sort_field, cursor, limit, sort_value):
+    """
+    Return one page of ``queryset`` ordered by ``(sort_field, id)`` together with the cursors of the
+    neighbouring pages. ``cursor`` is a decoded cursor or None for the first page and ``sort_value``
+    extracts the sort key from a row. Rows may be model instances or values() dicts.
+    """
+    direction = 'next'
+    if cursor is not None:
+        direction = cursor.get('d')
+        if direction not in ('next', 'prev') or cursor.get('s') != sort_field or 'id' not in cursor or 'v' not in cursor:
+            raise InvalidCursor("Cursor does not match this listing")
+        value = _cursorValue(queryset.model, sort_field, cursor['v'])
+        row_id = _cursorValue(queryset.model, 'id', cursor['id'])
+        if direction == 'next':
+            queryset = queryset.filter(
+                Q(**{f'{sort_field}__gt': value}) | Q(**{sort_field: value, 'id__gt': row_id})
+            )
+        else:
+            queryset = queryset.filter(
+                Q(**{f'{sort_field}__lt': value}) | Q(**{sort_field: value, 'id__lt': row_id})
+            )
+
+    if direction == 'next':
+        rows = list(queryset.order_by(sort_field, 'id')[:limit + 1])
+        has_next_page = len(rows) > limit
+        rows = rows[:limit]
+        has_previous_page = cursor is not None
+    else:
+        rows = list(queryset.order_by(f'-{sort_field}', '-id')[:limit + 1])
+        has_previous_page = len(rows) > limit
+        rows = rows[:limit][::-1]
+        has_next_page = True
+
+    def cursor_for(row, cursor_direction):
+        row_id = row['id'] if isinstance(row, dict) else row.id
+        return encodeCursor({'s': sort_field, 'v': sort_value(row), 'id': row_id, 'd': cursor_direction})
+
+    next_cursor = cursor_for(rows[-1], 'next') if rows and has_next_page else None
+    previous_cursor = cursor_for(rows[0], 'prev') if rows and has_previous_page else None
+    return rows, next_cursor, previous_cursor
+
+
+def cursorPaginatedResponse(next_cursor, previous_cursor, total_count, serializer, result_type):
+    """
+    Keyset counterpart of paginatedResponse. The offset keys are kept (as None) so the
+    response shape matches the offset mode.
+    """
+    return Response({
+        'status': "success",
+        result_type: _serialized(serializer),
+        'total_count': total_count,
+        'has_next_page': next_cursor is not None,
+        'next_offset': None,
+        'has_previous_page': previous_cursor is not None,
+        'previous_offset': None,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor
+    }, status.HTTP_200_OK)
@@ -0,0 +1,48 @@
+from django.core.exceptions import ImproperlyConfigured
+
+# Applied to every new SQLite connection of the production profile. WAL lets readers run next
+# to the single writer, synchronous=NORMAL is durable across application crashes in WAL mode
+# (only an OS crash may lose the last commits), busy_timeout (ms) makes writers queue for the
+# lock instead of failing with "database is locked", cache_size is in KiB when negative.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'mmap_size': 128 * 1024 * 1024,
+    'cache_size': -20000,
+    'temp_store': 'MEMORY',
+}
+
+DATABASE_PROFILES = ('development', 'production')
+
+# How long production connections are kept open across requests, in seconds.
+PERSISTENT_CONN_MAX_AGE = 600
+
+
+def sqlite_database(name, profile='development', server_interface='wsgi'):
+    """
+    DATABASES entry for the SQLite file ``name``. The development profile keeps Django's
+    defaults. The production profile adds SQLITE_PRAGMAS and IMMEDIATE transactions, and keeps
+    connections open across requests except under ASGI, where Django advises against
+    persistent connections; there they are closed at the end of every request.
+    """
+    if profile not in DATABASE_PROFILES:
+        raise ImproperlyConfigured(f"Unknown database profile {profile!r}. Use one of: {', '.join(DATABASE_PROFILES)}.")
+
+    database = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': name,
+    }
+    if profile == 'production':
+        database['OPTIONS'] = {
+            'init_command': '; '.join(f'PRAGMA {pragma}={value}' for pragma, value in SQLITE_PRAGMAS.items()),
+            # Take the write lock when the transaction starts, so read-then-write transactions
+            # wait on busy_timeout instead of failing when they upgrade.
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': SQLITE_PRAGMAS['busy_timeout'] / 1000,
+        }
+        if server_interface != 'asgi':
+            # Keep connections (and their pragmas, page cache and mmap) across requests.
+            database['CONN_MAX_AGE'] = PERSISTENT_CONN_MAX_AGE
+            database['CONN_HEALTH_CHECKS'] = True
+    return database
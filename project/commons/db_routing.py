@@ -0,0 +1,217 @@
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.decorators import sync_and_async_middleware
+
+from project.commons.tenant_context import aget_tenant_context, get_tenant_context, peek_tenant_context
+
+# Alias the ORM reads from in the current request; None reads from the primary.
+_read_alias = ContextVar('read_alias', default=None)
+
+_SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+# Set on the responses of write requests, so the client that wrote reads from the primary on
+# whichever worker its next requests reach. Holds the id of the user that wrote.
+STICKY_COOKIE = 'primary_sticky'
+
+
+def replica_alias():
+    """
+    The configured read replica alias, or None when reads are not routed.
+    """
+    alias = getattr(settings, 'DATABASE_REPLICA_ALIAS', None)
+    return alias if alias and alias in connections.settings else None
+
+
+def replicate_sqlite(source=DEFAULT_DB_ALIAS, target=None):
+    """
+    Copy the source SQLite database onto the target with SQLite's online backup API. A stand-in
+    for real replication, to run the replica routing locally against two SQLite files.
+    """
+    target = target or replica_alias()
+    if target is None:
+        raise ImproperlyConfigured("No replica alias given and DATABASE_REPLICA_ALIAS is not configured.")
+    source_connection, target_connection = connections[source], connections[target]
+    if source_connection.vendor != 'sqlite' or target_connection.vendor != 'sqlite':
+        raise ImproperlyConfigured("replicate_sqlite only copies SQLite databases.")
+    source_connection.ensure_connection()
+    target_connection.ensure_connection()
+    source_connection.connection.backup(target_connection.connection)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends writes to the primary and reads to the replica only inside views decorated with
+    read_from_replica. The replica is filled by replication, never migrated directly.
+    """
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so saving an instance loaded from the replica still writes to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != replica_alias()
+
+
+def _sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', 5)
+
+
+def _sticky_cache():
+    # None unless REPLICA_STICKY_CACHE names an alias; marks in a per-process cache would only
+    # be seen by the worker that wrote, so it must be shared by every worker.
+    alias = getattr(settings, 'REPLICA_STICKY_CACHE', {}).get('ALIAS')
+    return caches[alias] if alias else None
+
+
+def _sticky_keys(user_id, company_id):
+    keys = []
+    if user_id is not None:
+        keys.append(f'primary_sticky:user:{user_id}')
+    if company_id is not None:
+        keys.append(f'primary_sticky:company:{company_id}')
+    return keys
+
+
+def mark_primary_sticky(user_id=None, company_id=None):
+    """
+    Read from the primary for REPLICA_STICKY_SECONDS after the user or company wrote, so they
+    do not see replica data older than their own writes. Does nothing without a
+    REPLICA_STICKY_CACHE; the writing client is still kept on the primary by STICKY_COOKIE.
+    """
+    cache = _sticky_cache()
+    keys = _sticky_keys(user_id, company_id)
+    if cache is not None and keys:
+        cache.set_many(dict.fromkeys(keys, True), _sticky_seconds())
+
+
+async def amark_primary_sticky(user_id=None, company_id=None):
+    cache = _sticky_cache()
+    keys = _sticky_keys(user_id, company_id)
+    if cache is not None and keys:
+        await cache.aset_many(dict.fromkeys(keys, True), _sticky_seconds())
+
+
+def _user_id(request):
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _has_sticky_cookie(request, user_id):
+    # Only the user that wrote; forging the cookie gains nothing but reads from the primary.
+    return user_id is not None and request.COOKIES.get(STICKY_COOKIE) == str(user_id)
+
+
+def _stuck_to_primary(request, company_id):
+    user_id = _user_id(request)
+    if _has_sticky_cookie(request, user_id):
+        return True
+    cache = _sticky_cache()
+    keys = _sticky_keys(user_id, company_id)
+    return cache is not None and bool(keys) and bool(cache.get_many(keys))
+
+
+async def _astuck_to_primary(request, company_id):
+    user_id = _user_id(request)
+    if _has_sticky_cookie(request, user_id):
+        return True
+    cache = _sticky_cache()
+    keys = _sticky_keys(user_id, company_id)
+    return cache is not None and bool(keys) and bool(await cache.aget_many(keys))
+
+
+def read_from_replica(view=None, *, tenant_scoped=True):
+    """
+    Route the ORM reads of a read-only view to the replica. Authentication and permission
+    checks run before the view body and stay on the primary. Clients that wrote within
+    REPLICA_STICKY_SECONDS keep reading from the primary, and so do their user and, with
+    tenant_scoped, their company when a shared REPLICA_STICKY_CACHE is configured.
+    Place it below @api_view / @async_api_view so it wraps the view body only.
+    """
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def wrapper(request, *args, **kwargs):
+                alias = replica_alias()
+                if alias is not None:
+                    company_id = (await aget_tenant_context(request)).company_id if tenant_scoped else None
+                    if await _astuck_to_primary(request, company_id):
+                        alias = None
+                if alias is None:
+                    return await view(request, *args, **kwargs)
+                token = _read_alias.set(alias)
+                try:
+                    return await view(request, *args, **kwargs)
+                finally:
+                    _read_alias.reset(token)
+        else:
+            @wraps(view)
+            def wrapper(request, *args, **kwargs):
+                alias = replica_alias()
+                if alias is not None:
+                    company_id = get_tenant_context(request).company_id if tenant_scoped else None
+                    if _stuck_to_primary(request, company_id):
+                        alias = None
+                if alias is None:
+                    return view(request, *args, **kwargs)
+                token = _read_alias.set(alias)
+                try:
+                    return view(request, *args, **kwargs)
+                finally:
+                    _read_alias.reset(token)
+        return wrapper
+
+    return decorator(view) if view is not None else decorator
+
+
+def _set_sticky_cookie(request, response, user_id):
+    response.set_cookie(
+        STICKY_COOKIE, str(user_id), max_age=_sticky_seconds(),
+        secure=request.is_secure(), httponly=True, samesite='Lax',
+    )
+
+
+def _written_by(request, response):
+    if request.method in _SAFE_METHODS or response.status_code >= 400:
+        return None
+    user_id = _user_id(request)
+    if user_id is None:
+        return None
+    tenant = peek_tenant_context(request)
+    return user_id, tenant.company_id if tenant is not None else None
+
+
+@sync_and_async_middleware
+def primary_stickiness_middleware(get_response):
+    """
+    Keep the client, user and company of every successful write request on the primary for
+    REPLICA_STICKY_SECONDS. Does nothing unless a replica is configured.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            response = await get_response(request)
+            written = _written_by(request, response) if replica_alias() else None
+            if written:
+                _set_sticky_cookie(request, response, written[0])
+                await amark_primary_sticky(*written)
+            return response
+    else:
+        def middleware(request):
+            response = get_response(request)
+            written = _written_by(request, response) if replica_alias() else None
+            if written:
+                _set_sticky_cookie(request, response, written[0])
+                mark_primary_sticky(*written)
+            return response
+    return middleware
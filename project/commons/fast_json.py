@@ -0,0 +1,104 @@
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+# orjson reads integers wider than 64 bits as floats; json keeps them exact. Mapping every
+# digit to 0 and searching for a run of 20 is several times cheaper than a regex scan.
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_WIDE_INTEGER = b'0' * 20
+_LINE_SEPARATORS = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed. Values orjson does not know
+    natively (Decimal, dates and times, lazy strings, querysets...) go through DRF's
+    JSONEncoder, so the output matches JSONRenderer. Indented output, ASCII-only output and
+    payloads orjson rejects (e.g. integers wider than 64 bits) are rendered by JSONRenderer.
+    Floats that need an exponent are spelled like 1e16 rather than 1e+16.
+    """
+
+    def _can_use_orjson(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and self.compact
+            and not self.ensure_ascii
+            and self.get_indent(accepted_media_type, renderer_context or {}) is None
+        )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self._can_use_orjson(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep JSONRenderer's escaping of the JavaScript line separators.
+        for raw, escaped in _LINE_SEPARATORS:
+            if raw in ret:
+                ret = ret.replace(raw, escaped)
+        return ret
+
+    def iter_list_response(self, data, list_key, items, accepted_media_type=None, renderer_context=None):
+        """
+        Yield the rendering of ``data`` piece by piece, with the list stored under ``list_key``
+        taken from the ``items`` iterable one element at a time. The concatenated chunks equal
+        render(data) with ``data[list_key] = list(items)``.
+        """
+        if not self.compact or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            yield self.render({**data, list_key: list(items)}, accepted_media_type, renderer_context)
+            return
+
+        keys = list(data)
+        position = keys.index(list_key)
+        head = self.render({key: data[key] for key in keys[:position]}, accepted_media_type, renderer_context)
+        tail = self.render({key: data[key] for key in keys[position + 1:]}, accepted_media_type, renderer_context)
+
+        key = self.render(list_key, accepted_media_type, renderer_context)
+        yield head[:-1] + (b',' if position else b'') + key + b':['
+        separator = b''
+        for item in items:
+            yield separator + self.render(item, accepted_media_type, renderer_context)
+            separator = b','
+        yield b']' + (b',' + tail[1:] if len(tail) > 2 else b'}')
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser that decodes UTF-8 bodies with orjson when it is installed. Bodies orjson
+    rejects are parsed again by JSONParser, so accepted input and error messages do not change.
+    """
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read() if stream is not None else b''
+        if _WIDE_INTEGER not in body.translate(_DIGITS_TO_ZERO):
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError:
+                pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(body.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,266 @@
+import hmac
+import threading
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from django.utils.decorators import sync_and_async_middleware
+from django.views.decorators.http import require_safe
+
+# Prometheus' default buckets, in seconds.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+UNMATCHED_ROUTE = 'unmatched'
+
+# Stats of the request being served; shared with the threads sync_to_async runs queries on.
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestStats:
+    __slots__ = ('started', 'queries', 'query_seconds', 'response_bytes')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class _RouteMetrics:
+    __slots__ = ('statuses', 'bucket_counts', 'latency_sum', 'queries', 'query_seconds', 'response_bytes')
+
+    def __init__(self, bucket_count):
+        self.statuses = {}
+        self.bucket_counts = [0] * bucket_count
+        self.latency_sum = 0.0
+        self.queries = 0
+        self.query_seconds = 0.0
+        self.response_bytes = 0
+
+
+class MetricsRegistry:
+    """
+    Per route and method request metrics, aggregated in process. One lock guards the
+    aggregates; it is held for a few additions per request, never while rendering.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._routes = {}
+
+    def record(self, route, method, status, latency, queries, query_seconds, response_bytes):
+        # Index of the first bucket the latency fits in; the +Inf bucket is the request count.
+        bucket = next((i for i, bound in enumerate(self.buckets) if latency <= bound), len(self.buckets))
+        with self._lock:
+            metrics = self._routes.get((route, method))
+            if metrics is None:
+                metrics = self._routes[(route, method)] = _RouteMetrics(len(self.buckets) + 1)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.bucket_counts[bucket] += 1
+            metrics.latency_sum += latency
+            metrics.queries += queries
+            metrics.query_seconds += query_seconds
+            metrics.response_bytes += response_bytes
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                key: (dict(metrics.statuses), list(metrics.bucket_counts), metrics.latency_sum,
+                      metrics.queries, metrics.query_seconds, metrics.response_bytes)
+                for key, metrics in self._routes.items()
+            }
+
+    def render(self):
+        """
+        The metrics in the Prometheus text exposition format.
+        """
+        snapshot = sorted(self.snapshot().items())
+        lines = [
+            '# HELP licensing_http_requests_total Requests served, by route, method and status.',
+            '# TYPE licensing_http_requests_total counter',
+        ]
+        for (route, method), (statuses, *_) in snapshot:
+            for status, count in sorted(statuses.items()):
+                lines.append(f'licensing_http_requests_total{{{_labels(route, method)},status="{status}"}} {count}')
+
+        lines += [
+            '# HELP licensing_http_request_duration_seconds Request latency, by route and method.',
+            '# TYPE licensing_http_request_duration_seconds histogram',
+        ]
+        for (route, method), (_, bucket_counts, latency_sum, *_) in snapshot:
+            labels = _labels(route, method)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), bucket_counts):
+                cumulative += count
+                lines.append(f'licensing_http_request_duration_seconds_bucket{{{labels},le="{_format_bound(bound)}"}} {cumulative}')
+            lines.append(f'licensing_http_request_duration_seconds_sum{{{labels}}} {latency_sum}')
+            lines.append(f'licensing_http_request_duration_seconds_count{{{labels}}} {cumulative}')
+
+        for index, name, help_text in (
+            (3, 'licensing_http_db_queries_total', 'SQL queries executed while serving requests.'),
+            (4, 'licensing_http_db_query_seconds_total', 'Time spent executing SQL while serving requests.'),
+            (5, 'licensing_http_response_bytes_total', 'Response body bytes sent.'),
+        ):
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} counter']
+            for (route, method), values in snapshot:
+                lines.append(f'{name}{{{_labels(route, method)}}} {values[index]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(route, method):
+    return f'route="{_escape(route)}",method="{_escape(method)}"'
+
+
+def _format_bound(bound):
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+registry = MetricsRegistry(getattr(settings, 'METRICS_LATENCY_BUCKETS', DEFAULT_LATENCY_BUCKETS))
+
+
+def _record_query(execute, sql, params, many, context):
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.query_seconds += time.perf_counter() - started
+        stats.queries += 1
+
+
+def _install(connection):
+    # Wrappers survive reconnects, so a reused DatabaseWrapper only gets one.
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+@receiver(connection_created)
+def _install_query_recorder(sender, connection, **kwargs):
+    _install(connection)
+
+
+def _route(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE
+    return match.view_name if match.url_name else match.route
+
+
+def _finish(request, response, stats):
+    registry.record(
+        _route(request), request.method, response.status_code, time.perf_counter() - stats.started,
+        stats.queries, stats.query_seconds, stats.response_bytes,
+    )
+
+
+def _stream(request, response, stats, content):
+    # Queries run lazily while the body streams, so they are attributed to the request here.
+    iterator = iter(content)
+    try:
+        while True:
+            token = _current.set(stats)
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                _current.reset(token)
+            stats.response_bytes += len(chunk)
+            yield chunk
+    finally:
+        _finish(request, response, stats)
+
+
+async def _astream(request, response, stats, content):
+    iterator = aiter(content)
+    try:
+        while True:
+            # sync_to_async copies the context, so queries the stream runs on threads are counted too.
+            token = _current.set(stats)
+            try:
+                chunk = await anext(iterator)
+            except StopAsyncIteration:
+                return
+            finally:
+                _current.reset(token)
+            stats.response_bytes += len(chunk)
+            yield chunk
+    finally:
+        _finish(request, response, stats)
+
+
+def _track_response(request, response, stats):
+    if response.streaming:
+        if response.is_async:
+            response.streaming_content = _astream(request, response, stats, response.streaming_content)
+        else:
+            response.streaming_content = _stream(request, response, stats, response.streaming_content)
+    else:
+        stats.response_bytes = len(response.content)
+        _finish(request, response, stats)
+    return response
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Record latency, SQL queries, SQL time and response size of every request per URL name.
+    """
+    # Connections opened before this module was imported never sent connection_created.
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            stats = RequestStats()
+            token = _current.set(stats)
+            try:
+                response = await get_response(request)
+            finally:
+                _current.reset(token)
+            return _track_response(request, response, stats)
+    else:
+        def middleware(request):
+            stats = RequestStats()
+            token = _current.set(stats)
+            try:
+                response = get_response(request)
+            finally:
+                _current.reset(token)
+            return _track_response(request, response, stats)
+    return middleware
+
+
+@require_safe
+def metrics_view(request):
+    """
+    Expose the request metrics to Prometheus. The endpoint does not exist until METRICS_TOKEN
+    is configured, and then only answers requests sending it as a bearer token. Client
+    addresses are not trusted: behind a reverse proxy every request comes from loopback.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', None)
+    if not token:
+        raise Http404
+    scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+    if scheme.lower() != 'bearer' or not hmac.compare_digest(credentials.strip().encode(), token.encode()):
+        response = HttpResponse(status=401)
+        response['WWW-Authenticate'] = 'Bearer realm="metrics"'
+        return response
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
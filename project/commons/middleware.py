@@ -1,18 +1,32 @@
 from rest_framework import permissions
 from rest_framework.response import Response
 from rest_framework import status
-from licensingapp.models import Employee
+from project.commons.tenant_context import aget_tenant_context, get_tenant_context
 
 class AdminRoleCheckPermission(permissions.BasePermission):
     def has_permission(self, request, view):
         # Check if the user is authenticated
         if request.user.is_authenticated:
-            try:
-                employee = Employee.objects.get(user=request.user)
-                if employee.role == 'admin':
-                    return True  # User has admin role, proceed to view
-                else:
-                    return False # User does not have admin role
-            except Employee.DoesNotExist:
+            tenant = get_tenant_context(request)
+            if not tenant.exists:
                 return False # Employee not found
-        return False  # Authentication required
\ No newline at end of file
+            if tenant.is_admin:
+                return True  # User has admin role, proceed to view
+            else:
+                return False # User does not have admin role
+        return False  # Authentication required
+
+    async def ahas_permission(self, request, view):
+        if request.user.is_authenticated:
+            tenant = await aget_tenant_context(request)
+            return tenant.exists and tenant.is_admin
+        return False
+
+
+class SuperuserPermission(permissions.BasePermission):
+    """
+    Cross-tenant endpoints. Tenant claim tokens carry no is_superuser claim, so superusers
+    must authenticate with a token without tenant claims.
+    """
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated and request.user.is_superuser)
@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+API_INFO = openapi.Info(
+    title="Licensing API",
+    default_version='v1',
+    description="Licensing API documentation",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@example.com"),
+    license=openapi.License(name="BSD License"),
+)
+
+_document = None
+_document_lock = threading.Lock()
+
+
+class SchemaDocument:
+    """
+    A compiled OpenAPI document with the validators used for conditional requests.
+    """
+    __slots__ = ('content', 'etag', 'last_modified')
+
+    def __init__(self, content, last_modified):
+        self.content = content
+        self.etag = '"%s"' % hashlib.sha256(content).hexdigest()
+        self.last_modified = last_modified
+
+
+def schema_artifact_path():
+    path = getattr(settings, 'OPENAPI_SCHEMA_PATH', None)
+    return Path(path) if path else None
+
+
+def build_schema():
+    """
+    Generate the public OpenAPI document for all URL patterns and return it as JSON bytes.
+    """
+    generator = OpenAPISchemaGenerator(API_INFO, version=API_INFO._default_version)
+    schema = generator.get_schema(request=None, public=True)
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def write_schema_artifact(path=None):
+    """
+    Build the schema and atomically replace the artifact file with it. Returns the path written.
+    """
+    path = Path(path) if path else schema_artifact_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(path.name + '.tmp')
+    temporary_path.write_bytes(build_schema())
+    os.replace(temporary_path, path)
+    reset_schema_document()
+    return path
+
+
+def _load_schema_document():
+    path = schema_artifact_path()
+    if path is not None and path.exists():
+        return SchemaDocument(path.read_bytes(), path.stat().st_mtime)
+    # No artifact was built for this deployment; compile the schema once per process instead.
+    return SchemaDocument(build_schema(), None)
+
+
+def get_schema_document():
+    global _document
+    if _document is None:
+        with _document_lock:
+            if _document is None:
+                _document = _load_schema_document()
+    return _document
+
+
+def reset_schema_document():
+    global _document
+    with _document_lock:
+        _document = None
+
+
+@receiver(setting_changed)
+def _reset_schema_document(setting, **kwargs):
+    if setting == 'OPENAPI_SCHEMA_PATH':
+        reset_schema_document()
+
+
+@require_safe
+def openapi_schema_view(request):
+    """
+    Serve the precompiled OpenAPI document, answering revalidations with 304 Not Modified.
+    """
+    document = get_schema_document()
+    last_modified = int(document.last_modified) if document.last_modified is not None else None
+    response = get_conditional_response(request, etag=document.etag, last_modified=last_modified)
+    if response is None:
+        response = HttpResponse(document.content, content_type='application/json')
+    response['ETag'] = document.etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, public=True, no_cache=True)
+    return response
@@ -0,0 +1,140 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(settings_module):
+    # Spawned workers start without Django; forked ones already have it configured.
+    if not settings.configured:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+        import django
+        django.setup()
+
+
+def _verify(password, encoded):
+    return hashers.verify_password(password, encoded)
+
+
+def password_hashing_workers():
+    return getattr(settings, 'PASSWORD_HASHING_WORKERS', 0)
+
+
+def get_password_pool():
+    """
+    Return the shared process pool for password hashing, or None when PASSWORD_HASHING_WORKERS is 0.
+    """
+    global _pool
+    workers = password_hashing_workers()
+    if not workers:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', 'project.settings'),),
+            )
+        return _pool
+
+
+def shutdown_password_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+@receiver(setting_changed)
+def _reset_password_pool(setting, **kwargs):
+    if setting in ('PASSWORD_HASHING_WORKERS', 'PASSWORD_HASHERS'):
+        shutdown_password_pool()
+
+
+def _submit(func, *args):
+    pool = get_password_pool()
+    if pool is None:
+        return None
+    return pool.submit(func, *args)
+
+
+def hash_password(password):
+    """
+    Hash a raw password with the default hasher, in the pool when one is configured.
+    """
+    future = _submit(hashers.make_password, password)
+    return hashers.make_password(password) if future is None else future.result()
+
+
+def hash_passwords(passwords, executor=None):
+    """
+    Hash raw passwords with the default hasher, in the pool when one is configured, otherwise
+    on ``executor`` (e.g. a thread pool) when given, otherwise inline. Returns the hashes in order.
+    """
+    pool = get_password_pool() or executor
+    if pool is None:
+        return [hashers.make_password(password) for password in passwords]
+    return list(pool.map(hashers.make_password, passwords))
+
+
+def verify_password(password, encoded):
+    """
+    Return (is_correct, must_update) like django.contrib.auth.hashers.verify_password.
+    """
+    future = _submit(_verify, password, encoded)
+    return _verify(password, encoded) if future is None else future.result()
+
+
+async def ahash_password(password):
+    future = _submit(hashers.make_password, password)
+    if future is None:
+        return await asyncio.to_thread(hashers.make_password, password)
+    return await asyncio.wrap_future(future)
+
+
+async def averify_password(password, encoded):
+    future = _submit(_verify, password, encoded)
+    if future is None:
+        return await asyncio.to_thread(_verify, password, encoded)
+    return await asyncio.wrap_future(future)
+
+
+def set_user_password(user, password):
+    """
+    Pooled equivalent of AbstractBaseUser.set_password.
+    """
+    user.password = hash_password(password)
+    user._password = password
+
+
+def check_user_password(user, password):
+    """
+    Pooled equivalent of AbstractBaseUser.check_password, including the hash upgrade on login.
+    """
+    if not user.has_usable_password() or password is None:
+        return False
+    is_correct, must_update = verify_password(password, user.password)
+    if is_correct and must_update:
+        set_user_password(user, password)
+        user._password = None
+        user.save(update_fields=['password'])
+    return is_correct
+
+
+async def acheck_user_password(user, password):
+    if not user.has_usable_password() or password is None:
+        return False
+    is_correct, must_update = await averify_password(password, user.password)
+    if is_correct and must_update:
+        user.password = await ahash_password(password)
+        await user.asave(update_fields=['password'])
+    return is_correct
@@ -0,0 +1,131 @@
+from licensingapp.models import Company, Employee
+from project.commons.common_constants import Role
+from project.commons.authentication import TenantTokenUser
+from project.commons.tenant_tokens import EMPLOYEE_ID_CLAIM, COMPANY_ID_CLAIM, ROLE_CLAIM
+
+_TENANT_CONTEXT_ATTR = '_tenant_context'
+
+
+class TenantContext:
+    """
+    Employee, company and role of the authenticated user, resolved once per request.
+    When built from token claims the employee and company rows are only loaded on first access.
+    """
+
+    def __init__(self, employee=None):
+        self._employee = employee
+        self._company = employee.company if employee else None
+        self.employee_id = employee.id if employee else None
+        self.company_id = employee.company_id if employee else None
+        self.role = employee.role if employee else None
+
+    @classmethod
+    def from_claims(cls, employee_id, company_id, role):
+        context = cls()
+        context.employee_id = employee_id
+        context.company_id = company_id
+        context.role = role
+        return context
+
+    @property
+    def employee(self):
+        if self._employee is None and self.employee_id is not None:
+            self._employee = Employee.objects.select_related('company', 'user').get(pk=self.employee_id)
+            self._company = self._employee.company
+        return self._employee
+
+    @property
+    def company(self):
+        if self._company is None and self.company_id is not None:
+            self._company = Company.objects.get(pk=self.company_id)
+        return self._company
+
+    async def aget_employee(self):
+        if self._employee is None and self.employee_id is not None:
+            self._employee = await Employee.objects.select_related('company', 'user').aget(pk=self.employee_id)
+            self._company = self._employee.company
+        return self._employee
+
+    async def aget_company(self):
+        if self._company is None and self.company_id is not None:
+            self._company = await Company.objects.aget(pk=self.company_id)
+        return self._company
+
+    @property
+    def exists(self):
+        return self.employee_id is not None
+
+    @property
+    def is_admin(self):
+        return self.role == Role.ADMIN.value
+
+
+def _resolve_tenant_context(user):
+    if not user or not user.is_authenticated:
+        return TenantContext()
+
+    if isinstance(user, TenantTokenUser):
+        token = user.token
+        return TenantContext.from_claims(token[EMPLOYEE_ID_CLAIM], token[COMPANY_ID_CLAIM], token[ROLE_CLAIM])
+
+    employee = Employee.objects.select_related('company').filter(user=user, company__deleted_at__isnull=True).first()
+    if employee is not None:
+        # The authenticated user is already loaded; reuse it instead of a lazy lookup.
+        employee.user = user
+    return TenantContext(employee)
+
+
+async def _aresolve_tenant_context(user):
+    if not user or not user.is_authenticated:
+        return TenantContext()
+
+    if isinstance(user, TenantTokenUser):
+        token = user.token
+        return TenantContext.from_claims(token[EMPLOYEE_ID_CLAIM], token[COMPANY_ID_CLAIM], token[ROLE_CLAIM])
+
+    employee = await Employee.objects.select_related('company').filter(user=user, company__deleted_at__isnull=True).afirst()
+    if employee is not None:
+        employee.user = user
+    return TenantContext(employee)
+
+
+def get_tenant_context(request):
+    """
+    Return the TenantContext for the request, resolving it with a single joined
+    query on first use. The result is stored on the underlying HttpRequest so the
+    permission classes, the service methods and nested service calls share it.
+    """
+    django_request = getattr(request, '_request', request)
+    context = getattr(django_request, _TENANT_CONTEXT_ATTR, None)
+    if context is None:
+        context = _resolve_tenant_context(request.user)
+        setattr(django_request, _TENANT_CONTEXT_ATTR, context)
+    return context
+
+
+async def aget_tenant_context(request):
+    """
+    Async version of get_tenant_context, sharing the same per-request cache.
+    """
+    django_request = getattr(request, '_request', request)
+    context = getattr(django_request, _TENANT_CONTEXT_ATTR, None)
+    if context is None:
+        context = await _aresolve_tenant_context(request.user)
+        setattr(django_request, _TENANT_CONTEXT_ATTR, context)
+    return context
+
+
+def peek_tenant_context(request):
+    """
+    The TenantContext already resolved for the request, or None. Never queries.
+    """
+    return getattr(getattr(request, '_request', request), _TENANT_CONTEXT_ATTR, None)
+
+
+def clear_tenant_context(request):
+    """
+    Drop the cached TenantContext, e.g. after the request created the user's employee.
+    """
+    django_request = getattr(request, '_request', request)
+    if hasattr(django_request, _TENANT_CONTEXT_ATTR):
+        delattr(django_request, _TENANT_CONTEXT_ATTR)
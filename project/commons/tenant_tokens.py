@@ -0,0 +1,152 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from licensingapp.models import Company, Employee
+
+EMPLOYEE_ID_CLAIM = 'employee_id'
+COMPANY_ID_CLAIM = 'company_id'
+ROLE_CLAIM = 'role'
+TENANT_VERSION_CLAIM = 'tenant_version'
+
+TENANT_CLAIMS = (EMPLOYEE_ID_CLAIM, COMPANY_ID_CLAIM, ROLE_CLAIM, TENANT_VERSION_CLAIM)
+
+
+def tenant_claims_enabled():
+    return getattr(settings, 'TENANT_TOKEN_CLAIMS', False)
+
+
+def _tenant_version_cache_key(company_id):
+    return f'tenant_version:{company_id}'
+
+
+def _tenant_version_cache():
+    # None unless TENANT_VERSION_CACHE names an alias; it must be shared by every worker, since
+    # a bump only clears the entry in the cache of the worker that made it.
+    alias = getattr(settings, 'TENANT_VERSION_CACHE', {}).get('ALIAS')
+    return caches[alias] if alias else None
+
+
+def _tenant_version_cache_timeout():
+    return getattr(settings, 'TENANT_VERSION_CACHE', {}).get('TIMEOUT', 60)
+
+
+def _tenant_version_query(company_id):
+    return Company.objects.filter(pk=company_id, deleted_at__isnull=True).values_list('tenant_version', flat=True)
+
+
+def get_tenant_version(company_id):
+    """
+    Return the current tenant version of a company, or None if the company no longer exists or was deleted.
+    A single-column primary key lookup, served from the TENANT_VERSION_CACHE alias when one is configured.
+    """
+    cache = _tenant_version_cache()
+    if cache is None:
+        return _tenant_version_query(company_id).first()
+
+    key = _tenant_version_cache_key(company_id)
+    version = cache.get(key)
+    if version is not None:
+        return version
+
+    version = _tenant_version_query(company_id).first()
+    # Only committed state may be cached, otherwise a rolled back bump could leak to other requests.
+    if version is not None and not transaction.get_connection().in_atomic_block:
+        cache.set(key, version, _tenant_version_cache_timeout())
+    return version
+
+
+async def aget_tenant_version(company_id):
+    cache = _tenant_version_cache()
+    if cache is None:
+        return await _tenant_version_query(company_id).afirst()
+
+    key = _tenant_version_cache_key(company_id)
+    version = await cache.aget(key)
+    if version is not None:
+        return version
+
+    version = await _tenant_version_query(company_id).afirst()
+    if version is not None and not transaction.get_connection().in_atomic_block:
+        await cache.aset(key, version, _tenant_version_cache_timeout())
+    return version
+
+
+def bump_tenant_version(company_id):
+    """
+    Invalidate every token carrying tenant claims for the company.
+    """
+    Company.objects.filter(pk=company_id).update(tenant_version=F('tenant_version') + 1)
+    cache = _tenant_version_cache()
+    if cache is not None:
+        key = _tenant_version_cache_key(company_id)
+        cache.delete(key)
+        transaction.on_commit(lambda: cache.delete(key))
+
+
+def is_tenant_version_current(company_id, version):
+    return version is not None and get_tenant_version(company_id) == version
+
+
+async def ais_tenant_version_current(company_id, version):
+    return version is not None and await aget_tenant_version(company_id) == version
+
+
+def apply_tenant_claims(token, user_id):
+    """
+    Write the employee id, company id, role and tenant version of the user into the token.
+    Users without an employee, or whose company was deleted, get no tenant claims and are
+    resolved from the database.
+    """
+    for claim in TENANT_CLAIMS:
+        token.payload.pop(claim, None)
+
+    employee = (
+        Employee.objects.filter(user_id=user_id, company__deleted_at__isnull=True)
+        .values('id', 'company_id', 'role', 'company__tenant_version')
+        .first()
+    )
+    if employee is None:
+        return token
+
+    token[EMPLOYEE_ID_CLAIM] = employee['id']
+    token[COMPANY_ID_CLAIM] = employee['company_id']
+    token[ROLE_CLAIM] = employee['role']
+    token[TENANT_VERSION_CLAIM] = employee['company__tenant_version']
+    return token
+
+
+class TenantTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Token pair serializer that embeds the tenant claims when TENANT_TOKEN_CLAIMS is enabled.
+    The access token inherits the claims from the refresh token.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if tenant_claims_enabled():
+            apply_tenant_claims(token, user.pk)
+        return token
+
+
+class TenantTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer that re-reads the tenant claims, so a refresh recovers from a version bump.
+    """
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if not tenant_claims_enabled():
+            return data
+
+        access = AccessToken(data['access'])
+        user_id = access[api_settings.USER_ID_CLAIM]
+        data['access'] = str(apply_tenant_claims(access, user_id))
+        if 'refresh' in data:
+            data['refresh'] = str(apply_tenant_claims(RefreshToken(data['refresh']), user_id))
+        return data
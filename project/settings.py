@@ -2,6 +2,7 @@ from pathlib import Path
 import os
 from datetime import timedelta
 from corsheaders.defaults import default_headers
+from project.commons.db_profile import sqlite_database
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -30,7 +31,8 @@ CORS_ALLOW_METHODS = [
     'DELETE', 'GET', 'OPTIONS', 'PATCH', 'POST', 'PUT',
 ]
 CORS_ALLOW_HEADERS = [
-    *default_headers
+    *default_headers,
+    'idempotency-key',
 ]
 
 INSTALLED_APPS = [
@@ -49,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'project.commons.metrics.metrics_middleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Moved AFTER security
@@ -58,6 +61,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'project.commons.db_routing.primary_stickiness_middleware',
 ]
 
 ROOT_URLCONF = 'project.urls'
@@ -79,11 +83,31 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'project.wsgi.application'
 
+# Connection profile, see project/commons/db_profile.py: 'development' (Django's defaults, also
+# used by tests and management commands) or 'production' (WAL and tuned pragmas, IMMEDIATE
+# transactions, persistent connections except under ASGI). Servers opt in with
+# DJANGO_DATABASE_PROFILE=production; project/asgi.py sets DJANGO_SERVER_INTERFACE=asgi.
+DATABASE_PROFILE = os.environ.get('DJANGO_DATABASE_PROFILE', 'development')
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+    'default': sqlite_database(BASE_DIR / 'db.sqlite3', DATABASE_PROFILE, os.environ.get('DJANGO_SERVER_INTERFACE', 'wsgi')),
+}
+
+# Read replica for the read-only endpoints (views decorated with read_from_replica). Add the
+# alias to DATABASES and name it here, e.g. for a local stand-in refreshed from the primary
+# with `python manage.py replicate_database --loop`:
+#     DATABASES['replica'] = {**DATABASES['default'], 'NAME': BASE_DIR / 'db.replica.sqlite3'}
+#     DATABASE_REPLICA_ALIAS = 'replica'
+# After a write request the client that sent it reads from the primary for
+# REPLICA_STICKY_SECONDS (a cookie, honored by every worker); keep it above the replication lag.
+# REPLICA_STICKY_CACHE can name a cache alias shared by all workers (Redis, Memcached, never
+# the per-process LocMemCache) to keep the user's other clients and their company on the
+# primary as well.
+DATABASE_REPLICA_ALIAS = None
+DATABASE_ROUTERS = ['project.commons.db_routing.PrimaryReplicaRouter']
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_CACHE = {
+    'ALIAS': None,
 }
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -116,9 +140,79 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Route the read endpoints to the async views in licensingapp/async_views.py.
+# Only worth enabling when served over ASGI (daphne project.asgi:application).
+ASYNC_READ_ENDPOINTS = False
+
+AUTHENTICATION_BACKENDS = [
+    'project.commons.authentication.PooledPasswordBackend',
+]
+
+# Processes used to hash and verify passwords off the request thread. 0 hashes inline.
+PASSWORD_HASHING_WORKERS = 0
+
+# List endpoints stream their JSON body row by row from this page size on.
+JSON_STREAMING_MIN_ITEMS = 500
+
+# Bulk employee import: rows per transaction and password hashing threads (None = CPU count).
+# The threads are only used when PASSWORD_HASHING_WORKERS is 0.
+EMPLOYEE_IMPORT_CHUNK_SIZE = 500
+EMPLOYEE_IMPORT_HASH_WORKERS = None
+# Failed rows listed in the import report; the rest are only counted.
+EMPLOYEE_IMPORT_MAX_REPORTED_FAILURES = 1000
+
+# Where the per-company "current license state" served to the license read endpoints is cached.
+# ALIAS None loads the latest active license on each read. A write only clears the cache of the
+# worker that made it, so an ALIAS must name a backend shared by all workers (Redis, Memcached),
+# never the per-process LocMemCache, or other workers serve the old license state (no license
+# right after activation, the old total_users after a seat increase) for up to TIMEOUT seconds.
+LICENSE_STATE_CACHE = {
+    'ALIAS': None,
+    'TIMEOUT': 30,
+}
+
+# License catalog (types/all/, types/get/<pk>/) conditional requests: max-age sent to browsers
+# and CDNs before they revalidate.
+LICENSE_CATALOG_MAX_AGE = 0
+# Where the catalog version stamp behind those ETags is cached. ALIAS None reads the single
+# version row (one primary key lookup) per request. A catalog write only clears the cache of the
+# worker that made it, so an ALIAS must name a backend shared by all workers (Redis, Memcached),
+# never the per-process LocMemCache, or other workers serve the old catalog and answer 304 to
+# old ETags for up to TIMEOUT seconds. License activation and seat increases always price from
+# the LicenseType row.
+LICENSE_CATALOG_VERSION_CACHE = {
+    'ALIAS': None,
+    'TIMEOUT': 300,
+}
+# Load the in-process LicenseType snapshot when a WSGI/ASGI worker starts instead of on first use.
+LICENSE_CATALOG_PRELOAD = True
+
+# Conditional license updates (increase_total_users) retried when a concurrent write expired
+# the license or changed its license type first; the request fails with 409 after this many retries.
+LICENSE_UPDATE_MAX_RETRIES = 5
+
+# Seconds an Idempotency-Key and its stored response are kept; purge expired keys with
+# `python manage.py purge_idempotency_records`.
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': (
+        'project.commons.fast_json.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'project.commons.fast_json.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'project.commons.authentication.TenantClaimsJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -138,9 +232,34 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
+    'TOKEN_OBTAIN_SERIALIZER': 'project.commons.tenant_tokens.TenantTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'project.commons.tenant_tokens.TenantTokenRefreshSerializer',
+}
+
+# Embed employee id, company id, role and tenant version in tokens issued by /api/token/,
+# so authenticated requests are authorized without loading auth_user or Employee.
+TENANT_TOKEN_CLAIMS = False
+# Where the tenant version checked on every such request is cached. ALIAS None reads the row
+# (one primary key lookup) each time. A bump only clears the cache of the worker that made it,
+# so an ALIAS must name a backend shared by all workers (Redis, Memcached), never the
+# per-process LocMemCache, or other workers accept revoked tokens for up to TIMEOUT seconds.
+TENANT_VERSION_CACHE = {
+    'ALIAS': None,
+    'TIMEOUT': 60,
 }
 
+# Per-route request metrics served in the Prometheus text format at /metrics to scrapers
+# sending this bearer token (Prometheus `authorization: {credentials: ...}`); without a token
+# the endpoint answers 404. METRICS_LATENCY_BUCKETS (seconds) overrides the latency histogram buckets.
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN') or None
+
+# Precompiled OpenAPI document served at /swagger.json; build it with
+# `python manage.py generate_openapi_schema`. Without the file the schema is compiled
+# once per process on first request.
+OPENAPI_SCHEMA_PATH = BASE_DIR / 'openapi' / 'licensing-api-v1.json'
+
 SWAGGER_SETTINGS = {
+    'SPEC_URL': 'openapi-schema',
     'USE_SESSION_AUTH': False,
     'DEFAULT_MODEL_RENDERING': 'example',
     'DOC_EXPANSION': 'none',
@@ -8,7 +8,8 @@ from django.views.decorators.csrf import csrf_exempt
 
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
+from project.commons.openapi_schema import API_INFO, openapi_schema_view
+from project.commons.metrics import metrics_view
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
     TokenRefreshView,
@@ -17,14 +18,7 @@ from rest_framework_simplejwt.views import (
 
 
 schema_view = get_schema_view(
-    openapi.Info(
-        title="Licensing API",
-        default_version='v1',
-        description="Licensing API documentation",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@example.com"),
-        license=openapi.License(name="BSD License"),
-    ),
+    API_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
 )
@@ -35,9 +29,12 @@ urlpatterns: List[Union[URLPattern, URLResolver]] = [
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/token/verify/', csrf_exempt(TokenVerifyView.as_view()), name='token_verify'),
 
+    path('swagger.json', openapi_schema_view, name='openapi-schema'),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
 
+    path('metrics', metrics_view, name='metrics'),
+
 ]
 
 if settings.DEBUG:
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 application = get_wsgi_application()
+
+# Worker startup: load the license catalog now that the apps are ready, instead of on the first request.
+from licensingapp.license_catalog import warm_catalog_snapshot  # noqa: E402
+
+warm_catalog_snapshot()